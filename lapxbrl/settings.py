@@ -42,12 +42,16 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'reports.middleware.MetricsMiddleware',
+    'reports.middleware.SlowQueryMiddleware',
+    'reports.middleware.QueryBudgetMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'reports.middleware.ProfilingMiddleware',
 ]
 
 ROOT_URLCONF = 'lapxbrl.urls'
@@ -130,3 +134,56 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 LOGIN_URL = 'login'
 LOGIN_REDIRECT_URL = '/dashboard/upload/'
 LOGOUT_REDIRECT_URL = '/'
+
+# Instrumentasi query per request (header X-Query-Budget dan panel dev).
+QUERY_BUDGET_ENABLED = DEBUG
+QUERY_BUDGET_PANEL = DEBUG
+QUERY_BUDGETS = {
+    "home": 8,
+    "company_list": 6,
+    "report_neraca": 10,
+    "report_laba_rugi": 10,
+    "report_arus_kas": 10,
+    "report_lengkap": 12,
+    "report_peer": 8,
+    "filing_detail": 8,
+    "screener": 8,
+    "manage_templates": 5,
+}
+
+# Penangkapan query lambat ke tabel ring buffer (lihat admin "Slow queries").
+SLOW_QUERY_CAPTURE_ENABLED = False
+SLOW_QUERY_THRESHOLD_MS = 100
+SLOW_QUERY_SAMPLE_RATE = 1.0
+SLOW_QUERY_BUFFER_SIZE = 1000
+SLOW_QUERY_EXPLAIN = True
+
+# Profiling on-demand untuk staff: header X-Profile: 1 atau ?_profile=1.
+PROFILING_ENABLED = True
+PROFILE_SAMPLE_INTERVAL_MS = 2
+PROFILE_KEEP = 200
+
+# Metrik format teks Prometheus di /metrics; file per proses digabung saat scrape.
+METRICS_ENABLED = True
+METRICS_DIR = BASE_DIR / "var" / "metrics"
+METRICS_FLUSH_INTERVAL = 1.0
+METRICS_TOKEN = ""
+
+# Cache peta konsep -> nilai per filing, dipakai bersama oleh semua worker.
+FACT_CACHE_ENABLED = True
+FACT_CACHE_PATH = BASE_DIR / "var" / "fact-cache.sqlite3"
+FACT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+FACT_CACHE_MEMORY_BYTES = 16 * 1024 * 1024
+
+# Warm-up cache laporan: saat server start (thread latar) dan setelah setiap ingest.
+CACHE_WARMUP_ON_START = True
+CACHE_WARMUP_AFTER_INGEST = True
+CACHE_WARMUP_COMPANIES = 50
+CACHE_WARMUP_FILINGS_PER_COMPANY = 2
+CACHE_WARMUP_TICKERS = []
+
+# Antrean penghapusan file XBRL; diproses di thread latar setelah commit
+# dan/atau lewat `manage.py cleanup_files`.
+FILE_CLEANUP_ON_COMMIT = True
+FILE_CLEANUP_BATCH_SIZE = 200
+FILE_CLEANUP_MAX_ATTEMPTS = 5
@@ -21,11 +21,28 @@ from django.contrib.auth import views as auth_views
 from django.urls import path
 
 from reports.views import (
+    BulkDeleteFilingView,
+    BulkFactExportView,
+    CombinedReportExportView,
+    CombinedReportView,
     DeleteFilingView,
     FilingDetailView,
+    FilingDiffView,
+    FilingExportView,
     HomeView,
+    MetricsView,
+    PeerReportView,
+    ProfileDetailView,
+    ProfileListView,
     CompanyListView,
+    CompanySearchView,
+    ConceptSearchView,
+    ConceptSeriesAPIView,
     PublicReportView,
+    ScreenerAPIView,
+    ScreenerView,
+    SectorAggregateAPIView,
+    TemplateCoverageView,
     TemplateDetailView,
     TemplateListView,
     UploadXBRLView,
@@ -38,17 +55,49 @@ urlpatterns = [
     path("accounts/logout/", logout_view, name="logout"),
     path("dashboard/upload/", UploadXBRLView.as_view(), name="upload_xbrl"),
     path("dashboard/templates/", TemplateListView.as_view(), name="manage_templates"),
+    path(
+        "dashboard/templates/coverage/",
+        TemplateCoverageView.as_view(),
+        name="template_coverage",
+    ),
     path(
         "dashboard/templates/<int:template_id>/",
         TemplateDetailView.as_view(),
         name="manage_template_detail",
     ),
+    path(
+        "dashboard/api/concepts/",
+        ConceptSearchView.as_view(),
+        name="concept_search",
+    ),
     path("dashboard/filings/<int:pk>/", FilingDetailView.as_view(), name="filing_detail"),
+    path(
+        "dashboard/filings/<int:pk>/export/",
+        FilingExportView.as_view(),
+        name="filing_export",
+    ),
+    path("dashboard/export/facts/", BulkFactExportView.as_view(), name="bulk_fact_export"),
+    path(
+        "dashboard/filings/<int:pk>/diff/",
+        FilingDiffView.as_view(),
+        name="filing_diff",
+    ),
+    path(
+        "dashboard/filings/delete/",
+        BulkDeleteFilingView.as_view(),
+        name="bulk_delete_filings",
+    ),
     path(
         "dashboard/filings/<int:pk>/delete/",
         DeleteFilingView.as_view(),
         name="delete_filing",
     ),
+    path("dashboard/profiles/", ProfileListView.as_view(), name="profile_list"),
+    path(
+        "dashboard/profiles/<int:pk>/",
+        ProfileDetailView.as_view(),
+        name="profile_detail",
+    ),
     path("", HomeView.as_view(), name="home"),
     path(
         "laporan/neraca/",
@@ -65,7 +114,28 @@ urlpatterns = [
         PublicReportView.as_view(report_slug="arus-kas"),
         name="report_arus_kas",
     ),
+    path(
+        "laporan/lengkap/",
+        CombinedReportView.as_view(),
+        name="report_lengkap",
+    ),
+    path(
+        "laporan/lengkap/export/",
+        CombinedReportExportView.as_view(),
+        name="report_lengkap_export",
+    ),
+    path("laporan/peer/", PeerReportView.as_view(), name="report_peer"),
     path("emiten/", CompanyListView.as_view(), name="company_list"),
+    path("api/emiten/", CompanySearchView.as_view(), name="company_search"),
+    path(
+        "api/emiten/<str:ticker>/series/",
+        ConceptSeriesAPIView.as_view(),
+        name="concept_series",
+    ),
+    path("screener/", ScreenerView.as_view(), name="screener"),
+    path("api/screener/", ScreenerAPIView.as_view(), name="screener_api"),
+    path("api/sektor/agregat/", SectorAggregateAPIView.as_view(), name="sector_aggregates"),
+    path("metrics", MetricsView.as_view(), name="metrics"),
 ]
 
 if settings.DEBUG:
@@ -1,6 +1,20 @@
 from django.contrib import admin
+from django.utils.html import format_html
 
-from .models import Company, Context, Fact, Filing, ReportTemplate, TemplateItem
+from .models import (
+    Company,
+    Concept,
+    Context,
+    Fact,
+    Filing,
+    RatioDefinition,
+    RatioValue,
+    ReportTemplate,
+    SectorAggregate,
+    SlowQuery,
+    TemplateItem,
+)
+from .services import delete_company, delete_filings
 
 
 @admin.register(Company)
@@ -8,6 +22,13 @@ class CompanyAdmin(admin.ModelAdmin):
     list_display = ("ticker", "name", "created_at")
     search_fields = ("ticker", "name")
 
+    def delete_model(self, request, obj):
+        delete_company(obj)
+
+    def delete_queryset(self, request, queryset):
+        for company in queryset:
+            delete_company(company)
+
 
 @admin.register(Filing)
 class FilingAdmin(admin.ModelAdmin):
@@ -21,6 +42,12 @@ class FilingAdmin(admin.ModelAdmin):
     list_filter = ("company",)
     search_fields = ("company__ticker", "period_label")
 
+    def delete_model(self, request, obj):
+        delete_filings([obj.pk])
+
+    def delete_queryset(self, request, queryset):
+        delete_filings(queryset.values_list("pk", flat=True))
+
 
 @admin.register(Context)
 class ContextAdmin(admin.ModelAdmin):
@@ -36,6 +63,13 @@ class FactAdmin(admin.ModelAdmin):
     list_filter = ("filing",)
 
 
+@admin.register(Concept)
+class ConceptAdmin(admin.ModelAdmin):
+    list_display = ("name", "fact_count", "filing_count", "example_value")
+    search_fields = ("name_lower",)
+    readonly_fields = ("updated_at",)
+
+
 class TemplateItemInline(admin.TabularInline):
     model = TemplateItem
     extra = 1
@@ -52,3 +86,65 @@ class ReportTemplateAdmin(admin.ModelAdmin):
 class TemplateItemAdmin(admin.ModelAdmin):
     list_display = ("template", "label", "primary_fact", "order", "level")
     list_filter = ("template",)
+
+
+@admin.register(RatioDefinition)
+class RatioDefinitionAdmin(admin.ModelAdmin):
+    list_display = ("code", "name", "multiplier", "is_active", "updated_at")
+    list_filter = ("is_active",)
+    search_fields = ("code", "name")
+    prepopulated_fields = {"code": ("name",)}
+
+
+@admin.register(RatioValue)
+class RatioValueAdmin(admin.ModelAdmin):
+    list_display = ("ratio", "filing", "value", "status", "computed_at")
+    list_filter = ("ratio", "status")
+    search_fields = ("filing__company__ticker",)
+    list_select_related = ("ratio", "filing__company")
+
+
+@admin.register(SectorAggregate)
+class SectorAggregateAdmin(admin.ModelAdmin):
+    list_display = ("concept", "period_end", "level", "sector", "subsector", "count", "median")
+    list_filter = ("level", "period_end")
+    search_fields = ("concept", "sector", "subsector", "industry", "subindustry")
+
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(admin.ModelAdmin):
+    list_display = ("captured_at", "duration_ms", "view_name", "method", "short_sql", "database")
+    list_filter = ("view_name", "database", "method")
+    search_fields = ("sql", "path", "fingerprint")
+    date_hierarchy = "captured_at"
+    fields = (
+        "captured_at",
+        "duration_ms",
+        "database",
+        "method",
+        "path",
+        "view_name",
+        "fingerprint",
+        "params_shape",
+        "formatted_sql",
+        "formatted_explain",
+    )
+    readonly_fields = fields
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    @admin.display(description="SQL")
+    def short_sql(self, obj):
+        return obj.sql[:120]
+
+    @admin.display(description="SQL")
+    def formatted_sql(self, obj):
+        return format_html("<pre style=\"white-space: pre-wrap\">{}</pre>", obj.sql)
+
+    @admin.display(description="EXPLAIN")
+    def formatted_explain(self, obj):
+        return format_html("<pre>{}</pre>", obj.explain or "-")
@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class ReportsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'reports'
+
+    def ready(self):
+        from .site_stats import connect_signals
+        from .template_plans import connect_signals as connect_template_signals
+        from .warmup import should_warm_on_start, warm_caches_async
+
+        connect_signals()
+        connect_template_signals()
+        if should_warm_on_start():
+            warm_caches_async()
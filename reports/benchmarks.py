@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Callable
+
+import django
+from django.conf import settings
+from django.core.files import File
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .fact_cache import cached_fact_lookup, invalidate_filing, load_lookup_facts
+from .models import ReportTemplate, TemplateItem
+from .parser import XBRLParser
+from .services import ingest_xbrl
+from .synthetic import SyntheticSpec, write_instance
+from .template_plans import compile_template_plan, touch_template
+from .views import _build_template_rows
+
+TEMPLATE_ITEM_COUNT = 80
+
+
+class _Rollback(Exception):
+    pass
+
+
+def run_benchmarks(
+    sizes: list[int],
+    repeat: int = 3,
+    context_count: int | None = None,
+    dimension_depth: int = 1,
+    text_block_size: int = 2000,
+    seed: int = 0,
+) -> dict:
+    """Ukur parser, ingest, lookup fakta, dan `_build_template_rows` per ukuran.
+
+    Lookup diukur terpisah: langsung ke database (`fact_lookup_db`), cache
+    kosong yang harus diisi (`fact_lookup_cache_cold`), dan cache terisi
+    (`fact_lookup_cache_warm`).
+
+    Semua penulisan database dilakukan di dalam transaksi yang selalu
+    di-rollback dan file XBRL yang tersimpan dihapus, sehingga aman
+    dijalankan pada database pengembangan.
+    """
+    results = []
+    for size in sizes:
+        spec = SyntheticSpec(
+            fact_count=size,
+            context_count=context_count or max(8, min(size // 250, 400)),
+            dimension_depth=dimension_depth,
+            text_block_size=text_block_size,
+            ticker="BENCH",
+            seed=seed,
+        )
+        with tempfile.NamedTemporaryFile(suffix=".xbrl") as instance:
+            write_instance(instance, spec)
+            instance.flush()
+            file_size = instance.tell()
+            results.append(
+                {
+                    "spec": {**asdict(spec), "period_end": spec.period_end.isoformat()},
+                    "file_bytes": file_size,
+                    **_benchmark_size(Path(instance.name), size, repeat),
+                }
+            )
+
+    return {
+        "created_at": timezone.now().isoformat(),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "database": connection.vendor,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def _benchmark_size(path: Path, size: int, repeat: int) -> dict:
+    def parse():
+        with path.open("rb") as handle:
+            return XBRLParser(handle).parse()
+
+    parse_timing = _measure(parse, repeat)
+    parse_timing["facts_per_second"] = _rate(size, parse_timing["median"])
+
+    ingest_samples = []
+    lookup_samples = {"db": [], "cache_cold": [], "cache_warm": []}
+    rows_samples = []
+    for _ in range(repeat):
+        try:
+            with transaction.atomic():
+                with path.open("rb") as handle:
+                    started = time.perf_counter()
+                    result = ingest_xbrl(File(handle, name=path.name))
+                    ingest_samples.append(time.perf_counter() - started)
+                try:
+                    template = _benchmark_template(result.filing)
+                    concepts = compile_template_plan(template).concepts
+
+                    started = time.perf_counter()
+                    lookup = load_lookup_facts([result.filing.pk], concepts)[result.filing.pk]
+                    lookup_samples["db"].append(time.perf_counter() - started)
+
+                    invalidate_filing(result.filing.pk)
+                    for phase in ("cache_cold", "cache_warm"):
+                        started = time.perf_counter()
+                        cached_fact_lookup(result.filing, concepts)
+                        lookup_samples[phase].append(time.perf_counter() - started)
+
+                    started = time.perf_counter()
+                    _build_template_rows(template, lookup, lookup)
+                    rows_samples.append(time.perf_counter() - started)
+                finally:
+                    # Id filing dipakai ulang setelah rollback; jangan tinggalkan entri cache.
+                    invalidate_filing(result.filing.pk)
+                    result.filing.xbrl_file.delete(save=False)
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    ingest_timing = _summary(ingest_samples)
+    ingest_timing["facts_per_second"] = _rate(size, ingest_timing["median"])
+    return {
+        "parse": parse_timing,
+        "ingest": ingest_timing,
+        **{f"fact_lookup_{phase}": _summary(samples) for phase, samples in lookup_samples.items()},
+        "build_template_rows": {**_summary(rows_samples), "items": TEMPLATE_ITEM_COUNT},
+    }
+
+
+def _benchmark_template(filing) -> ReportTemplate:
+    """Template dengan campuran item primary, fallback, dan kode yang tidak ada."""
+    template = ReportTemplate.objects.create(name="Benchmark", slug=f"benchmark-{filing.pk}")
+    names = list(
+        filing.facts.order_by("name").values_list("name", flat=True).distinct()[: TEMPLATE_ITEM_COUNT * 2]
+    )
+    items = []
+    for position in range(TEMPLATE_ITEM_COUNT):
+        primary = names[position % len(names)] if names else f"Missing{position}"
+        if position % 3 == 0:
+            fallbacks, primary = primary, f"Missing{position}"
+        else:
+            fallbacks = names[(position + 1) % len(names)] if names else ""
+        items.append(
+            TemplateItem(
+                template=template,
+                label=f"Item {position}",
+                primary_fact=primary,
+                fallback_facts=fallbacks,
+                order=position,
+                level=position % 3,
+            )
+        )
+    TemplateItem.objects.bulk_create(items)
+    # bulk_create melewati sinyal, dan pk template bisa dipakai ulang setelah rollback.
+    touch_template(template)
+    return template
+
+
+def _measure(func: Callable, repeat: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return _summary(samples)
+
+
+def _summary(samples: list[float]) -> dict:
+    if not samples:
+        return {"min": None, "median": None, "max": None, "samples": []}
+    return {
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "max": max(samples),
+        "samples": samples,
+    }
+
+
+def _rate(count: int, seconds: float | None) -> float | None:
+    return count / seconds if seconds else None
+
+
+def _git_commit() -> str | None:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return completed.stdout.strip() or None
@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Iterable
+
+from django.db import transaction
+from django.db.models import Count, Max, Min
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from .models import Concept, Fact
+from .parser import ParsedFact
+from .search import search_text
+
+EXAMPLE_MAX_LENGTH = 200
+INDEX_RECHECK_SECONDS = 30
+UPSERT_BATCH_SIZE = 500
+
+
+@dataclass
+class ConceptEntry:
+    name: str
+    fact_count: int
+    filing_count: int
+    example_value: str
+
+
+class ConceptIndex:
+    """Indeks konsep di memori untuk autocomplete.
+
+    Prefix dicari dengan bisect pada daftar nama terurut. Infix cukup dipindai
+    linear karena jumlah konsep taksonomi hanya ribuan.
+    """
+
+    def __init__(self, entries: list[ConceptEntry], version) -> None:
+        self.entries = sorted(entries, key=lambda entry: entry.name.lower())
+        self.version = version
+        self.checked_at = time.monotonic()
+        self._names = [entry.name.lower() for entry in self.entries]
+
+    def search(self, query: str, limit: int) -> list[ConceptEntry]:
+        needle = query.strip().lower()
+        if not needle:
+            return []
+
+        start = bisect_left(self._names, needle)
+        end = start
+        while end < len(self._names) and self._names[end].startswith(needle):
+            end += 1
+        prefix_hits = list(range(start, end))
+        infix_hits = [
+            idx
+            for idx, name in enumerate(self._names)
+            if (idx < start or idx >= end) and needle in name
+        ]
+
+        def popularity(idx: int):
+            return -self.entries[idx].fact_count
+
+        ranked = sorted(prefix_hits, key=popularity) + sorted(infix_hits, key=popularity)
+        return [self.entries[idx] for idx in ranked[:limit]]
+
+
+_index: ConceptIndex | None = None
+_index_lock = threading.Lock()
+
+
+def get_concept_index() -> ConceptIndex:
+    """Kembalikan indeks konsep, dibangun ulang bila katalog di DB berubah."""
+    global _index
+    index = _index
+    if index is not None and time.monotonic() - index.checked_at < INDEX_RECHECK_SECONDS:
+        return index
+
+    version = _catalog_version()
+    with _index_lock:
+        if _index is None or _index.version != version:
+            entries = [
+                ConceptEntry(*row)
+                for row in Concept.objects.order_by().values_list(
+                    "name", "fact_count", "filing_count", "example_value"
+                )
+            ]
+            _index = ConceptIndex(entries, version)
+        else:
+            _index.checked_at = time.monotonic()
+        return _index
+
+
+def invalidate_concept_index() -> None:
+    global _index
+    _index = None
+
+
+def search_concepts(query: str, limit: int = 20) -> list[ConceptEntry]:
+    return get_concept_index().search(query, limit)
+
+
+def add_facts_to_catalog(parsed_facts: Iterable[ParsedFact]) -> None:
+    """Tambahkan fakta satu filing ke katalog konsep secara inkremental."""
+    stats: dict[str, list] = {}
+    for fact in parsed_facts:
+        key = fact.name.lower()
+        entry = stats.get(key)
+        if entry is None:
+            stats[key] = [fact.name, fact.namespace, 1, _example(fact.value)]
+        else:
+            entry[2] += 1
+            if not entry[3]:
+                entry[3] = _example(fact.value)
+
+    keys = list(stats)
+    with transaction.atomic():
+        for start in range(0, len(keys), UPSERT_BATCH_SIZE):
+            chunk = keys[start : start + UPSERT_BATCH_SIZE]
+            _create_missing_concepts(chunk, stats)
+            to_update = []
+            for concept in Concept.objects.select_for_update().filter(name_lower__in=chunk):
+                _, _, count, example = stats[concept.name_lower]
+                concept.fact_count += count
+                concept.filing_count += 1
+                if not concept.example_value:
+                    concept.example_value = example
+                to_update.append(concept)
+            _save_counts(to_update)
+    # Indeks di memori baru dibuang setelah commit agar tidak dibangun dari data yang batal.
+    transaction.on_commit(invalidate_concept_index)
+
+
+def remove_filing_from_catalog(filing_id: int) -> None:
+    """Kurangi hitungan katalog untuk fakta filing yang akan dihapus."""
+    counts = dict(
+        Fact.objects.filter(filing_id=filing_id)
+        .annotate(name_lower=Lower("name"))
+        .order_by()
+        .values("name_lower")
+        .annotate(total=Count("id"))
+        .values_list("name_lower", "total")
+    )
+    keys = list(counts)
+    with transaction.atomic():
+        for start in range(0, len(keys), UPSERT_BATCH_SIZE):
+            chunk = keys[start : start + UPSERT_BATCH_SIZE]
+            to_update = []
+            to_delete = []
+            for concept in Concept.objects.select_for_update().filter(
+                name_lower__in=chunk
+            ):
+                concept.fact_count = max(concept.fact_count - counts[concept.name_lower], 0)
+                concept.filing_count = max(concept.filing_count - 1, 0)
+                if concept.fact_count == 0:
+                    to_delete.append(concept.pk)
+                else:
+                    to_update.append(concept)
+            Concept.objects.filter(pk__in=to_delete).delete()
+            _save_counts(to_update)
+    transaction.on_commit(invalidate_concept_index)
+
+
+def rebuild_catalog() -> int:
+    """Hitung ulang seluruh katalog konsep dari tabel fakta."""
+    rows = (
+        Fact.objects.annotate(name_lower=Lower("name"))
+        .order_by()
+        .values("name_lower")
+        .annotate(
+            display_name=Min("name"),
+            namespace_value=Max("namespace"),
+            total=Count("id"),
+            filings=Count("filing", distinct=True),
+            example=Max("value"),
+        )
+    )
+    concepts = [
+        Concept(
+            name=row["display_name"],
+            name_lower=row["name_lower"],
+            namespace=row["namespace_value"] or "",
+            fact_count=row["total"],
+            filing_count=row["filings"],
+            example_value=_example(row["example"]),
+        )
+        for row in rows.iterator()
+    ]
+    with transaction.atomic():
+        Concept.objects.all().delete()
+        Concept.objects.bulk_create(concepts, batch_size=UPSERT_BATCH_SIZE)
+    transaction.on_commit(invalidate_concept_index)
+    return len(concepts)
+
+
+def _create_missing_concepts(keys: list[str], stats: dict[str, list]) -> None:
+    """Sisipkan baris kosong untuk konsep baru sebelum baris dikunci dan ditambah.
+
+    `select_for_update` tidak bisa mengunci baris yang belum ada, jadi dua
+    ingest yang membawa konsep baru yang sama bisa sama-sama mencoba INSERT.
+    Konflik pada `name_lower` diabaikan; hitungan ditambahkan setelahnya.
+    """
+    existing = set(Concept.objects.filter(name_lower__in=keys).values_list("name_lower", flat=True))
+    missing = [
+        Concept(
+            name=stats[key][0],
+            name_lower=key,
+            namespace=stats[key][1],
+            fact_count=0,
+            filing_count=0,
+        )
+        for key in keys
+        if key not in existing
+    ]
+    if missing:
+        Concept.objects.bulk_create(missing, batch_size=UPSERT_BATCH_SIZE, ignore_conflicts=True)
+
+
+def _save_counts(concepts: list[Concept]) -> None:
+    if not concepts:
+        return
+    now = timezone.now()
+    for concept in concepts:
+        concept.updated_at = now
+    Concept.objects.bulk_update(
+        concepts,
+        ["fact_count", "filing_count", "example_value", "updated_at"],
+        batch_size=UPSERT_BATCH_SIZE,
+    )
+
+
+def _catalog_version() -> tuple:
+    version = Concept.objects.aggregate(latest=Max("updated_at"), total=Count("id"))
+    return version["latest"], version["total"]
+
+
+def _example(value: str | None) -> str:
+    return search_text(value)[:EXAMPLE_MAX_LENGTH]
@@ -0,0 +1,289 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .models import Company, Context, Fact, Filing
+
+CHUNK_ROWS = 50_000
+MANIFEST_NAME = "_manifest.json"
+MANIFEST_FLUSH_EVERY = 50
+COMPRESSION = "zstd"
+
+_text = pa.string()
+_dictionary = pa.dictionary(pa.int32(), pa.string())
+
+COMPANY_SCHEMA = pa.schema(
+    [
+        ("id", pa.int64()),
+        ("ticker", _text),
+        ("name", _text),
+        ("entity_code", _text),
+        ("entity_name", _text),
+        ("entity_main_industry", _dictionary),
+        ("sector", _dictionary),
+        ("subsector", _dictionary),
+        ("industry", _dictionary),
+        ("subindustry", _dictionary),
+    ]
+)
+FILING_SCHEMA = pa.schema(
+    [
+        ("id", pa.int64()),
+        ("company_id", pa.int64()),
+        ("ticker", _dictionary),
+        ("period_label", _text),
+        ("period_start", pa.date32()),
+        ("period_end", pa.date32()),
+        ("instant_date", pa.date32()),
+        ("document_type", _dictionary),
+        ("source_filename", _text),
+        ("uploaded_at", pa.timestamp("us", tz="UTC")),
+        ("year", pa.int16()),
+    ]
+)
+CONTEXT_SCHEMA = pa.schema(
+    [
+        ("filing_id", pa.int64()),
+        ("context_id", _dictionary),
+        ("entity_identifier", _dictionary),
+        ("start_date", pa.date32()),
+        ("end_date", pa.date32()),
+        ("instant_date", pa.date32()),
+        ("period_type", _dictionary),
+    ]
+)
+FACT_SCHEMA = pa.schema(
+    [
+        ("filing_id", pa.int64()),
+        ("company_id", pa.int64()),
+        ("order", pa.int32()),
+        ("name", _dictionary),
+        ("namespace", _dictionary),
+        ("context_id", _dictionary),
+        ("period_start", pa.date32()),
+        ("period_end", pa.date32()),
+        ("instant_date", pa.date32()),
+        ("unit", _dictionary),
+        ("decimals", pa.int32()),
+        ("value", _text),
+        ("value_numeric", pa.float64()),
+    ]
+)
+
+
+@dataclass
+class ColumnarExportResult:
+    exported: int
+    removed: int
+    unchanged: int
+    fact_rows: int
+
+
+def export_columnar(output_dir: str | Path, full: bool = False) -> ColumnarExportResult:
+    """Ekspor gudang fakta ke Parquet yang dipartisi per tahun.
+
+    Setiap filing ditulis ke `facts/year=YYYY/filing-<id>.parquet` (dan
+    `contexts/...`), sehingga run berikutnya cukup menulis filing yang baru
+    atau berubah dan menghapus file milik filing yang sudah tidak ada.
+    Tabel emiten dan filing kecil, jadi selalu ditulis ulang utuh. Dengan
+    `full`, pohon `facts/` dan `contexts/` dihapus seluruhnya lebih dulu agar
+    tidak ada file sisa yang terbaca sebagai data.
+    """
+    root = Path(output_dir)
+    root.mkdir(parents=True, exist_ok=True)
+    manifest_path = root / MANIFEST_NAME
+    manifest = _read_manifest(manifest_path) if manifest_path.exists() else {}
+
+    current = {}
+    for filing_id, uploaded_at, period_end, instant_date in Filing.objects.values_list(
+        "id", "uploaded_at", "period_end", "instant_date"
+    ).iterator():
+        current[str(filing_id)] = {
+            "uploaded_at": uploaded_at.isoformat(),
+            "year": _partition_year(period_end, instant_date, uploaded_at),
+        }
+
+    removed = 0
+    if full:
+        removed = sum(filing_id not in current for filing_id in manifest)
+        for table in ("facts", "contexts"):
+            shutil.rmtree(root / table, ignore_errors=True)
+        manifest = {}
+    for filing_id, entry in list(manifest.items()):
+        if current.get(filing_id) != entry:
+            for table in ("facts", "contexts"):
+                _filing_path(root, table, entry["year"], filing_id).unlink(missing_ok=True)
+            del manifest[filing_id]
+            removed += filing_id not in current
+
+    pending = [filing_id for filing_id in current if filing_id not in manifest]
+    fact_rows = 0
+    for position, filing_id in enumerate(pending, start=1):
+        entry = current[filing_id]
+        fact_rows += _write_rows(
+            _filing_path(root, "facts", entry["year"], filing_id),
+            FACT_SCHEMA,
+            _fact_rows(int(filing_id)),
+        )
+        _write_rows(
+            _filing_path(root, "contexts", entry["year"], filing_id),
+            CONTEXT_SCHEMA,
+            _context_rows(int(filing_id)),
+        )
+        manifest[filing_id] = entry
+        # Manifest disimpan berkala agar run yang terputus bisa dilanjutkan.
+        if position % MANIFEST_FLUSH_EVERY == 0:
+            _write_manifest(manifest_path, manifest)
+
+    _write_rows(root / "companies.parquet", COMPANY_SCHEMA, _company_rows())
+    _write_rows(root / "filings.parquet", FILING_SCHEMA, _filing_rows())
+    _write_manifest(manifest_path, manifest)
+    return ColumnarExportResult(
+        exported=len(pending),
+        removed=removed,
+        unchanged=len(current) - len(pending),
+        fact_rows=fact_rows,
+    )
+
+
+def _fact_rows(filing_id: int) -> Iterator[tuple]:
+    rows = (
+        Fact.objects.filter(filing_id=filing_id)
+        .order_by("order", "id")
+        .values_list(
+            "filing_id",
+            "filing__company_id",
+            "order",
+            "name",
+            "namespace",
+            "context__context_id",
+            "context__start_date",
+            "context__end_date",
+            "context__instant_date",
+            "unit",
+            "decimals",
+            "value",
+        )
+        .iterator(chunk_size=5000)
+    )
+    for *columns, decimals, value in rows:
+        yield (*columns, _as_int(decimals), value, _as_float(value))
+
+
+def _context_rows(filing_id: int) -> Iterator[tuple]:
+    return (
+        Context.objects.filter(filing_id=filing_id)
+        .order_by("id")
+        .values_list(
+            "filing_id",
+            "context_id",
+            "entity_identifier",
+            "start_date",
+            "end_date",
+            "instant_date",
+            "period_type",
+        )
+        .iterator(chunk_size=5000)
+    )
+
+
+def _company_rows() -> Iterator[tuple]:
+    return Company.objects.order_by("id").values_list(*COMPANY_SCHEMA.names).iterator()
+
+
+def _filing_rows() -> Iterator[tuple]:
+    rows = (
+        Filing.objects.order_by("id")
+        .values_list(
+            "id",
+            "company_id",
+            "company__ticker",
+            "period_label",
+            "period_start",
+            "period_end",
+            "instant_date",
+            "document_type",
+            "source_filename",
+            "uploaded_at",
+        )
+        .iterator()
+    )
+    for row in rows:
+        yield (*row, _partition_year(row[5], row[6], row[9]))
+
+
+def _write_rows(path: Path, schema: pa.Schema, rows) -> int:
+    """Tulis baris per chunk sebagai row group, lalu ganti file lama secara atomik."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".parquet.tmp")
+    total = 0
+    with pq.ParquetWriter(tmp_path, schema, compression=COMPRESSION) as writer:
+        columns: list[list] = [[] for _ in schema.names]
+        for row in rows:
+            for column, value in zip(columns, row):
+                column.append(value)
+            if len(columns[0]) >= CHUNK_ROWS:
+                total += _flush(writer, schema, columns)
+        total += _flush(writer, schema, columns)
+    os.replace(tmp_path, path)
+    return total
+
+
+def _flush(writer: pq.ParquetWriter, schema: pa.Schema, columns: list[list]) -> int:
+    count = len(columns[0])
+    if not count:
+        return 0
+    arrays = [
+        pa.array(values, type=pa.string()).dictionary_encode()
+        if pa.types.is_dictionary(field.type)
+        else pa.array(values, type=field.type)
+        for field, values in zip(schema, columns)
+    ]
+    writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+    for values in columns:
+        values.clear()
+    return count
+
+
+def _filing_path(root: Path, table: str, year: int, filing_id: str) -> Path:
+    return root / table / f"year={year}" / f"filing-{filing_id}.parquet"
+
+
+def _partition_year(period_end, instant_date, uploaded_at) -> int:
+    return (period_end or instant_date or uploaded_at).year
+
+
+def _read_manifest(path: Path) -> dict:
+    return json.loads(path.read_text(encoding="utf-8")).get("filings", {})
+
+
+def _write_manifest(path: Path, filings: dict) -> None:
+    tmp_path = path.with_suffix(".json.tmp")
+    tmp_path.write_text(json.dumps({"filings": filings}, indent=1), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def _as_int(value: str | None) -> int | None:
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
+
+
+def _as_float(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        number = float(value.replace(",", ""))
+    except ValueError:
+        return None
+    return number if math.isfinite(number) else None
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from datetime import date
+from typing import Iterable, Iterator
+
+from .models import ConceptValue, Context, Fact, Filing
+from .parser import ParsedFact
+
+WRITE_BATCH_SIZE = 1000
+ANNUAL_MIN_DAYS = 360
+
+FactPeriod = tuple[str, str | None, date | None, date | None, date | None]
+
+
+def index_filing_values(
+    filing: Filing,
+    parsed_facts: Iterable[ParsedFact],
+    context_lookup: dict[str, Context],
+) -> int:
+    """Simpan nilai numerik periode filing sendiri ke tabel ConceptValue."""
+
+    def fact_periods() -> Iterator[FactPeriod]:
+        for fact in parsed_facts:
+            context = context_lookup.get(fact.context_ref or "")
+            if context is None:
+                continue
+            yield (
+                fact.name,
+                fact.value,
+                context.start_date,
+                context.end_date,
+                context.instant_date,
+            )
+
+    return _write_values(filing, fact_periods())
+
+
+def rebuild_concept_values() -> int:
+    """Isi ulang seluruh ConceptValue dari tabel fakta, satu filing per langkah."""
+    ConceptValue.objects.all().delete()
+    total = 0
+    for filing in Filing.objects.order_by("uploaded_at", "id").iterator():
+        total += reindex_filing_values(filing)
+    return total
+
+
+def reindex_filing_values(filing: Filing) -> int:
+    """Simpan ConceptValue satu filing dari fakta yang sudah ada di database."""
+    fact_rows = (
+        Fact.objects.filter(filing=filing, context__isnull=False)
+        .order_by("order", "id")
+        .values_list(
+            "name",
+            "value",
+            "context__start_date",
+            "context__end_date",
+            "context__instant_date",
+        )
+        .iterator(chunk_size=5000)
+    )
+    return _write_values(filing, fact_rows)
+
+
+@dataclass
+class SeriesPoint:
+    period_start: date
+    period_end: date
+    value: float
+    filing_id: int
+
+    @property
+    def is_instant(self) -> bool:
+        return self.period_start == self.period_end
+
+
+def concept_series(
+    ticker: str,
+    concept: str,
+    start: date | None = None,
+    end: date | None = None,
+    annual: bool = False,
+) -> list[SeriesPoint]:
+    """Deret waktu satu konsep milik satu emiten, urut menurut akhir periode.
+
+    Dibaca sebagai satu range scan pada indeks (emiten, konsep, akhir periode).
+    Dengan `annual`, nilai durasi di bawah satu tahun (kuartalan/semesteran)
+    dibuang sehingga deret durasi hanya berisi angka tahunan.
+    """
+    queryset = ConceptValue.objects.filter(
+        company__ticker=ticker.upper(), concept=concept.strip().lower()
+    )
+    if start:
+        queryset = queryset.filter(period_end__gte=start)
+    if end:
+        queryset = queryset.filter(period_end__lte=end)
+    rows = queryset.order_by("period_end", "period_start").values_list(
+        "period_start", "period_end", "value", "filing_id"
+    )
+    points = [SeriesPoint(*row) for row in rows]
+    if annual:
+        points = [
+            point
+            for point in points
+            if point.is_instant
+            or (point.period_end - point.period_start).days >= ANNUAL_MIN_DAYS
+        ]
+    return points
+
+
+def downsample_series(points: list[SeriesPoint], threshold: int) -> list[SeriesPoint]:
+    """Kurangi jumlah titik dengan Largest-Triangle-Three-Buckets.
+
+    Titik pertama dan terakhir selalu dipertahankan; di setiap bucket dipilih
+    titik yang membentuk segitiga terbesar sehingga puncak dan lembah tetap
+    terlihat di grafik.
+    """
+    if threshold < 3 or len(points) <= threshold:
+        return points
+
+    def x(point: SeriesPoint) -> float:
+        return point.period_end.toordinal()
+
+    sampled = [points[0]]
+    bucket_size = (len(points) - 2) / (threshold - 2)
+    anchor = points[0]
+    for bucket in range(threshold - 2):
+        start = int(bucket * bucket_size) + 1
+        stop = int((bucket + 1) * bucket_size) + 1
+        next_stop = min(int((bucket + 2) * bucket_size) + 1, len(points))
+        following = points[stop:next_stop] or [points[-1]]
+        avg_x = sum(x(point) for point in following) / len(following)
+        avg_y = sum(point.value for point in following) / len(following)
+
+        best = points[start]
+        best_area = -1.0
+        for point in points[start:stop]:
+            area = abs(
+                (x(anchor) - avg_x) * (point.value - anchor.value)
+                - (x(anchor) - x(point)) * (avg_y - anchor.value)
+            )
+            if area > best_area:
+                best, best_area = point, area
+        sampled.append(best)
+        anchor = best
+    sampled.append(points[-1])
+    return sampled
+
+
+def own_period(filing: Filing) -> tuple[date | None, date | None, date | None]:
+    """Periode durasi (awal, akhir) dan tanggal instan milik filing."""
+    return (
+        filing.period_start,
+        filing.period_end,
+        filing.period_end or filing.instant_date,
+    )
+
+
+def _write_values(filing: Filing, fact_periods: Iterable[FactPeriod]) -> int:
+    period_start, period_end, instant = own_period(filing)
+    rows: dict[tuple[str, date, date], ConceptValue] = {}
+    for name, raw_value, start_date, end_date, instant_date in fact_periods:
+        if instant_date is not None:
+            if instant_date != instant:
+                continue
+            key_start = key_end = instant_date
+        elif end_date is not None:
+            if end_date != period_end or (period_start and start_date != period_start):
+                continue
+            key_start, key_end = start_date or end_date, end_date
+        else:
+            continue
+        value = _as_float(raw_value)
+        if value is None:
+            continue
+        key = (name.lower(), key_start, key_end)
+        if key in rows:
+            continue
+        rows[key] = ConceptValue(
+            company_id=filing.company_id,
+            filing=filing,
+            concept=key[0],
+            period_start=key_start,
+            period_end=key_end,
+            value=value,
+        )
+
+    ConceptValue.objects.bulk_create(
+        rows.values(),
+        batch_size=WRITE_BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=["company", "concept", "period_start", "period_end"],
+        update_fields=["filing", "value"],
+    )
+    return len(rows)
+
+
+def _as_float(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        number = float(value.replace(",", ""))
+    except ValueError:
+        return None
+    return number if math.isfinite(number) else None
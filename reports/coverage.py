@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import time
+
+import numpy as np
+from django.db.models.functions import Lower
+
+from .models import CoverageRun, Fact, Filing, ReportTemplate
+
+WEAK_ROW_THRESHOLD = 0.8
+WORST_FILING_LIMIT = 20
+
+
+def analyze_template_coverage(
+    weak_threshold: float = WEAK_ROW_THRESHOLD,
+) -> CoverageRun:
+    """Hitung cakupan setiap baris template terhadap seluruh filing.
+
+    Fakta dibaca sekali menjadi bitmap kehadiran konsep per filing, lalu
+    resolusi primary/fallback dihitung sebagai operasi array untuk semua
+    item dan filing sekaligus.
+    """
+    started = time.perf_counter()
+    templates = list(ReportTemplate.objects.prefetch_related("items").order_by("name"))
+    items = [item for template in templates for item in template.items.all()]
+
+    concept_index: dict[str, int] = {}
+    item_codes: list[list[int]] = []
+    for item in items:
+        codes = []
+        for code in [item.primary_fact] + item.fallback_list():
+            codes.append(concept_index.setdefault(code.lower(), len(concept_index)))
+        item_codes.append(codes)
+
+    filings = list(
+        Filing.objects.select_related("company")
+        .order_by("company__ticker", "period_label")
+        .only("id", "period_label", "company__ticker")
+    )
+    filing_index = {filing.id: pos for pos, filing in enumerate(filings)}
+    presence = _presence_bitmap(filing_index, concept_index)
+
+    # Matriks kode item (I x K); slot kosong menunjuk kolom dummy yang selalu False.
+    max_codes = max((len(codes) for codes in item_codes), default=1)
+    code_matrix = np.full((len(items), max_codes), len(concept_index), dtype=np.int64)
+    for row, codes in enumerate(item_codes):
+        code_matrix[row, : len(codes)] = codes
+    padded = np.zeros((len(filings), len(concept_index) + 1), dtype=bool)
+    padded[:, :-1] = presence
+
+    candidates = padded[:, code_matrix]  # F x I x K
+    hits = candidates.any(axis=2)  # F x I
+    resolved_by = np.where(hits, candidates.argmax(axis=2), -1)
+
+    membership = np.zeros((len(items), len(templates)), dtype=np.float64)
+    item_template = {}
+    position = 0
+    for t_pos, template in enumerate(templates):
+        for _ in template.items.all():
+            membership[position, t_pos] = 1.0
+            item_template[position] = t_pos
+            position += 1
+    item_totals = membership.sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        template_rates = (hits.astype(np.float64) @ membership) / item_totals  # F x T
+
+    filing_count = len(filings)
+    item_rates = hits.mean(axis=0) if filing_count else np.zeros(len(items))
+    resolution_counts = [
+        np.bincount(resolved_by[:, row][resolved_by[:, row] >= 0], minlength=max_codes)
+        for row in range(len(items))
+    ]
+
+    template_payload = []
+    for t_pos, template in enumerate(templates):
+        rates = template_rates[:, t_pos] if filing_count else np.zeros(0)
+        valid = rates[~np.isnan(rates)]
+        worst = np.argsort(np.nan_to_num(rates, nan=1.0))[:WORST_FILING_LIMIT]
+        template_payload.append(
+            {
+                "id": template.id,
+                "name": template.name,
+                "item_count": int(item_totals[t_pos]),
+                "mean_rate": float(valid.mean()) if valid.size else None,
+                "min_rate": float(valid.min()) if valid.size else None,
+                "median_rate": float(np.median(valid)) if valid.size else None,
+                "worst_filings": [
+                    {
+                        "filing_id": filings[pos].id,
+                        "ticker": filings[pos].company.ticker,
+                        "period_label": filings[pos].period_label,
+                        "rate": float(rates[pos]),
+                    }
+                    for pos in worst
+                    if not np.isnan(rates[pos])
+                ],
+            }
+        )
+
+    item_payload = []
+    for row, item in enumerate(items):
+        counts = resolution_counts[row]
+        codes = [item.primary_fact] + item.fallback_list()
+        item_payload.append(
+            {
+                "id": item.id,
+                "template_id": templates[item_template[row]].id,
+                "label": item.label,
+                "order": item.order,
+                "hit_rate": float(item_rates[row]),
+                "missing": int(filing_count - counts.sum()),
+                "resolved_by": [
+                    {"code": code, "count": int(counts[pos])}
+                    for pos, code in enumerate(codes)
+                ],
+                "weak": bool(item_rates[row] < weak_threshold),
+            }
+        )
+
+    return CoverageRun.objects.create(
+        filing_count=filing_count,
+        item_count=len(items),
+        weak_threshold=weak_threshold,
+        duration_ms=int((time.perf_counter() - started) * 1000),
+        results={"templates": template_payload, "items": item_payload},
+    )
+
+
+def _presence_bitmap(
+    filing_index: dict[int, int], concept_index: dict[str, int]
+) -> np.ndarray:
+    presence = np.zeros((len(filing_index), len(concept_index)), dtype=bool)
+    if not filing_index or not concept_index:
+        return presence
+    pairs = (
+        Fact.objects.annotate(name_lower=Lower("name"))
+        .filter(name_lower__in=list(concept_index))
+        .order_by()
+        .values_list("filing_id", "name_lower")
+        .distinct()
+        .iterator(chunk_size=5000)
+    )
+    rows = []
+    cols = []
+    for filing_id, name_lower in pairs:
+        pos = filing_index.get(filing_id)
+        if pos is not None:
+            rows.append(pos)
+            cols.append(concept_index[name_lower])
+    presence[np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64)] = True
+    return presence
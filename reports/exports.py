@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+import csv
+import math
+import re
+import zipfile
+from datetime import date, datetime
+from decimal import Decimal
+from itertools import islice
+from typing import Iterable, Iterator, Sequence
+from xml.sax.saxutils import escape
+
+from django.http import StreamingHttpResponse
+
+from .models import Fact, Filing
+
+EXPORT_CHUNK_SIZE = 2000
+XLSX_FLUSH_ROWS = 500
+FORMAT_CSV = "csv"
+FORMAT_XLSX = "xlsx"
+FORMATS = (FORMAT_CSV, FORMAT_XLSX)
+CONTENT_TYPES = {
+    FORMAT_CSV: "text/csv; charset=utf-8",
+    FORMAT_XLSX: "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+FACT_HEADER = [
+    "Urutan",
+    "Nama",
+    "Namespace",
+    "Context",
+    "Periode Mulai",
+    "Periode Akhir",
+    "Tanggal Instant",
+    "Unit",
+    "Decimals",
+    "Nilai",
+    "Nilai Numerik",
+]
+BULK_FACT_HEADER = ["Emiten", "Periode", "Filing"] + FACT_HEADER
+
+_ILLEGAL_XML_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+# Batas panjang isi sel Excel; sel yang lebih panjang membuat workbook dianggap rusak.
+XLSX_MAX_CELL_CHARS = 32767
+XLSX_TRUNCATED_MARKER = " [dipotong]"
+# Batas baris per sheet Excel, termasuk baris header.
+XLSX_MAX_ROWS = 1_048_576
+
+
+def export_response(
+    export_format: str, filename: str, header: Sequence[str], rows: Iterable[Sequence]
+) -> StreamingHttpResponse:
+    """Response unduhan CSV/XLSX yang ditulis bertahap tanpa menampung seluruh isi."""
+    if export_format == FORMAT_XLSX:
+        content = stream_xlsx(header, rows)
+    else:
+        export_format = FORMAT_CSV
+        content = stream_csv(header, rows)
+    response = StreamingHttpResponse(content, content_type=CONTENT_TYPES[export_format])
+    response["Content-Disposition"] = f'attachment; filename="{filename}.{export_format}"'
+    return response
+
+
+def stream_csv(header: Sequence[str], rows: Iterable[Sequence]) -> Iterator[str]:
+    writer = csv.writer(_Echo())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(["" if value is None else value for value in row])
+
+
+def stream_xlsx(
+    header: Sequence[str], rows: Iterable[Sequence], sheet_name: str = "Data"
+) -> Iterator[bytes]:
+    """Tulis workbook sebagai stream zip.
+
+    Setara mode write-only: baris langsung diserialisasi ke XML sheet dan
+    dikompresi; teks memakai inline string sehingga tidak ada shared string
+    table yang harus ditahan di memori. Bila baris melebihi batas Excel
+    (``XLSX_MAX_ROWS`` termasuk header), sisanya dilanjutkan ke sheet baru
+    dengan header yang sama. Bagian workbook ditulis terakhir karena jumlah
+    sheet baru diketahui setelah seluruh baris habis.
+    """
+    sink = _ZipSink()
+    rows = iter(rows)
+    sheet_names: list[str] = []
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+        while True:
+            first = next(rows, None)
+            if first is None and sheet_names:
+                break
+            sheet_names.append(_sheet_name(sheet_name, len(sheet_names) + 1))
+            part = f"xl/worksheets/sheet{len(sheet_names)}.xml"
+            with archive.open(part, mode="w", force_zip64=True) as sheet:
+                sheet.write(
+                    b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                    b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                    b"<sheetData>"
+                )
+                sheet.write(_xlsx_row(1, header))
+                if first is not None:
+                    sheet.write(_xlsx_row(2, first))
+                    rest = islice(rows, XLSX_MAX_ROWS - 2)
+                    for row_number, row in enumerate(rest, start=3):
+                        sheet.write(_xlsx_row(row_number, row))
+                        if row_number % XLSX_FLUSH_ROWS == 0:
+                            yield sink.drain()
+                sheet.write(b"</sheetData></worksheet>")
+            yield sink.drain()
+            if first is None:
+                break
+        for name, content in _xlsx_parts(sheet_names).items():
+            archive.writestr(name, content)
+    yield sink.drain()
+
+
+def filing_fact_rows(filing: Filing) -> Iterator[tuple]:
+    facts = (
+        Fact.objects.filter(filing=filing)
+        .order_by("order", "id")
+        .values_list(*_FACT_COLUMNS)
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+    for row in facts:
+        yield _fact_row(row)
+
+
+def bulk_fact_rows(filings) -> Iterator[tuple]:
+    """Fakta seluruh filing terpilih, dibaca dengan cursor server-side per chunk."""
+    facts = (
+        Fact.objects.filter(filing__in=filings)
+        .order_by("filing_id", "order", "id")
+        .values_list("filing__company__ticker", "filing__period_label", "filing_id", *_FACT_COLUMNS)
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+    for ticker, period_label, filing_id, *row in facts:
+        yield (ticker, period_label, filing_id) + _fact_row(row)
+
+
+_FACT_COLUMNS = (
+    "order",
+    "name",
+    "namespace",
+    "context__context_id",
+    "context__start_date",
+    "context__end_date",
+    "context__instant_date",
+    "unit",
+    "decimals",
+    "value",
+)
+
+
+def _fact_row(row) -> tuple:
+    order, *columns, value = row
+    return (order + 1, *columns, value, _as_number(value))
+
+
+def _as_number(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        number = float(value.replace(",", ""))
+    except ValueError:
+        return None
+    return number if math.isfinite(number) else None
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+class _ZipSink:
+    """Target zip tanpa seek; ZipFile otomatis memakai data descriptor."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self._offset = 0
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._offset
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _xlsx_row(row_number: int, values: Sequence) -> bytes:
+    cells = []
+    for col, value in enumerate(values):
+        ref = f"{_column_letter(col)}{row_number}"
+        if value is None or value == "":
+            continue
+        if isinstance(value, bool):
+            cells.append(f'<c r="{ref}" t="b"><v>{int(value)}</v></c>')
+        elif isinstance(value, (int, float, Decimal)):
+            cells.append(f'<c r="{ref}"><v>{value}</v></c>')
+        else:
+            if isinstance(value, (date, datetime)):
+                value = value.isoformat()
+            text = _ILLEGAL_XML_CHARS.sub("", str(value))
+            if len(text) > XLSX_MAX_CELL_CHARS:
+                text = text[: XLSX_MAX_CELL_CHARS - len(XLSX_TRUNCATED_MARKER)] + XLSX_TRUNCATED_MARKER
+            text = escape(text)
+            cells.append(f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>')
+    return f'<row r="{row_number}">{"".join(cells)}</row>'.encode("utf-8")
+
+
+def _column_letter(index: int) -> str:
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def _sheet_name(base: str, number: int) -> str:
+    if number == 1:
+        return base[:31]
+    suffix = f" ({number})"
+    return base[: 31 - len(suffix)] + suffix
+
+
+def _xlsx_parts(sheet_names: Sequence[str]) -> dict[str, str]:
+    numbers = range(1, len(sheet_names) + 1)
+    sheet_overrides = "".join(
+        f'<Override PartName="/xl/worksheets/sheet{number}.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        for number in numbers
+    )
+    sheets = "".join(
+        f'<sheet name="{escape(name)}" sheetId="{number}" r:id="rId{number}"/>'
+        for number, name in zip(numbers, sheet_names)
+    )
+    sheet_relationships = "".join(
+        f'<Relationship Id="rId{number}" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        f'Target="worksheets/sheet{number}.xml"/>'
+        for number in numbers
+    )
+    styles_id = len(sheet_names) + 1
+    return {
+        "[Content_Types].xml": (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            f"{sheet_overrides}"
+            '<Override PartName="/xl/styles.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+            "</Types>"
+        ),
+        "_rels/.rels": (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+            'Target="xl/workbook.xml"/>'
+            "</Relationships>"
+        ),
+        "xl/workbook.xml": (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+            f"<sheets>{sheets}</sheets>"
+            "</workbook>"
+        ),
+        "xl/_rels/workbook.xml.rels": (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            f"{sheet_relationships}"
+            f'<Relationship Id="rId{styles_id}" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+            'Target="styles.xml"/>'
+            "</Relationships>"
+        ),
+        "xl/styles.xml": (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+            '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+            '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+            '<fill><patternFill patternType="gray125"/></fill></fills>'
+            '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+            '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+            '<cellXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/></cellXfs>'
+            "</styleSheet>"
+        ),
+    }
@@ -0,0 +1,325 @@
+"""Cache peta konsep → nilai per filing yang dipakai bersama oleh semua worker.
+
+Dua lapis: LRU di memori proses (dibatasi `FACT_CACHE_MEMORY_BYTES`), lalu
+store SQLite lokal (file `FACT_CACHE_PATH`) yang dibaca semua proses worker
+dengan batas ukuran `FACT_CACHE_MAX_BYTES` dan eviksi LRU. Kunci berisi id
+filing dan `uploaded_at`, sehingga filing yang ditimpa otomatis memakai
+entri baru.
+
+Laporan hanya memakai nilai numerik, jadi nilai yang lebih panjang dari
+`MAX_VALUE_CHARS` (textBlock) disimpan sebagai string kosong dan tidak
+pernah dibaca penuh dari database.
+"""
+
+from __future__ import annotations
+
+import marshal
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+from django.conf import settings
+from django.db.models.functions import Lower, Substr
+
+from .metrics import CACHE_REQUESTS, record_cache
+from .models import Fact, Filing
+
+CACHE_NAME = "fact_lookup"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_MEMORY_BYTES = 16 * 1024 * 1024
+# Angka terpanjang yang masuk akal di XBRL; nilai lebih panjang adalah teks.
+MAX_VALUE_CHARS = 64
+# Waktu akses hanya diperbarui bila sudah lebih lama dari ini, agar hit tidak selalu menulis.
+TOUCH_INTERVAL = 5.0
+EVICT_TARGET = 0.9
+
+
+@dataclass(frozen=True)
+class LookupFact:
+    """Fakta hasil lookup laporan, baik dari cache maupun langsung dari database."""
+
+    name: str
+    value: str
+
+
+class FactCacheStore:
+    """Store key → blob berbasis SQLite (WAL) dengan eviksi LRU berdasarkan total byte."""
+
+    def __init__(self, path: str | Path, max_bytes: int) -> None:
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+
+    def get(self, key: str) -> bytes | None:
+        connection = self._connection()
+        row = connection.execute(
+            "SELECT value, accessed FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        now = time.time()
+        if now - row[1] > TOUCH_INTERVAL:
+            with connection:
+                connection.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+        return row[0]
+
+    def set(self, key: str, value: bytes) -> None:
+        connection = self._connection()
+        with connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, accessed) VALUES (?, ?, ?, ?)",
+                (key, value, len(value), time.time()),
+            )
+            total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total > self.max_bytes:
+                self._evict(connection, total - int(self.max_bytes * EVICT_TARGET))
+
+    def delete_prefix(self, prefix: str) -> None:
+        connection = self._connection()
+        with connection:
+            connection.execute("DELETE FROM entries WHERE key LIKE ?", (prefix + "%",))
+
+    def clear(self) -> None:
+        connection = self._connection()
+        with connection:
+            connection.execute("DELETE FROM entries")
+
+    def usage(self) -> dict:
+        count, size = self._connection().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+        return {"entries": count, "bytes": size, "max_bytes": self.max_bytes}
+
+    def _evict(self, connection, excess: int) -> None:
+        freed = 0
+        victims = []
+        for key, size in connection.execute("SELECT key, size FROM entries ORDER BY accessed"):
+            victims.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        connection.executemany("DELETE FROM entries WHERE key = ?", victims)
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None and self._local.pid == os.getpid():
+            return connection
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=5.0)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)"
+        )
+        connection.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+        self._local.connection = connection
+        self._local.pid = os.getpid()
+        return connection
+
+
+class _MemoryLRU:
+    """LRU per proses yang dibatasi total ukuran (byte blob serialisasi) entrinya."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._items: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None:
+                return None
+            self._items.move_to_end(key)
+            return entry[0]
+
+    def set(self, key: str, value, size: int) -> None:
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._items.pop(key, None)
+            if previous is not None:
+                self.size -= previous[1]
+            self._items[key] = (value, size)
+            self.size += size
+            while self.size > self.max_bytes:
+                _, (_, evicted) = self._items.popitem(last=False)
+                self.size -= evicted
+
+    def delete_prefix(self, prefix: str) -> None:
+        with self._lock:
+            for key in [key for key in self._items if key.startswith(prefix)]:
+                self.size -= self._items.pop(key)[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self.size = 0
+
+
+_store: FactCacheStore | None = None
+_memory: _MemoryLRU | None = None
+
+
+def cache_enabled() -> bool:
+    return getattr(settings, "FACT_CACHE_ENABLED", True)
+
+
+def get_store() -> FactCacheStore:
+    global _store
+    if _store is None:
+        path = getattr(settings, "FACT_CACHE_PATH", None)
+        if not path:
+            path = settings.BASE_DIR / "var" / "fact-cache.sqlite3"
+        _store = FactCacheStore(path, getattr(settings, "FACT_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+    return _store
+
+
+def _get_memory() -> _MemoryLRU:
+    global _memory
+    if _memory is None:
+        _memory = _MemoryLRU(getattr(settings, "FACT_CACHE_MEMORY_BYTES", DEFAULT_MEMORY_BYTES))
+    return _memory
+
+
+def filing_key(filing: Filing) -> str:
+    return f"{filing.pk}:{filing.uploaded_at.isoformat()}"
+
+
+def filing_fact_map(filing: Filing) -> dict[str, LookupFact]:
+    """Fakta pertama per nama konsep (lowercase) untuk satu filing, lewat cache."""
+    return filing_fact_maps([filing])[filing.pk]
+
+
+def filing_fact_maps(filings: list[Filing]) -> dict[int, dict[str, LookupFact]]:
+    """Seperti `filing_fact_map` untuk banyak filing; semua miss dimuat dengan satu query."""
+    memory = _get_memory()
+    maps: dict[int, dict[str, LookupFact]] = {}
+    misses: list[Filing] = []
+    for filing in filings:
+        key = filing_key(filing)
+        facts = memory.get(key)
+        if facts is None:
+            data = None
+            try:
+                data = get_store().get(key)
+            except sqlite3.Error:
+                pass
+            if data is None:
+                misses.append(filing)
+                continue
+            facts = _facts_from_pairs(marshal.loads(data))
+            memory.set(key, facts, len(data))
+        record_cache(CACHE_NAME, True)
+        maps[filing.pk] = facts
+
+    loaded = _load_fact_pairs([filing.pk for filing in misses])
+    for filing in misses:
+        record_cache(CACHE_NAME, False)
+        key = filing_key(filing)
+        pairs = loaded.get(filing.pk, {})
+        data = marshal.dumps(pairs)
+        try:
+            get_store().set(key, data)
+        except sqlite3.Error:
+            pass
+        facts = _facts_from_pairs(pairs)
+        memory.set(key, facts, len(data))
+        maps[filing.pk] = facts
+    return maps
+
+
+def cached_fact_lookup(filing: Filing | None, concepts: set[str] | None = None) -> dict[str, LookupFact]:
+    if not filing:
+        return {}
+    return cached_fact_lookups([filing], concepts)[filing.pk]
+
+
+def cached_fact_lookups(
+    filings: list[Filing], concepts: set[str] | None = None
+) -> dict[int, dict[str, LookupFact]]:
+    maps = filing_fact_maps(filings)
+    if concepts is None:
+        return {filing_id: dict(facts) for filing_id, facts in maps.items()}
+    return {
+        filing_id: {concept: facts[concept] for concept in concepts if concept in facts}
+        for filing_id, facts in maps.items()
+    }
+
+
+def load_lookup_facts(
+    filing_ids: list[int], concepts: set[str] | None = None
+) -> dict[int, dict[str, LookupFact]]:
+    """Lookup langsung dari database (tanpa cache) untuk banyak filing dalam satu query."""
+    return {
+        filing_id: _facts_from_pairs(pairs)
+        for filing_id, pairs in _load_fact_pairs(filing_ids, concepts).items()
+    }
+
+
+def invalidate_filing(filing_id: int) -> None:
+    prefix = f"{filing_id}:"
+    _get_memory().delete_prefix(prefix)
+    try:
+        get_store().delete_prefix(prefix)
+    except sqlite3.Error:
+        pass
+
+
+def clear_cache() -> None:
+    _get_memory().clear()
+    get_store().clear()
+
+
+def cache_stats() -> dict:
+    """Hit/miss gabungan semua worker (dari registry metrik) dan pemakaian store."""
+    series = CACHE_REQUESTS.registry.collect().get(CACHE_REQUESTS.name, {})
+    hits = sum(values[0] for labels, values in series.items() if labels == (CACHE_NAME, "hit"))
+    misses = sum(values[0] for labels, values in series.items() if labels == (CACHE_NAME, "miss"))
+    requests = hits + misses
+    return {
+        "hits": int(hits),
+        "misses": int(misses),
+        "hit_ratio": hits / requests if requests else None,
+        **get_store().usage(),
+    }
+
+
+def _facts_from_pairs(pairs: dict[str, tuple[str, str]]) -> dict[str, LookupFact]:
+    return {name: LookupFact(*pair) for name, pair in pairs.items()}
+
+
+def _load_fact_pairs(
+    filing_ids: list[int], concepts: set[str] | None = None
+) -> dict[int, dict[str, tuple[str, str]]]:
+    """Fakta pertama per nama (lowercase) per filing; nilai dibaca sebatas prefiks pendek."""
+    pairs: dict[int, dict[str, tuple[str, str]]] = {filing_id: {} for filing_id in filing_ids}
+    if not filing_ids or (concepts is not None and not concepts):
+        return pairs
+    queryset = Fact.objects.filter(filing_id__in=filing_ids)
+    if concepts is not None:
+        queryset = queryset.annotate(name_lower=Lower("name")).filter(name_lower__in=concepts)
+    rows = (
+        queryset.annotate(value_prefix=Substr("value", 1, MAX_VALUE_CHARS + 1))
+        .order_by("filing_id", "name", "order", "id")
+        .values_list("filing_id", "name", "value_prefix")
+        .iterator(chunk_size=5000)
+    )
+    for filing_id, name, value in rows:
+        facts = pairs[filing_id]
+        key = name.lower()
+        if key not in facts:
+            facts[key] = (name, _lookup_value(value))
+    return pairs
+
+
+def _lookup_value(value: str | None) -> str:
+    if not value or len(value) > MAX_VALUE_CHARS:
+        return ""
+    return value
@@ -0,0 +1,98 @@
+"""Antrean penghapusan file XBRL dari storage.
+
+Menghapus filing hanya mencatat nama filenya di `PendingFileDeletion` di
+dalam transaksi yang sama, sehingga rollback juga membatalkan antrean dan
+request tidak menunggu I/O storage. Antrean diproses di thread latar
+setelah upload/hapus dari dashboard (`FILE_CLEANUP_ON_COMMIT`) atau lewat
+`manage.py cleanup_files` dari cron.
+"""
+
+from __future__ import annotations
+
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+
+from .models import Filing, PendingFileDeletion
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 200
+DEFAULT_MAX_ATTEMPTS = 5
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="file-cleanup")
+
+
+@dataclass
+class CleanupResult:
+    deleted: int = 0
+    skipped: int = 0
+    failed: int = 0
+
+
+def enqueue_file_deletion(name: str) -> None:
+    if name:
+        PendingFileDeletion.objects.create(name=name)
+
+
+def schedule_file_cleanup() -> None:
+    """Proses antrean di thread latar setelah transaksi saat ini di-commit.
+
+    Dipanggil sekali di akhir operasi (bukan per filing): pada SQLite, thread
+    latar yang menulis bersamaan dengan transaksi hapus berikutnya dapat
+    membuat salah satunya gagal dengan "database is locked".
+    """
+    if getattr(settings, "FILE_CLEANUP_ON_COMMIT", True):
+        transaction.on_commit(process_file_cleanup_async)
+
+
+def process_file_cleanup(limit: int | None = None) -> CleanupResult:
+    """Hapus file di antrean; entri yang gagal dicoba lagi hingga `FILE_CLEANUP_MAX_ATTEMPTS`."""
+    if limit is None:
+        limit = getattr(settings, "FILE_CLEANUP_BATCH_SIZE", DEFAULT_BATCH_SIZE)
+    max_attempts = getattr(settings, "FILE_CLEANUP_MAX_ATTEMPTS", DEFAULT_MAX_ATTEMPTS)
+    storage = Filing._meta.get_field("xbrl_file").storage
+    result = CleanupResult()
+
+    pending = list(PendingFileDeletion.objects.filter(attempts__lt=max_attempts)[:limit])
+    referenced = set(
+        Filing.objects.filter(xbrl_file__in=[item.name for item in pending]).values_list(
+            "xbrl_file", flat=True
+        )
+    )
+    done = []
+    for item in pending:
+        if item.name in referenced:
+            # Nama file dipakai lagi oleh filing lain (mis. restore snapshot).
+            result.skipped += 1
+            done.append(item.pk)
+            continue
+        try:
+            storage.delete(item.name)
+        except OSError as exc:
+            item.attempts += 1
+            item.last_error = str(exc)
+            item.save(update_fields=["attempts", "last_error"])
+            result.failed += 1
+            continue
+        result.deleted += 1
+        done.append(item.pk)
+    PendingFileDeletion.objects.filter(pk__in=done).delete()
+    return result
+
+
+def process_file_cleanup_async() -> Future:
+    return _executor.submit(_run_in_background)
+
+
+def _run_in_background() -> CleanupResult | None:
+    try:
+        return process_file_cleanup()
+    except DatabaseError:
+        logger.warning("Pembersihan file ditunda karena error database.", exc_info=True)
+        return None
+    finally:
+        connection.close()
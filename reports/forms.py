@@ -1,6 +1,6 @@
 from django import forms
 
-from .models import ReportTemplate, TemplateItem
+from .models import ReportTemplate, SectorAggregate, TemplateItem
 
 
 class XBRLUploadForm(forms.Form):
@@ -13,6 +13,51 @@ class XBRLUploadForm(forms.Form):
     )
 
 
+class ScreenerForm(forms.Form):
+    metric_type = forms.ChoiceField(
+        label="Jenis Metrik",
+        choices=[("concept", "Kode Item"), ("ratio", "Rasio")],
+        initial="concept",
+        required=False,
+    )
+    metric = forms.CharField(label="Kode Item / Rasio", max_length=255)
+    period = forms.DateField(label="Periode Akhir")
+    sector = forms.CharField(label="Sektor", required=False)
+    subsector = forms.CharField(label="Subsektor", required=False)
+    min_value = forms.FloatField(label="Nilai Minimum", required=False)
+    max_value = forms.FloatField(label="Nilai Maksimum", required=False)
+    growth = forms.BooleanField(label="Pertumbuhan YoY (%)", required=False)
+    order = forms.ChoiceField(
+        label="Urutan",
+        choices=[("desc", "Terbesar"), ("asc", "Terkecil")],
+        initial="desc",
+        required=False,
+    )
+    page = forms.IntegerField(min_value=1, required=False)
+
+
+class SectorAggregateForm(forms.Form):
+    concept = forms.CharField(label="Kode Item", max_length=255)
+    period = forms.DateField(label="Periode Akhir", required=False)
+    level = forms.ChoiceField(
+        label="Level",
+        choices=SectorAggregate.LEVEL_CHOICES,
+        initial=SectorAggregate.LEVEL_SECTOR,
+        required=False,
+    )
+    sector = forms.CharField(label="Sektor", required=False)
+    subsector = forms.CharField(label="Subsektor", required=False)
+    industry = forms.CharField(label="Industri", required=False)
+
+
+class ConceptSeriesForm(forms.Form):
+    concept = forms.CharField(label="Kode Item", max_length=255)
+    start = forms.DateField(label="Dari", required=False)
+    end = forms.DateField(label="Sampai", required=False)
+    annual = forms.BooleanField(label="Hanya tahunan", required=False)
+    points = forms.IntegerField(label="Maksimum titik", min_value=3, max_value=1000, required=False)
+
+
 class TemplateForm(forms.ModelForm):
     class Meta:
         model = ReportTemplate
@@ -24,5 +69,10 @@ class TemplateItemForm(forms.ModelForm):
         model = TemplateItem
         fields = ["template", "label", "primary_fact", "fallback_facts", "order", "level"]
         widgets = {
-            "fallback_facts": forms.Textarea(attrs={"rows": 3}),
+            "primary_fact": forms.TextInput(
+                attrs={"data-concept-autocomplete": "", "autocomplete": "off"}
+            ),
+            "fallback_facts": forms.Textarea(
+                attrs={"rows": 3, "data-concept-autocomplete": "", "autocomplete": "off"}
+            ),
         }
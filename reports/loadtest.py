@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from dataclasses import dataclass, field
+from datetime import date
+
+import numpy as np
+from django.conf import settings
+from django.core.files import File
+
+from .models import Company
+from .services import UploadConflictError, ingest_xbrl
+from .synthetic import SyntheticSpec, generate_instance
+
+REPORT_SLUGS = ("neraca", "laba-rugi", "arus-kas")
+SECTORS = (
+    ("Keuangan", "Bank", "Bank", "Bank"),
+    ("Keuangan", "Asuransi", "Asuransi", "Asuransi Jiwa"),
+    ("Energi", "Minyak, Gas & Batu Bara", "Batu Bara", "Produksi Batu Bara"),
+    ("Barang Konsumen Primer", "Makanan & Minuman", "Makanan Olahan", "Makanan Olahan"),
+    ("Properti & Real Estat", "Properti & Real Estat", "Pengembang", "Pengembang Properti"),
+    ("Infrastruktur", "Telekomunikasi", "Jasa Telekomunikasi", "Operator Seluler"),
+)
+DEFAULT_MIX = {"report": 5, "combined": 1, "companies": 2, "search": 1, "home": 1}
+PERCENTILES = (50, 95, 99)
+COMPANIES_PER_PAGE = 12
+
+
+@dataclass
+class SeedResult:
+    created: int = 0
+    skipped: int = 0
+
+
+@dataclass
+class EndpointStats:
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+    status_counts: dict[int, int] = field(default_factory=dict)
+
+
+def seed_load_data(
+    companies: int,
+    filings: int,
+    facts: int = 2000,
+    contexts: int = 16,
+    first_year: int = 2024,
+) -> SeedResult:
+    """Isi database dengan emiten dan filing sintetis melalui jalur ingest biasa."""
+    result = SeedResult()
+    for company_pos in range(companies):
+        sector, subsector, industry, subindustry = SECTORS[company_pos % len(SECTORS)]
+        for filing_pos in range(filings):
+            spec = SyntheticSpec(
+                fact_count=facts,
+                context_count=contexts,
+                ticker=f"LT{company_pos:04d}",
+                period_end=date(first_year - filing_pos, 12, 31),
+                sector=sector,
+                subsector=subsector,
+                industry=industry,
+                subindustry=subindustry,
+                seed=company_pos * 1000 + filing_pos,
+            )
+            try:
+                instance = generate_instance(spec)
+                ingest_xbrl(File(instance, name=instance.name))
+            except UploadConflictError:
+                result.skipped += 1
+            else:
+                result.created += 1
+    return result
+
+
+class LoadRunner:
+    """Penggerak beban HTTP sederhana berbasis thread untuk server lokal.
+
+    Setiap worker memilih endpoint sesuai bobot `mix`, lalu parameter acak
+    (emiten, template, halaman) dari data yang ada di database.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        concurrency: int,
+        duration: float,
+        mix: dict[str, int] | None = None,
+        seed: int = 0,
+        timeout: float = 30.0,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.concurrency = concurrency
+        self.duration = duration
+        self.mix = {name: weight for name, weight in (mix or DEFAULT_MIX).items() if weight > 0}
+        self.seed = seed
+        self.timeout = timeout
+        self.company_ids = list(Company.objects.values_list("id", flat=True))
+        self.tickers = list(Company.objects.values_list("ticker", flat=True))
+        self.stats = {name: EndpointStats() for name in self.mix}
+        self._lock = threading.Lock()
+
+    def run(self) -> dict:
+        deadline = time.monotonic() + self.duration
+        threads = [
+            threading.Thread(target=self._worker, args=(worker, deadline), daemon=True)
+            for worker in range(self.concurrency)
+        ]
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return self.summary(time.monotonic() - started)
+
+    def summary(self, elapsed: float) -> dict:
+        endpoints = {}
+        all_latencies = []
+        for name, stats in self.stats.items():
+            endpoints[name] = _describe(stats.latencies, stats.errors, elapsed)
+            endpoints[name]["status_counts"] = dict(sorted(stats.status_counts.items()))
+            all_latencies.extend(stats.latencies)
+        total_errors = sum(stats.errors for stats in self.stats.values())
+        return {
+            "base_url": self.base_url,
+            "concurrency": self.concurrency,
+            "duration_seconds": elapsed,
+            "mix": self.mix,
+            "total": _describe(all_latencies, total_errors, elapsed),
+            "endpoints": endpoints,
+        }
+
+    def _worker(self, worker: int, deadline: float) -> None:
+        rng = random.Random(self.seed * 1000 + worker)
+        names = list(self.mix)
+        weights = [self.mix[name] for name in names]
+        while time.monotonic() < deadline:
+            name = rng.choices(names, weights)[0]
+            path = self._path(name, rng)
+            started = time.perf_counter()
+            status = None
+            try:
+                with urllib.request.urlopen(self.base_url + path, timeout=self.timeout) as response:
+                    response.read()
+                    status = response.status
+            except urllib.error.HTTPError as exc:
+                status = exc.code
+            except (urllib.error.URLError, OSError):
+                status = 0
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                stats = self.stats[name]
+                stats.status_counts[status] = stats.status_counts.get(status, 0) + 1
+                if 200 <= status < 400:
+                    stats.latencies.append(elapsed)
+                else:
+                    stats.errors += 1
+
+    def _path(self, name: str, rng: random.Random) -> str:
+        company = f"?company={rng.choice(self.company_ids)}" if self.company_ids else ""
+        if name == "report":
+            return f"/laporan/{rng.choice(REPORT_SLUGS)}/{company}"
+        if name == "combined":
+            return f"/laporan/lengkap/{company}"
+        if name == "companies":
+            pages = max(-(-len(self.company_ids) // COMPANIES_PER_PAGE), 1)
+            return f"/emiten/?page={rng.randint(1, pages)}"
+        if name == "search":
+            prefix = rng.choice(self.tickers)[:3] if self.tickers else "A"
+            return f"/emiten/?q={prefix}"
+        return "/"
+
+
+def start_local_server(port: int, wait_seconds: float = 30.0) -> subprocess.Popen:
+    """Jalankan `runserver` tanpa autoreload dan tunggu sampai port menerima koneksi."""
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            str(settings.BASE_DIR / "manage.py"),
+            "runserver",
+            f"127.0.0.1:{port}",
+            "--noreload",
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + wait_seconds
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("Server lokal berhenti sebelum siap.")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("Server lokal tidak siap dalam batas waktu.")
+
+
+def parse_mix(value: str) -> dict[str, int]:
+    mix = {}
+    for part in value.split(","):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            raise ValueError(f"Endpoint tidak dikenal: {name}")
+        mix[name] = int(weight or 1)
+    return mix
+
+
+def _describe(latencies: list[float], errors: int, elapsed: float) -> dict:
+    count = len(latencies)
+    description = {
+        "requests": count,
+        "errors": errors,
+        "throughput_rps": count / elapsed if elapsed else 0.0,
+    }
+    if count:
+        values = np.percentile(np.asarray(latencies) * 1000, PERCENTILES)
+        for percentile, value in zip(PERCENTILES, values):
+            description[f"p{percentile}_ms"] = float(value)
+        description["mean_ms"] = float(np.mean(latencies) * 1000)
+        description["max_ms"] = float(np.max(latencies) * 1000)
+    return description
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from reports.coverage import WEAK_ROW_THRESHOLD, analyze_template_coverage
+
+
+class Command(BaseCommand):
+    help = "Hitung cakupan item template terhadap seluruh filing yang tersimpan."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=WEAK_ROW_THRESHOLD,
+            help="Batas hit rate di bawah mana item dianggap lemah (0-1).",
+        )
+
+    def handle(self, *args, **options):
+        coverage_run = analyze_template_coverage(weak_threshold=options["threshold"])
+        weak_count = sum(1 for row in coverage_run.results["items"] if row["weak"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{coverage_run.item_count} item x {coverage_run.filing_count} filing "
+                f"dianalisa dalam {coverage_run.duration_ms} ms; {weak_count} item lemah."
+            )
+        )
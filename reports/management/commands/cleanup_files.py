@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from reports.file_cleanup import process_file_cleanup
+from reports.models import PendingFileDeletion
+
+
+class Command(BaseCommand):
+    help = "Hapus file XBRL milik filing yang sudah dihapus (antrean pembersihan file)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, help="Jumlah maksimum file per batch.")
+
+    def handle(self, *args, **options):
+        totals = {"deleted": 0, "skipped": 0, "failed": 0}
+        while True:
+            result = process_file_cleanup(limit=options["limit"])
+            totals["deleted"] += result.deleted
+            totals["skipped"] += result.skipped
+            totals["failed"] += result.failed
+            if not result.deleted and not result.skipped:
+                break
+        remaining = PendingFileDeletion.objects.count()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Pembersihan file selesai: {totals['deleted']} dihapus, "
+                f"{totals['skipped']} masih dipakai, {totals['failed']} gagal, "
+                f"{remaining} tersisa di antrean."
+            )
+        )
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from reports.ratios import compute_ratios
+
+
+class Command(BaseCommand):
+    help = "Hitung rasio keuangan untuk filing baru atau definisi rasio yang berubah."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Hitung ulang semua rasio untuk seluruh filing.",
+        )
+
+    def handle(self, *args, **options):
+        ratio_run = compute_ratios(full=options["full"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{ratio_run.value_count} nilai rasio dihitung untuk "
+                f"{ratio_run.filing_count} filing."
+            )
+        )
@@ -0,0 +1,97 @@
+import csv
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+
+from reports.models import Filing
+from reports.restatement import STATUSES, diff_filings
+
+
+class Command(BaseCommand):
+    help = "Bandingkan fakta dua filing emiten yang sama (laporan asli vs penyajian kembali)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("original", type=int, help="ID filing asli.")
+        parser.add_argument("restated", type=int, help="ID filing penyajian kembali.")
+        parser.add_argument(
+            "--min-delta",
+            type=float,
+            default=0,
+            help="Abaikan perubahan dengan selisih absolut di bawah nilai ini.",
+        )
+        parser.add_argument(
+            "--min-percent",
+            type=float,
+            default=0,
+            help="Abaikan perubahan dengan selisih persen di bawah nilai ini.",
+        )
+        parser.add_argument(
+            "--status",
+            action="append",
+            choices=STATUSES,
+            help="Jenis perubahan yang ditampilkan (boleh diulang). Default: semua.",
+        )
+        parser.add_argument("--output", help="Tulis CSV ke file ini alih-alih stdout.")
+
+    def handle(self, *args, **options):
+        filings = Filing.objects.select_related("company").in_bulk(
+            [options["original"], options["restated"]]
+        )
+        original = filings.get(options["original"])
+        restated = filings.get(options["restated"])
+        if original is None or restated is None:
+            raise CommandError("Filing tidak ditemukan.")
+        if original.company_id != restated.company_id:
+            raise CommandError("Kedua filing harus milik emiten yang sama.")
+
+        changes = diff_filings(
+            original,
+            restated,
+            min_delta=options["min_delta"],
+            min_percent=options["min_percent"],
+            statuses=options["status"] or STATUSES,
+        )
+        counts = Counter()
+        output = open(options["output"], "w", newline="", encoding="utf-8") if options["output"] else self.stdout
+        try:
+            writer = csv.writer(output)
+            writer.writerow(
+                [
+                    "status",
+                    "concept",
+                    "period_start",
+                    "period_end",
+                    "instant_date",
+                    "unit",
+                    "old_value",
+                    "new_value",
+                    "delta",
+                    "delta_percent",
+                ]
+            )
+            for change in changes:
+                counts[change.status] += 1
+                writer.writerow(
+                    [
+                        change.status,
+                        change.concept,
+                        change.period_start or "",
+                        change.period_end or "",
+                        change.instant_date or "",
+                        change.unit,
+                        change.old_value if change.old_value is not None else "",
+                        change.new_value if change.new_value is not None else "",
+                        "" if change.delta is None else change.delta,
+                        "" if change.delta_percent is None else round(change.delta_percent, 4),
+                    ]
+                )
+        finally:
+            if options["output"]:
+                output.close()
+
+        self.stderr.write(
+            self.style.SUCCESS(
+                f"{original} vs {restated}: {counts['changed']} berubah, "
+                f"{counts['added']} baru, {counts['removed']} hilang."
+            )
+        )
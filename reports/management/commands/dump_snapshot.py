@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from reports.snapshots import dump_snapshot
+
+
+class Command(BaseCommand):
+    help = "Tulis snapshot biner terkompresi per filing beserta manifest untuk seeding lingkungan lain."
+
+    def add_arguments(self, parser):
+        parser.add_argument("output_dir", help="Direktori tujuan snapshot.")
+        parser.add_argument(
+            "--ticker",
+            action="append",
+            default=[],
+            help="Hanya emiten ini (boleh diulang atau dipisah koma).",
+        )
+        parser.add_argument(
+            "--period",
+            action="append",
+            default=[],
+            help="Hanya label periode ini (boleh diulang atau dipisah koma).",
+        )
+
+    def handle(self, *args, **options):
+        result = dump_snapshot(
+            options["output_dir"],
+            tickers=_split(options["ticker"]),
+            periods=_split(options["period"]),
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"{result.filings} filing ({result.facts} fakta) ditulis ke snapshot.")
+        )
+
+
+def _split(values: list[str]) -> list[str]:
+    return [part.strip() for value in values for part in value.split(",") if part.strip()]
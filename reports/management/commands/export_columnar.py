@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from reports.columnar import export_columnar
+
+
+class Command(BaseCommand):
+    help = "Ekspor emiten, filing, context, dan fakta ke Parquet per tahun untuk analitik."
+
+    def add_arguments(self, parser):
+        parser.add_argument("output_dir", help="Direktori tujuan ekspor.")
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Hapus partisi facts/ dan contexts/ lalu tulis ulang seluruh filing.",
+        )
+
+    def handle(self, *args, **options):
+        result = export_columnar(options["output_dir"], full=options["full"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{result.exported} filing diekspor ({result.fact_rows} fakta), "
+                f"{result.unchanged} tidak berubah, {result.removed} dihapus."
+            )
+        )
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from reports.fact_cache import cache_stats, clear_cache
+
+
+class Command(BaseCommand):
+    help = "Tampilkan statistik cache lookup fakta lintas worker, atau kosongkan cache."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--clear", action="store_true", help="Hapus semua entri cache.")
+
+    def handle(self, *args, **options):
+        if options["clear"]:
+            clear_cache()
+            self.stdout.write(self.style.SUCCESS("Cache lookup fakta dikosongkan."))
+            return
+
+        stats = cache_stats()
+        ratio = "-" if stats["hit_ratio"] is None else f"{stats['hit_ratio'] * 100:.1f}%"
+        self.stdout.write(
+            f"Hit {stats['hits']}, miss {stats['misses']} (rasio hit {ratio}); "
+            f"{stats['entries']} entri, {stats['bytes'] / 1024:.1f} / "
+            f"{stats['max_bytes'] / 1024:.0f} KiB"
+        )
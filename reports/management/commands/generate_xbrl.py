@@ -0,0 +1,47 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from reports.synthetic import SyntheticSpec, write_instance
+
+
+class Command(BaseCommand):
+    help = "Buat file instance XBRL sintetis bergaya IDX yang deterministik untuk pengujian performa."
+
+    def add_arguments(self, parser):
+        parser.add_argument("output", help="Path file .xbrl tujuan.")
+        parser.add_argument("--facts", type=int, default=1000, help="Jumlah fakta (1k-1M).")
+        parser.add_argument("--contexts", type=int, default=8, help="Jumlah context.")
+        parser.add_argument(
+            "--dimension-depth",
+            type=int,
+            default=1,
+            help="Jumlah explicit member per context berdimensi (0-4).",
+        )
+        parser.add_argument(
+            "--text-block-size",
+            type=int,
+            default=2000,
+            help="Panjang karakter setiap fakta textBlock.",
+        )
+        parser.add_argument("--ticker", default="SYNT", help="Kode emiten.")
+        parser.add_argument("--period-end", default="2024-12-31", help="Akhir periode (YYYY-MM-DD).")
+        parser.add_argument("--seed", type=int, default=0, help="Seed generator acak.")
+
+    def handle(self, *args, **options):
+        try:
+            period_end = date.fromisoformat(options["period_end"])
+        except ValueError as exc:
+            raise CommandError("Format --period-end harus YYYY-MM-DD.") from exc
+        spec = SyntheticSpec(
+            fact_count=options["facts"],
+            context_count=max(options["contexts"], 1),
+            dimension_depth=options["dimension_depth"],
+            text_block_size=options["text_block_size"],
+            ticker=options["ticker"].upper(),
+            period_end=period_end,
+            seed=options["seed"],
+        )
+        with open(options["output"], "wb") as output:
+            written = write_instance(output, spec)
+        self.stdout.write(self.style.SUCCESS(f"{written} fakta ditulis ke {options['output']}."))
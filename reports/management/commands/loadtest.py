@@ -0,0 +1,70 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from reports.loadtest import DEFAULT_MIX, LoadRunner, parse_mix, start_local_server
+
+
+class Command(BaseCommand):
+    help = "Jalankan uji beban lokal ke endpoint laporan, daftar emiten, dan beranda."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default="http://127.0.0.1:8000", help="Alamat server yang diuji.")
+        parser.add_argument("--concurrency", type=int, default=8, help="Jumlah klien paralel.")
+        parser.add_argument("--duration", type=float, default=30.0, help="Lama uji dalam detik.")
+        parser.add_argument(
+            "--mix",
+            default=",".join(f"{name}={weight}" for name, weight in DEFAULT_MIX.items()),
+            help="Bobot endpoint: report, combined, companies, search, home.",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--spawn",
+            type=int,
+            metavar="PORT",
+            help="Jalankan runserver sendiri pada port ini selama uji berlangsung.",
+        )
+        parser.add_argument("--output", help="Simpan ringkasan sebagai JSON.")
+
+    def handle(self, *args, **options):
+        try:
+            mix = parse_mix(options["mix"])
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+
+        url = options["url"]
+        server = None
+        if options["spawn"]:
+            try:
+                server = start_local_server(options["spawn"])
+            except RuntimeError as exc:
+                raise CommandError(str(exc)) from exc
+            url = f"http://127.0.0.1:{options['spawn']}"
+
+        try:
+            runner = LoadRunner(
+                url,
+                concurrency=max(options["concurrency"], 1),
+                duration=options["duration"],
+                mix=mix,
+                seed=options["seed"],
+            )
+            summary = runner.run()
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as output:
+                json.dump(summary, output, indent=2)
+
+        self.stdout.write(f"{'endpoint':<10} {'req':>7} {'err':>5} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8}")
+        rows = [*summary["endpoints"].items(), ("total", summary["total"])]
+        for name, stats in rows:
+            self.stdout.write(
+                f"{name:<10} {stats['requests']:>7} {stats['errors']:>5} "
+                f"{stats['throughput_rps']:>8.1f} "
+                + " ".join(f"{stats.get(f'p{p}_ms', 0.0):>7.1f}ms" for p in (50, 95, 99))
+            )
+        self.stdout.write(self.style.SUCCESS("Uji beban selesai."))
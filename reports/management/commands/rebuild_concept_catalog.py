@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from reports.catalog import rebuild_catalog
+
+
+class Command(BaseCommand):
+    help = "Hitung ulang katalog konsep dari seluruh fakta yang tersimpan."
+
+    def handle(self, *args, **options):
+        total = rebuild_catalog()
+        self.stdout.write(self.style.SUCCESS(f"Katalog konsep dibangun ulang: {total} konsep."))
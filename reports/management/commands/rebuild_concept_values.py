@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from reports.concept_values import rebuild_concept_values
+
+
+class Command(BaseCommand):
+    help = "Isi ulang tabel nilai konsep (screener) dari seluruh fakta yang tersimpan."
+
+    def handle(self, *args, **options):
+        total = rebuild_concept_values()
+        self.stdout.write(self.style.SUCCESS(f"{total} nilai konsep tersimpan."))
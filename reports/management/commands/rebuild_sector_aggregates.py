@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from reports.sector_aggregates import rebuild_sector_aggregates
+
+
+class Command(BaseCommand):
+    help = "Isi ulang agregat sektor/subsektor/industri/subindustri dari tabel nilai konsep."
+
+    def handle(self, *args, **options):
+        total = rebuild_sector_aggregates()
+        self.stdout.write(self.style.SUCCESS(f"{total} agregat sektor tersimpan."))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from reports.site_stats import repair_statistics
+
+
+class Command(BaseCommand):
+    help = "Hitung ulang counter situs dan ringkasan filing per emiten dari tabel sumber."
+
+    def handle(self, *args, **options):
+        counters = repair_statistics()
+        summary = ", ".join(f"{name} {value}" for name, value in counters.items())
+        self.stdout.write(self.style.SUCCESS(f"Statistik diperbaiki: {summary}."))
@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand
+
+from reports.management.commands.dump_snapshot import _split
+from reports.snapshots import restore_snapshot
+
+
+class Command(BaseCommand):
+    help = "Pulihkan snapshot hasil dump_snapshot dengan insert massal, opsional paralel."
+
+    def add_arguments(self, parser):
+        parser.add_argument("input_dir", help="Direktori snapshot.")
+        parser.add_argument(
+            "--ticker",
+            action="append",
+            default=[],
+            help="Hanya emiten ini (boleh diulang atau dipisah koma).",
+        )
+        parser.add_argument(
+            "--period",
+            action="append",
+            default=[],
+            help="Hanya label periode ini (boleh diulang atau dipisah koma).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Jumlah proses restore paralel (diabaikan pada SQLite).",
+        )
+        parser.add_argument(
+            "--replace",
+            action="store_true",
+            help="Timpa filing dengan emiten dan periode yang sama.",
+        )
+        parser.add_argument(
+            "--skip-derived",
+            action="store_true",
+            help="Lewati pembangunan ulang katalog konsep, agregat sektor, dan rasio.",
+        )
+
+    def handle(self, *args, **options):
+        result = restore_snapshot(
+            options["input_dir"],
+            tickers=_split(options["ticker"]),
+            periods=_split(options["period"]),
+            workers=max(options["workers"], 1),
+            replace=options["replace"],
+            skip_derived=options["skip_derived"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{result.filings} filing ({result.facts} fakta) dipulihkan, "
+                f"{result.skipped} dilewati karena sudah ada."
+            )
+        )
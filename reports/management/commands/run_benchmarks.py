@@ -0,0 +1,51 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from reports.benchmarks import run_benchmarks
+
+
+class Command(BaseCommand):
+    help = "Ukur waktu parser, ingest, lookup fakta, dan baris template dengan data XBRL sintetis."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            default="1000,10000,100000",
+            help="Daftar jumlah fakta dipisah koma (mis. 1000,10000,1000000).",
+        )
+        parser.add_argument("--repeat", type=int, default=3, help="Jumlah pengulangan per ukuran.")
+        parser.add_argument("--contexts", type=int, help="Jumlah context (default menyesuaikan ukuran).")
+        parser.add_argument("--dimension-depth", type=int, default=1)
+        parser.add_argument("--text-block-size", type=int, default=2000)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--output",
+            default="benchmark-results.json",
+            help="File JSON hasil untuk dibandingkan antar commit.",
+        )
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options["sizes"].split(",") if size.strip()]
+        report = run_benchmarks(
+            sizes,
+            repeat=max(options["repeat"], 1),
+            context_count=options["contexts"],
+            dimension_depth=options["dimension_depth"],
+            text_block_size=options["text_block_size"],
+            seed=options["seed"],
+        )
+        with open(options["output"], "w", encoding="utf-8") as output:
+            json.dump(report, output, indent=2)
+
+        for result in report["results"]:
+            size = result["spec"]["fact_count"]
+            self.stdout.write(
+                f"{size:>9} fakta  parse {result['parse']['median']:.3f}s  "
+                f"ingest {result['ingest']['median']:.3f}s  "
+                f"lookup db {result['fact_lookup_db']['median'] * 1000:.1f}ms  "
+                f"cache dingin {result['fact_lookup_cache_cold']['median'] * 1000:.1f}ms  "
+                f"cache hangat {result['fact_lookup_cache_warm']['median'] * 1000:.1f}ms  "
+                f"rows {result['build_template_rows']['median'] * 1000:.1f}ms"
+            )
+        self.stdout.write(self.style.SUCCESS(f"Hasil benchmark ditulis ke {options['output']}."))
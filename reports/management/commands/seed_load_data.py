@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from reports.loadtest import seed_load_data
+
+
+class Command(BaseCommand):
+    help = "Isi database dengan emiten dan filing sintetis untuk uji beban lokal."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--companies", type=int, default=50, help="Jumlah emiten sintetis.")
+        parser.add_argument("--filings", type=int, default=4, help="Jumlah filing tahunan per emiten.")
+        parser.add_argument("--facts", type=int, default=2000, help="Jumlah fakta per filing.")
+        parser.add_argument("--contexts", type=int, default=16)
+        parser.add_argument("--first-year", type=int, default=2024, help="Tahun filing terbaru.")
+
+    def handle(self, *args, **options):
+        result = seed_load_data(
+            companies=options["companies"],
+            filings=options["filings"],
+            facts=options["facts"],
+            contexts=options["contexts"],
+            first_year=options["first_year"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Filing sintetis dibuat: {result.created}, dilewati (sudah ada): {result.skipped}."
+            )
+        )
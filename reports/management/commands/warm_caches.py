@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from reports.warmup import warm_caches
+
+
+class Command(BaseCommand):
+    help = "Muat template halaman, plan template laporan, dan filing terbaru emiten terpopuler."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--ticker",
+            action="append",
+            dest="tickers",
+            help="Hanya emiten ini (boleh diulang). Default: emiten terpopuler.",
+        )
+        parser.add_argument("--limit", type=int, help="Jumlah emiten terpopuler yang dimuat.")
+        parser.add_argument("--filings", type=int, help="Jumlah filing terbaru per emiten.")
+
+    def handle(self, *args, **options):
+        result = warm_caches(
+            tickers=options["tickers"],
+            limit=options["limit"],
+            filings_per_company=options["filings"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Warm-up selesai: {result.templates} template, "
+                f"{result.template_plans} plan laporan, {result.companies} emiten, "
+                f"{result.filings} filing."
+            )
+        )
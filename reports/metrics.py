@@ -0,0 +1,307 @@
+"""Registry metrik lokal dengan agregasi lintas proses worker.
+
+Setiap proses mengakumulasi nilai di memori dan secara berkala menuliskannya
+ke `METRICS_DIR/metrics-<pid>.json` (tulis atomik). Endpoint `/metrics`
+menjumlahkan semua file tersebut, sehingga counter dan histogram dari
+seluruh worker gunicorn/uwsgi terlihat sebagai satu deret. File milik pid
+yang sudah tidak berjalan digabungkan ke `metrics-dead.json` lalu dihapus
+saat scrape (seperti mode multiprocess prometheus_client), sehingga total
+counter tidak pernah turun ketika worker di-recycle atau di-deploy ulang.
+"""
+
+from __future__ import annotations
+
+import atexit
+import bisect
+import fcntl
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+
+DEFAULT_FLUSH_INTERVAL = 1.0
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+INGEST_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+DEAD_WORKERS_FILE = "metrics-dead.json"
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self.metrics: dict[str, "_Metric"] = {}
+        self._values: dict[str, dict[tuple, list[float]]] = {}
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._dirty = False
+        self._last_flush = 0.0
+        atexit.register(self.flush)
+
+    def register(self, metric: "_Metric") -> "_Metric":
+        self.metrics[metric.name] = metric
+        return metric
+
+    def update(self, metric: "_Metric", labels: tuple, apply) -> None:
+        with self._lock:
+            if os.getpid() != self._pid:
+                # Proses hasil fork tidak boleh ikut menulis nilai milik induknya.
+                self._pid = os.getpid()
+                self._values = {}
+                self._last_flush = 0.0
+            series = self._values.setdefault(metric.name, {})
+            values = series.get(labels)
+            if values is None:
+                values = series[labels] = metric.empty()
+            apply(values)
+            self._dirty = True
+            due = time.monotonic() - self._last_flush >= _flush_interval()
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._dirty or os.getpid() != self._pid:
+                return
+            payload = {
+                name: [[list(labels), values] for labels, values in series.items()]
+                for name, series in self._values.items()
+            }
+            self._dirty = False
+            self._last_flush = time.monotonic()
+        directory = metrics_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        _write_json(directory / f"metrics-{self._pid}.json", payload)
+
+    def collect(self) -> dict[str, dict[tuple, list[float]]]:
+        """Gabungkan nilai dari semua file proses (termasuk proses ini)."""
+        self.flush()
+        directory = metrics_dir()
+        if any(_is_dead_worker_file(path) for path in directory.glob("metrics-*.json")):
+            _absorb_dead_workers(directory)
+        merged: dict[str, dict[tuple, list[float]]] = {}
+        for path in sorted(directory.glob("metrics-*.json")):
+            payload = _read_payload(path)
+            if payload is not None:
+                _merge_payload(merged, payload, self.metrics)
+        return merged
+
+    def render(self) -> str:
+        """Format teks eksposisi Prometheus (versi 0.0.4)."""
+        collected = self.collect()
+        lines = []
+        for name, metric in sorted(self.metrics.items()):
+            lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for labels, values in sorted(collected.get(name, {}).items()):
+                lines.extend(metric.render(dict(zip(metric.labelnames, labels)), values))
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Hapus nilai proses ini beserta semua file metrik (untuk pengujian)."""
+        with self._lock:
+            self._values = {}
+            self._dirty = False
+        for path in metrics_dir().glob("metrics-*.json"):
+            path.unlink(missing_ok=True)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = (), registry=None) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.registry = registry or REGISTRY
+        self.registry.register(self)
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def empty(self) -> list[float]:
+        return [0.0]
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        def apply(values):
+            values[0] += amount
+
+        self.registry.update(self, self._key(labels), apply)
+
+    def render(self, labels: dict, values: list[float]) -> list[str]:
+        return [f"{self.name}{_labels(labels)} {_number(values[0])}"]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS, registry=None) -> None:
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, help, labelnames, registry)
+
+    def empty(self) -> list[float]:
+        # Hitungan per bucket (non-kumulatif), lalu sum dan count.
+        return [0.0] * (len(self.buckets) + 3)
+
+    def observe(self, value: float, **labels) -> None:
+        position = bisect.bisect_left(self.buckets, value)
+
+        def apply(values):
+            values[position] += 1
+            values[-2] += value
+            values[-1] += 1
+
+        self.registry.update(self, self._key(labels), apply)
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def render(self, labels: dict, values: list[float]) -> list[str]:
+        lines = []
+        cumulative = 0.0
+        for bound, count in zip(self.buckets + (float("inf"),), values):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else _number(bound)
+            lines.append(f"{self.name}_bucket{_labels({**labels, 'le': le})} {_number(cumulative)}")
+        lines.append(f"{self.name}_sum{_labels(labels)} {_number(values[-2])}")
+        lines.append(f"{self.name}_count{_labels(labels)} {_number(values[-1])}")
+        return lines
+
+
+def metrics_dir() -> Path:
+    configured = getattr(settings, "METRICS_DIR", None)
+    return Path(configured) if configured else Path(tempfile.gettempdir()) / "lapxbrl-metrics"
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def _absorb_dead_workers(directory: Path) -> None:
+    """Pindahkan nilai worker yang sudah berhenti ke akumulator `DEAD_WORKERS_FILE`.
+
+    Dikunci dengan flock agar dua scrape bersamaan tidak menggabungkan file
+    yang sama dua kali.
+    """
+    with open(directory / f"{DEAD_WORKERS_FILE}.lock", "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        dead_path = directory / DEAD_WORKERS_FILE
+        dead_files = [
+            path for path in directory.glob("metrics-*.json") if _is_dead_worker_file(path)
+        ]
+        if not dead_files:
+            return
+        accumulated: dict[str, dict[tuple, list[float]]] = {}
+        _merge_payload(accumulated, _read_payload(dead_path) or {})
+        for path in dead_files:
+            _merge_payload(accumulated, _read_payload(path) or {})
+        _write_json(
+            dead_path,
+            {
+                name: [[list(labels), values] for labels, values in series.items()]
+                for name, series in accumulated.items()
+            },
+        )
+        for path in dead_files:
+            path.unlink(missing_ok=True)
+
+
+def _read_payload(path: Path) -> dict | None:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path: Path, payload: dict) -> None:
+    tmp_path = path.with_suffix(".json.tmp")
+    tmp_path.write_text(json.dumps(payload), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def _merge_payload(
+    target: dict[str, dict[tuple, list[float]]], payload: dict, metrics: dict | None = None
+) -> None:
+    for name, series in payload.items():
+        if metrics is not None and name not in metrics:
+            continue
+        merged = target.setdefault(name, {})
+        for labels, values in series:
+            key = tuple(labels)
+            current = merged.get(key)
+            if current is None or len(current) != len(values):
+                merged[key] = list(values)
+            else:
+                merged[key] = [a + b for a, b in zip(current, values)]
+
+
+def _is_dead_worker_file(path: Path) -> bool:
+    try:
+        pid = int(path.stem.rsplit("-", 1)[1])
+    except (IndexError, ValueError):
+        return False
+    if pid == os.getpid():
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return True
+    except PermissionError:
+        # Proses ada tetapi milik user lain.
+        return False
+    return False
+
+
+def _flush_interval() -> float:
+    return getattr(settings, "METRICS_FLUSH_INTERVAL", DEFAULT_FLUSH_INTERVAL)
+
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    parts = []
+    for name, value in labels.items():
+        escaped = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{name}="{escaped}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+REGISTRY = MetricsRegistry()
+
+INGEST_STAGE_SECONDS = Histogram(
+    "lapxbrl_ingest_stage_seconds",
+    "Durasi tahap ingest XBRL.",
+    ("stage",),
+    buckets=INGEST_BUCKETS,
+)
+FACTS_INGESTED = Counter("lapxbrl_facts_ingested_total", "Jumlah fakta yang berhasil disimpan.")
+UPLOAD_FAILURES = Counter(
+    "lapxbrl_upload_failures_total", "Upload XBRL yang gagal per tipe exception.", ("exception",)
+)
+VIEW_LATENCY_SECONDS = Histogram(
+    "lapxbrl_view_latency_seconds", "Latensi request per nama URL.", ("view", "method")
+)
+HTTP_RESPONSES = Counter(
+    "lapxbrl_http_responses_total", "Jumlah response per nama URL dan status.", ("view", "status")
+)
+CACHE_REQUESTS = Counter(
+    "lapxbrl_cache_requests_total", "Hit dan miss cache per nama cache.", ("cache", "result")
+)
+REPORT_REQUESTS = Counter(
+    "lapxbrl_report_requests_total", "Permintaan halaman laporan per emiten.", ("ticker",)
+)
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import logging
+import random
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.template.loader import render_to_string
+from django.urls import reverse
+
+from .metrics import HTTP_RESPONSES, VIEW_LATENCY_SECONDS
+from .profiling import profile_call, profiling_requested, save_profile
+from .query_budget import record_queries
+from .slow_queries import capture_slow_queries, store_slow_queries
+
+logger = logging.getLogger(__name__)
+
+QUERY_BUDGET_HEADER = "X-Query-Budget"
+
+
+class MetricsMiddleware:
+    """Latensi dan jumlah response per nama URL untuk endpoint `/metrics`.
+
+    Label memakai nama URL (bukan path) agar jumlah deret tetap terbatas.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "METRICS_ENABLED", True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        response = self.get_response(request)
+        match = getattr(request, "resolver_match", None)
+        view = (match.url_name or match.view_name) if match else "unmatched"
+        VIEW_LATENCY_SECONDS.observe(
+            time.perf_counter() - started, view=view, method=request.method
+        )
+        HTTP_RESPONSES.inc(view=view, status=response.status_code)
+        return response
+
+
+class QueryBudgetMiddleware:
+    """Catat jumlah query, waktu SQL, dan query duplikat untuk setiap request.
+
+    Ringkasan dikirim lewat header `X-Query-Budget` dan `Server-Timing`;
+    bila `QUERY_BUDGET_PANEL` aktif, panel kecil disisipkan ke halaman HTML.
+    Batas per view (nama URL) dapat diatur di `QUERY_BUDGETS`; pelanggaran
+    dicatat ke log `reports.middleware`. Nonaktif (tanpa overhead) bila
+    `QUERY_BUDGET_ENABLED` bernilai False, default mengikuti DEBUG.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "QUERY_BUDGET_ENABLED", settings.DEBUG):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.show_panel = getattr(settings, "QUERY_BUDGET_PANEL", settings.DEBUG)
+        self.budgets = getattr(settings, "QUERY_BUDGETS", {})
+
+    def __call__(self, request):
+        with record_queries() as recorder:
+            response = self.get_response(request)
+
+        response[QUERY_BUDGET_HEADER] = recorder.header_value()
+        response["Server-Timing"] = (
+            f'db;dur={recorder.duration * 1000:.1f};desc="{recorder.count} queries"'
+        )
+
+        match = getattr(request, "resolver_match", None)
+        view_name = match.url_name if match else None
+        budget = self.budgets.get(view_name)
+        if budget is not None and recorder.count > budget:
+            logger.warning(
+                "Query budget %s terlampaui: %s query (batas %s) untuk %s",
+                view_name,
+                recorder.count,
+                budget,
+                request.path,
+            )
+
+        if self.show_panel and _is_html_page(response):
+            _inject_panel(response, recorder, view_name, budget)
+        return response
+
+
+class SlowQueryMiddleware:
+    """Simpan query di atas `SLOW_QUERY_THRESHOLD_MS` beserta EXPLAIN ke `SlowQuery`.
+
+    Hanya sebagian request yang disampel (`SLOW_QUERY_SAMPLE_RATE`); request
+    lain tidak dibungkus sama sekali. Bila `SLOW_QUERY_CAPTURE_ENABLED`
+    False, middleware dilepas dari rantai sehingga tidak ada overhead.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "SLOW_QUERY_CAPTURE_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, "SLOW_QUERY_SAMPLE_RATE", 1.0)
+
+    def __call__(self, request):
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        with capture_slow_queries() as capture:
+            response = self.get_response(request)
+
+        if capture.captured:
+            match = getattr(request, "resolver_match", None)
+            store_slow_queries(
+                capture.captured,
+                method=request.method,
+                path=request.path,
+                view_name=match.view_name if match else "",
+            )
+        return response
+
+
+class ProfilingMiddleware:
+    """Profiling per request atas permintaan staff (`X-Profile: 1` atau `?_profile=1`).
+
+    View dijalankan di bawah sampler stack; collapsed stack, durasi, dan
+    jumlah query disimpan ke `ProfileRun` dan tautannya dikirim lewat header
+    `X-Profile-URL`. Request non-staff tidak pernah diprofil. Harus dipasang
+    setelah `AuthenticationMiddleware`.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "PROFILING_ENABLED", True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not profiling_requested(request):
+            return self.get_response(request)
+
+        with record_queries() as recorder:
+            response, sampler, duration = profile_call(lambda: self.get_response(request))
+        run = save_profile(request, response, sampler, duration, recorder)
+        response["X-Profile-Id"] = str(run.pk)
+        response["X-Profile-URL"] = reverse("profile_detail", args=[run.pk])
+        return response
+
+
+def _is_html_page(response) -> bool:
+    return (
+        not response.streaming
+        and response.status_code == 200
+        and response.get("Content-Type", "").startswith("text/html")
+        and not response.get("Content-Encoding")
+    )
+
+
+def _inject_panel(response, recorder, view_name, budget) -> None:
+    content = response.content
+    position = content.rfind(b"</body>")
+    if position == -1:
+        return
+    panel = render_to_string(
+        "partials/query_budget_panel.html",
+        {
+            "recorder": recorder,
+            "view_name": view_name,
+            "budget": budget,
+            "duration_ms": recorder.duration * 1000,
+            "top_queries": recorder.summary(),
+        },
+    ).encode(response.charset)
+    response.content = content[:position] + panel + content[position:]
+    if response.has_header("Content-Length"):
+        response["Content-Length"] = str(len(response.content))
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-19 14:11
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0005_merge_20260107_1112'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='company',
+            index=models.Index(django.db.models.functions.text.Upper('name'), name='company_name_upper_idx'),
+        ),
+    ]
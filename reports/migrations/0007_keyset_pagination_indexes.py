@@ -0,0 +1,21 @@
+# Generated by Django 5.2.9 on 2026-10-19 14:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0006_company_name_upper_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='fact',
+            index=models.Index(fields=['filing', 'order', 'id'], name='fact_filing_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='filing',
+            index=models.Index(fields=['-uploaded_at', '-id'], name='filing_uploaded_idx'),
+        ),
+    ]
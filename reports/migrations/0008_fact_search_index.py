@@ -0,0 +1,78 @@
+from django.db import migrations
+from django.utils.html import strip_tags
+
+SQLITE_CREATE = """
+CREATE VIRTUAL TABLE IF NOT EXISTS reports_fact_search USING fts5(
+    name,
+    value_text,
+    filing_id UNINDEXED,
+    tokenize = 'unicode61'
+)
+"""
+
+POSTGRES_CREATE = [
+    """
+    CREATE TABLE IF NOT EXISTS reports_fact_search (
+        fact_id bigint PRIMARY KEY REFERENCES reports_fact (id) ON DELETE CASCADE,
+        filing_id bigint NOT NULL,
+        name text NOT NULL,
+        value_text text NOT NULL,
+        document tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', name), 'A')
+            || setweight(to_tsvector('simple', value_text), 'B')
+        ) STORED
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS reports_fact_search_document_idx "
+    "ON reports_fact_search USING gin (document)",
+    "CREATE INDEX IF NOT EXISTS reports_fact_search_filing_idx "
+    "ON reports_fact_search (filing_id)",
+]
+
+
+def create_fact_search(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == "sqlite":
+        schema_editor.execute(SQLITE_CREATE)
+        id_column = "rowid"
+    elif connection.vendor == "postgresql":
+        for statement in POSTGRES_CREATE:
+            schema_editor.execute(statement)
+        id_column = "fact_id"
+    else:
+        return
+
+    Fact = apps.get_model("reports", "Fact")
+    sql = (
+        f"INSERT INTO reports_fact_search ({id_column}, name, value_text, filing_id) "
+        "VALUES (%s, %s, %s, %s)"
+    )
+    batch = []
+    with connection.cursor() as cursor:
+        for fact_id, filing_id, name, value in (
+            Fact.objects.order_by()
+            .values_list("id", "filing_id", "name", "value")
+            .iterator(chunk_size=500)
+        ):
+            text = strip_tags(value) if value and "<" in value else value or ""
+            batch.append((fact_id, name, " ".join(text.split()), filing_id))
+            if len(batch) >= 500:
+                cursor.executemany(sql, batch)
+                batch = []
+        if batch:
+            cursor.executemany(sql, batch)
+
+
+def drop_fact_search(apps, schema_editor):
+    if schema_editor.connection.vendor in ("sqlite", "postgresql"):
+        schema_editor.execute("DROP TABLE IF EXISTS reports_fact_search")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reports", "0007_keyset_pagination_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fact_search, drop_fact_search),
+    ]
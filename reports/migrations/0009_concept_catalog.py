@@ -0,0 +1,29 @@
+# Generated by Django 5.2.9 on 2026-10-19 14:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0008_fact_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Concept',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('name_lower', models.CharField(max_length=255, unique=True)),
+                ('namespace', models.CharField(blank=True, max_length=255)),
+                ('fact_count', models.PositiveIntegerField(default=0)),
+                ('filing_count', models.PositiveIntegerField(default=0)),
+                ('example_value', models.CharField(blank=True, max_length=255)),
+                ('updated_at', models.DateTimeField(auto_now=True, db_index=True)),
+            ],
+            options={
+                'ordering': ['name_lower'],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.9 on 2026-10-19 14:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0009_concept_catalog'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CoverageRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('filing_count', models.PositiveIntegerField(default=0)),
+                ('item_count', models.PositiveIntegerField(default=0)),
+                ('weak_threshold', models.FloatField(default=0.8)),
+                ('duration_ms', models.PositiveIntegerField(default=0)),
+                ('results', models.JSONField(default=dict)),
+            ],
+            options={
+                'ordering': ['-created_at', '-id'],
+            },
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.9 on 2026-10-19 14:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0010_coverage_run'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RatioDefinition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.SlugField(max_length=64, unique=True)),
+                ('name', models.CharField(max_length=128)),
+                ('numerator_facts', models.TextField(help_text='Kode item pembilang, 1 per baris; baris berikutnya sebagai fallback.')),
+                ('denominator_facts', models.TextField(help_text='Kode item penyebut, 1 per baris; baris berikutnya sebagai fallback.')),
+                ('multiplier', models.DecimalField(decimal_places=4, default=1, max_digits=12)),
+                ('description', models.TextField(blank=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['code'],
+            },
+        ),
+        migrations.CreateModel(
+            name='RatioRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('started_at', models.DateTimeField()),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('filing_watermark', models.DateTimeField(blank=True, null=True)),
+                ('full', models.BooleanField(default=False)),
+                ('filing_count', models.PositiveIntegerField(default=0)),
+                ('value_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-started_at', '-id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='RatioValue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('value', models.FloatField(blank=True, null=True)),
+                ('status', models.CharField(choices=[('ok', 'OK'), ('missing', 'Data tidak lengkap'), ('zero_denominator', 'Penyebut nol')], default='ok', max_length=32)),
+                ('computed_at', models.DateTimeField()),
+                ('filing', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ratio_values', to='reports.filing')),
+                ('ratio', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='values', to='reports.ratiodefinition')),
+            ],
+            options={
+                'ordering': ['ratio', 'filing'],
+                'indexes': [models.Index(fields=['ratio', 'value'], name='ratio_value_rank_idx')],
+                'constraints': [models.UniqueConstraint(fields=('ratio', 'filing'), name='unique_ratio_value_per_filing')],
+            },
+        ),
+    ]
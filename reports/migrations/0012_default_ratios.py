@@ -0,0 +1,85 @@
+from django.db import migrations
+
+
+def create_default_ratios(apps, schema_editor):
+    RatioDefinition = apps.get_model("reports", "RatioDefinition")
+
+    ratios = [
+        (
+            "current-ratio",
+            "Current Ratio",
+            ["Currentassets"],
+            ["Currentliabilities"],
+            1,
+            "Aset lancar dibagi liabilitas jangka pendek.",
+        ),
+        (
+            "der",
+            "Debt to Equity Ratio",
+            ["Liabilities"],
+            ["Equity"],
+            1,
+            "Jumlah liabilitas dibagi jumlah ekuitas.",
+        ),
+        (
+            "roe",
+            "Return on Equity (%)",
+            ["Totalprofit(loss)", "ProfitLoss"],
+            ["Equity"],
+            100,
+            "Laba (rugi) tahun berjalan dibagi jumlah ekuitas.",
+        ),
+        (
+            "roa",
+            "Return on Assets (%)",
+            ["Totalprofit(loss)", "ProfitLoss"],
+            ["Assets"],
+            100,
+            "Laba (rugi) tahun berjalan dibagi jumlah aset.",
+        ),
+        (
+            "gross-margin",
+            "Gross Profit Margin (%)",
+            ["Totalgrossprofit"],
+            ["Salesandrevenue", "Revenue"],
+            100,
+            "Laba bruto dibagi penjualan dan pendapatan usaha.",
+        ),
+        (
+            "net-margin",
+            "Net Profit Margin (%)",
+            ["Totalprofit(loss)", "ProfitLoss"],
+            ["Salesandrevenue", "Revenue"],
+            100,
+            "Laba (rugi) tahun berjalan dibagi penjualan dan pendapatan usaha.",
+        ),
+    ]
+
+    for code, name, numerator, denominator, multiplier, description in ratios:
+        RatioDefinition.objects.get_or_create(
+            code=code,
+            defaults={
+                "name": name,
+                "numerator_facts": "\n".join(numerator),
+                "denominator_facts": "\n".join(denominator),
+                "multiplier": multiplier,
+                "description": description,
+            },
+        )
+
+
+def remove_default_ratios(apps, schema_editor):
+    RatioDefinition = apps.get_model("reports", "RatioDefinition")
+    RatioDefinition.objects.filter(
+        code__in=["current-ratio", "der", "roe", "roa", "gross-margin", "net-margin"]
+    ).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reports", "0011_ratio_engine"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_default_ratios, remove_default_ratios),
+    ]
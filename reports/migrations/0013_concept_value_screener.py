@@ -0,0 +1,49 @@
+# Generated by Django 5.2.9 on 2026-10-19 14:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0012_default_ratios'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConceptValue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('concept', models.CharField(max_length=255)),
+                ('period_start', models.DateField()),
+                ('period_end', models.DateField()),
+                ('value', models.FloatField()),
+            ],
+            options={
+                'ordering': ['concept', 'period_end', 'company'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='company',
+            index=models.Index(fields=['sector', 'subsector'], name='company_sector_idx'),
+        ),
+        migrations.AddField(
+            model_name='conceptvalue',
+            name='company',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='concept_values', to='reports.company'),
+        ),
+        migrations.AddField(
+            model_name='conceptvalue',
+            name='filing',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='concept_values', to='reports.filing'),
+        ),
+        migrations.AddIndex(
+            model_name='conceptvalue',
+            index=models.Index(fields=['concept', 'period_end', 'value'], name='concept_value_rank_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='conceptvalue',
+            constraint=models.UniqueConstraint(fields=('company', 'concept', 'period_start', 'period_end'), name='unique_concept_value_per_period'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.9 on 2026-10-19 14:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0013_concept_value_screener'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SectorAggregate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('level', models.CharField(choices=[('sector', 'Sektor'), ('subsector', 'Subsektor'), ('industry', 'Industri'), ('subindustry', 'Subindustri')], max_length=16)),
+                ('sector', models.CharField(max_length=255)),
+                ('subsector', models.CharField(blank=True, max_length=255)),
+                ('industry', models.CharField(blank=True, max_length=255)),
+                ('subindustry', models.CharField(blank=True, max_length=255)),
+                ('concept', models.CharField(max_length=255)),
+                ('period_start', models.DateField()),
+                ('period_end', models.DateField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('total', models.FloatField()),
+                ('min_value', models.FloatField()),
+                ('max_value', models.FloatField()),
+                ('median', models.FloatField()),
+                ('p10', models.FloatField()),
+                ('p25', models.FloatField()),
+                ('p75', models.FloatField()),
+                ('p90', models.FloatField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['concept', 'period_end', 'sector', 'subsector', 'industry', 'subindustry'],
+                'indexes': [models.Index(fields=['concept', 'period_end', 'level'], name='sector_aggregate_lookup_idx')],
+                'constraints': [models.UniqueConstraint(fields=('level', 'sector', 'subsector', 'industry', 'subindustry', 'concept', 'period_start', 'period_end'), name='unique_sector_aggregate_node')],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.9 on 2026-10-19 14:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0014_sector_aggregates'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='conceptvalue',
+            index=models.Index(fields=['company', 'concept', 'period_end', 'period_start'], name='concept_value_series_idx'),
+        ),
+    ]
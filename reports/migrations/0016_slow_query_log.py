@@ -0,0 +1,33 @@
+# Generated by Django 5.2.9 on 2026-10-19 14:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0015_concept_series_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlowQuery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('captured_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('fingerprint', models.CharField(db_index=True, max_length=40)),
+                ('sql', models.TextField()),
+                ('params_shape', models.CharField(blank=True, max_length=255)),
+                ('duration_ms', models.FloatField()),
+                ('database', models.CharField(default='default', max_length=64)),
+                ('method', models.CharField(blank=True, max_length=10)),
+                ('path', models.CharField(blank=True, max_length=512)),
+                ('view_name', models.CharField(blank=True, max_length=255)),
+                ('explain', models.TextField(blank=True)),
+            ],
+            options={
+                'verbose_name_plural': 'slow queries',
+                'ordering': ['-captured_at', '-id'],
+            },
+        ),
+    ]
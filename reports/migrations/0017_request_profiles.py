@@ -0,0 +1,37 @@
+# Generated by Django 5.2.9 on 2026-10-19 14:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0016_slow_query_log'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProfileRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('method', models.CharField(max_length=10)),
+                ('path', models.CharField(max_length=1024)),
+                ('view_name', models.CharField(blank=True, max_length=255)),
+                ('status_code', models.PositiveSmallIntegerField(default=0)),
+                ('duration_ms', models.FloatField()),
+                ('query_count', models.PositiveIntegerField(default=0)),
+                ('query_ms', models.FloatField(default=0)),
+                ('interval_ms', models.FloatField()),
+                ('sample_count', models.PositiveIntegerField(default=0)),
+                ('stacks', models.TextField(blank=True, help_text='Format collapsed stack: frame;frame;frame jumlah')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at', '-id'],
+            },
+        ),
+    ]
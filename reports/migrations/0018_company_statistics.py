@@ -0,0 +1,76 @@
+# Generated by Django 5.2.9 on 2026-10-19 14:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Max, Min
+from django.db.models.functions import Coalesce
+
+
+def compute_statistics(apps, schema_editor):
+    Company = apps.get_model("reports", "Company")
+    Filing = apps.get_model("reports", "Filing")
+    ReportTemplate = apps.get_model("reports", "ReportTemplate")
+    SiteCounter = apps.get_model("reports", "SiteCounter")
+
+    for name, model in (
+        ("companies", Company),
+        ("filings", Filing),
+        ("templates", ReportTemplate),
+    ):
+        SiteCounter.objects.create(name=name, value=model.objects.count())
+
+    for company_id in Company.objects.values_list("id", flat=True):
+        filings = Filing.objects.filter(company_id=company_id)
+        summary = filings.annotate(period=Coalesce("period_end", "instant_date")).aggregate(
+            first_period_end=Min("period"),
+            last_period_end=Max("period"),
+        )
+        Company.objects.filter(pk=company_id).update(
+            latest_filing_id=filings.order_by("-uploaded_at", "-id")
+            .values_list("id", flat=True)
+            .first(),
+            filing_count=filings.count(),
+            **summary,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0017_request_profiles'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SiteCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=32, unique=True)),
+                ('value', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='company',
+            name='filing_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='company',
+            name='first_period_end',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='company',
+            name='last_period_end',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='company',
+            name='latest_filing',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='reports.filing'),
+        ),
+        migrations.RunPython(compute_statistics, migrations.RunPython.noop),
+    ]
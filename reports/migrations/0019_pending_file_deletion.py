@@ -0,0 +1,26 @@
+# Generated by Django 5.2.9 on 2026-10-19 14:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0018_company_statistics'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingFileDeletion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True)),
+            ],
+            options={
+                'ordering': ['created_at', 'id'],
+            },
+        ),
+    ]
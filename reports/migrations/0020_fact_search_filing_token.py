@@ -0,0 +1,44 @@
+from django.db import migrations
+
+SQLITE_CREATE = """
+CREATE VIRTUAL TABLE {table} USING fts5(
+    name,
+    value_text,
+    filing_id{unindexed},
+    tokenize = 'unicode61'
+)
+"""
+
+
+def _rebuild_sqlite_table(schema_editor, unindexed: str) -> None:
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(
+        SQLITE_CREATE.format(table="reports_fact_search_new", unindexed=unindexed)
+    )
+    schema_editor.execute(
+        "INSERT INTO reports_fact_search_new (rowid, name, value_text, filing_id) "
+        "SELECT rowid, name, value_text, filing_id FROM reports_fact_search"
+    )
+    schema_editor.execute("DROP TABLE reports_fact_search")
+    schema_editor.execute("ALTER TABLE reports_fact_search_new RENAME TO reports_fact_search")
+
+
+def index_filing_column(apps, schema_editor):
+    # filing_id ikut diindeks sebagai token agar MATCH per filing tidak
+    # memindai seluruh indeks lalu menyaring per baris.
+    _rebuild_sqlite_table(schema_editor, "")
+
+
+def unindex_filing_column(apps, schema_editor):
+    _rebuild_sqlite_table(schema_editor, " UNINDEXED")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reports", "0019_pending_file_deletion"),
+    ]
+
+    operations = [
+        migrations.RunPython(index_filing_column, unindex_filing_column),
+    ]
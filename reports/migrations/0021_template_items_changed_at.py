@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-19 15:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0020_fact_search_filing_token'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reporttemplate',
+            name='items_changed_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
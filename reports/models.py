@@ -1,4 +1,6 @@
+from django.conf import settings
 from django.db import models
+from django.db.models.functions import Upper
 
 
 class Company(models.Model):
@@ -12,9 +14,21 @@ class Company(models.Model):
     industry = models.CharField(max_length=255, blank=True)
     subindustry = models.CharField(max_length=255, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Statistik turunan; dijaga oleh site_stats.refresh_company_stats dan
+    # dapat dihitung ulang dengan `manage.py repair_statistics`.
+    latest_filing = models.ForeignKey(
+        "Filing", on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    filing_count = models.PositiveIntegerField(default=0)
+    first_period_end = models.DateField(null=True, blank=True)
+    last_period_end = models.DateField(null=True, blank=True)
 
     class Meta:
         ordering = ["ticker"]
+        indexes = [
+            models.Index(Upper("name"), name="company_name_upper_idx"),
+            models.Index(fields=["sector", "subsector"], name="company_sector_idx"),
+        ]
 
     def __str__(self) -> str:
         return self.ticker
@@ -36,6 +50,9 @@ class Filing(models.Model):
 
     class Meta:
         ordering = ["-period_end", "-instant_date", "-uploaded_at"]
+        indexes = [
+            models.Index(fields=["-uploaded_at", "-id"], name="filing_uploaded_idx"),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=["company", "period_label"], name="unique_company_period_label"
@@ -48,6 +65,43 @@ class Filing(models.Model):
         return f"Filing {self.pk}"
 
 
+class PendingFileDeletion(models.Model):
+    """File upload yang menunggu dihapus dari storage setelah filingnya dihapus."""
+
+    name = models.CharField(max_length=255)
+    created_at = models.DateTimeField(auto_now_add=True)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ["created_at", "id"]
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class SiteCounter(models.Model):
+    COMPANIES = "companies"
+    FILINGS = "filings"
+    TEMPLATES = "templates"
+    NAMES = [COMPANIES, FILINGS, TEMPLATES]
+
+    name = models.CharField(max_length=32, unique=True)
+    value = models.BigIntegerField(default=0)
+
+    class Meta:
+        ordering = ["name"]
+
+    def __str__(self) -> str:
+        return f"{self.name}={self.value}"
+
+    @classmethod
+    def values(cls) -> dict[str, int]:
+        counters = dict.fromkeys(cls.NAMES, 0)
+        counters.update(cls.objects.values_list("name", "value"))
+        return counters
+
+
 class Context(models.Model):
     filing = models.ForeignKey(
         Filing, on_delete=models.CASCADE, related_name="contexts"
@@ -85,6 +139,121 @@ class Fact(models.Model):
 
     class Meta:
         ordering = ["name", "order", "id"]
+        indexes = [
+            models.Index(fields=["filing", "order", "id"], name="fact_filing_order_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class ConceptValue(models.Model):
+    company = models.ForeignKey(
+        Company, on_delete=models.CASCADE, related_name="concept_values"
+    )
+    filing = models.ForeignKey(
+        Filing, on_delete=models.CASCADE, related_name="concept_values"
+    )
+    concept = models.CharField(max_length=255)
+    period_start = models.DateField()
+    period_end = models.DateField()
+    value = models.FloatField()
+
+    class Meta:
+        ordering = ["concept", "period_end", "company"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["company", "concept", "period_start", "period_end"],
+                name="unique_concept_value_per_period",
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["concept", "period_end", "value"], name="concept_value_rank_idx"
+            ),
+            models.Index(
+                fields=["company", "concept", "period_end", "period_start"],
+                name="concept_value_series_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.concept} {self.period_end}"
+
+
+class SectorAggregate(models.Model):
+    LEVEL_SECTOR = "sector"
+    LEVEL_SUBSECTOR = "subsector"
+    LEVEL_INDUSTRY = "industry"
+    LEVEL_SUBINDUSTRY = "subindustry"
+    LEVELS = [LEVEL_SECTOR, LEVEL_SUBSECTOR, LEVEL_INDUSTRY, LEVEL_SUBINDUSTRY]
+    LEVEL_CHOICES = [
+        (LEVEL_SECTOR, "Sektor"),
+        (LEVEL_SUBSECTOR, "Subsektor"),
+        (LEVEL_INDUSTRY, "Industri"),
+        (LEVEL_SUBINDUSTRY, "Subindustri"),
+    ]
+
+    level = models.CharField(max_length=16, choices=LEVEL_CHOICES)
+    sector = models.CharField(max_length=255)
+    subsector = models.CharField(max_length=255, blank=True)
+    industry = models.CharField(max_length=255, blank=True)
+    subindustry = models.CharField(max_length=255, blank=True)
+    concept = models.CharField(max_length=255)
+    period_start = models.DateField()
+    period_end = models.DateField()
+    count = models.PositiveIntegerField(default=0)
+    total = models.FloatField()
+    min_value = models.FloatField()
+    max_value = models.FloatField()
+    median = models.FloatField()
+    p10 = models.FloatField()
+    p25 = models.FloatField()
+    p75 = models.FloatField()
+    p90 = models.FloatField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["concept", "period_end", "sector", "subsector", "industry", "subindustry"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=[
+                    "level",
+                    "sector",
+                    "subsector",
+                    "industry",
+                    "subindustry",
+                    "concept",
+                    "period_start",
+                    "period_end",
+                ],
+                name="unique_sector_aggregate_node",
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["concept", "period_end", "level"], name="sector_aggregate_lookup_idx"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        node = " / ".join(
+            part for part in (self.sector, self.subsector, self.industry, self.subindustry) if part
+        )
+        return f"{node} - {self.concept} {self.period_end}"
+
+
+class Concept(models.Model):
+    name = models.CharField(max_length=255)
+    name_lower = models.CharField(max_length=255, unique=True)
+    namespace = models.CharField(max_length=255, blank=True)
+    fact_count = models.PositiveIntegerField(default=0)
+    filing_count = models.PositiveIntegerField(default=0)
+    example_value = models.CharField(max_length=255, blank=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        ordering = ["name_lower"]
 
     def __str__(self) -> str:
         return self.name
@@ -95,6 +264,8 @@ class ReportTemplate(models.Model):
     slug = models.SlugField(unique=True)
     description = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Diperbarui sinyal di template_plans setiap kali item disimpan/dihapus.
+    items_changed_at = models.DateTimeField(null=True, blank=True, editable=False)
 
     class Meta:
         ordering = ["name"]
@@ -125,3 +296,142 @@ class TemplateItem(models.Model):
     def fallback_list(self) -> list[str]:
         text = self.fallback_facts or ""
         return [line.strip() for line in text.splitlines() if line.strip()]
+
+
+class CoverageRun(models.Model):
+    created_at = models.DateTimeField(auto_now_add=True)
+    filing_count = models.PositiveIntegerField(default=0)
+    item_count = models.PositiveIntegerField(default=0)
+    weak_threshold = models.FloatField(default=0.8)
+    duration_ms = models.PositiveIntegerField(default=0)
+    results = models.JSONField(default=dict)
+
+    class Meta:
+        ordering = ["-created_at", "-id"]
+
+    def __str__(self) -> str:
+        return f"Coverage {self.created_at:%Y-%m-%d %H:%M}"
+
+
+class RatioDefinition(models.Model):
+    code = models.SlugField(max_length=64, unique=True)
+    name = models.CharField(max_length=128)
+    numerator_facts = models.TextField(
+        help_text="Kode item pembilang, 1 per baris; baris berikutnya sebagai fallback.",
+    )
+    denominator_facts = models.TextField(
+        help_text="Kode item penyebut, 1 per baris; baris berikutnya sebagai fallback.",
+    )
+    multiplier = models.DecimalField(max_digits=12, decimal_places=4, default=1)
+    description = models.TextField(blank=True)
+    is_active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["code"]
+
+    def __str__(self) -> str:
+        return self.name
+
+    def numerator_list(self) -> list[str]:
+        return _code_lines(self.numerator_facts)
+
+    def denominator_list(self) -> list[str]:
+        return _code_lines(self.denominator_facts)
+
+
+class RatioValue(models.Model):
+    STATUS_OK = "ok"
+    STATUS_MISSING = "missing"
+    STATUS_ZERO_DENOMINATOR = "zero_denominator"
+    STATUS_CHOICES = [
+        (STATUS_OK, "OK"),
+        (STATUS_MISSING, "Data tidak lengkap"),
+        (STATUS_ZERO_DENOMINATOR, "Penyebut nol"),
+    ]
+
+    ratio = models.ForeignKey(
+        RatioDefinition, on_delete=models.CASCADE, related_name="values"
+    )
+    filing = models.ForeignKey(
+        Filing, on_delete=models.CASCADE, related_name="ratio_values"
+    )
+    value = models.FloatField(null=True, blank=True)
+    status = models.CharField(max_length=32, choices=STATUS_CHOICES, default=STATUS_OK)
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ["ratio", "filing"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["ratio", "filing"], name="unique_ratio_value_per_filing"
+            )
+        ]
+        indexes = [
+            models.Index(fields=["ratio", "value"], name="ratio_value_rank_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.ratio.code} - {self.filing}"
+
+
+class RatioRun(models.Model):
+    started_at = models.DateTimeField()
+    finished_at = models.DateTimeField(null=True, blank=True)
+    filing_watermark = models.DateTimeField(null=True, blank=True)
+    full = models.BooleanField(default=False)
+    filing_count = models.PositiveIntegerField(default=0)
+    value_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["-started_at", "-id"]
+
+    def __str__(self) -> str:
+        return f"Ratio run {self.started_at:%Y-%m-%d %H:%M}"
+
+
+class SlowQuery(models.Model):
+    captured_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    fingerprint = models.CharField(max_length=40, db_index=True)
+    sql = models.TextField()
+    params_shape = models.CharField(max_length=255, blank=True)
+    duration_ms = models.FloatField()
+    database = models.CharField(max_length=64, default="default")
+    method = models.CharField(max_length=10, blank=True)
+    path = models.CharField(max_length=512, blank=True)
+    view_name = models.CharField(max_length=255, blank=True)
+    explain = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ["-captured_at", "-id"]
+        verbose_name_plural = "slow queries"
+
+    def __str__(self) -> str:
+        return f"{self.duration_ms:.0f} ms - {self.view_name or self.path}"
+
+
+class ProfileRun(models.Model):
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True
+    )
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=1024)
+    view_name = models.CharField(max_length=255, blank=True)
+    status_code = models.PositiveSmallIntegerField(default=0)
+    duration_ms = models.FloatField()
+    query_count = models.PositiveIntegerField(default=0)
+    query_ms = models.FloatField(default=0)
+    interval_ms = models.FloatField()
+    sample_count = models.PositiveIntegerField(default=0)
+    stacks = models.TextField(blank=True, help_text="Format collapsed stack: frame;frame;frame jumlah")
+
+    class Meta:
+        ordering = ["-created_at", "-id"]
+
+    def __str__(self) -> str:
+        return f"{self.method} {self.path} ({self.duration_ms:.0f} ms)"
+
+
+def _code_lines(text: str) -> list[str]:
+    return [line.strip() for line in (text or "").splitlines() if line.strip()]
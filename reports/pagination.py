@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import base64
+import json
+from functools import reduce
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import models
+
+CURSOR_NEXT = "n"
+CURSOR_PREVIOUS = "p"
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class KeysetPage:
+    def __init__(
+        self,
+        object_list: list,
+        paginator: "KeysetPaginator",
+        has_next: bool,
+        has_previous: bool,
+    ) -> None:
+        self.object_list = object_list
+        self.paginator = paginator
+        self.has_next = has_next
+        self.has_previous = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self) -> int:
+        return len(self.object_list)
+
+    def __bool__(self) -> bool:
+        return bool(self.object_list)
+
+    def has_other_pages(self) -> bool:
+        return self.has_next or self.has_previous
+
+    @property
+    def next_cursor(self) -> str:
+        if not self.has_next or not self.object_list:
+            return ""
+        return self.paginator.encode_cursor(self.object_list[-1], CURSOR_NEXT)
+
+    @property
+    def previous_cursor(self) -> str:
+        if not self.has_previous or not self.object_list:
+            return ""
+        return self.paginator.encode_cursor(self.object_list[0], CURSOR_PREVIOUS)
+
+
+class KeysetPaginator:
+    """Paginasi seek berbasis kunci urut unik, tanpa COUNT(*) maupun OFFSET.
+
+    `ordering` harus diakhiri kolom unik (biasanya `id`) agar posisi halaman
+    selalu tegas. Token cursor menyimpan nilai kunci baris terakhir/pertama.
+    """
+
+    def __init__(
+        self,
+        queryset: models.QuerySet,
+        ordering: tuple[str, ...],
+        per_page: int,
+        count_cap: int | None = None,
+    ) -> None:
+        self.queryset = queryset
+        self.ordering = ordering
+        self.per_page = per_page
+        self.count_cap = count_cap
+        self._fields = [field.lstrip("-") for field in ordering]
+        self._descending = [field.startswith("-") for field in ordering]
+
+    def get_page(self, cursor: str | None) -> KeysetPage:
+        try:
+            values, direction = self.decode_cursor(cursor) if cursor else (None, CURSOR_NEXT)
+        except InvalidCursor:
+            values, direction = None, CURSOR_NEXT
+
+        reverse = direction == CURSOR_PREVIOUS
+        queryset = self.queryset.order_by(*self._order_by(reverse))
+        if values is not None:
+            try:
+                queryset = queryset.filter(self._seek_filter(values, reverse))
+            except (TypeError, ValueError, ValidationError):
+                return self.get_page(None)
+
+        rows = list(queryset[: self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+
+        if reverse:
+            rows.reverse()
+            return KeysetPage(rows, self, has_next=True, has_previous=has_more)
+        return KeysetPage(rows, self, has_next=has_more, has_previous=values is not None)
+
+    def estimated_count(self) -> tuple[int, bool] | None:
+        """Hitung baris hingga `count_cap`; nilai kedua True bila terpotong."""
+        if self.count_cap is None:
+            return None
+        count = self.queryset.order_by()[: self.count_cap + 1].count()
+        if count > self.count_cap:
+            return self.count_cap, True
+        return count, False
+
+    def encode_cursor(self, obj, direction: str) -> str:
+        values = [_serialize(getattr(obj, field)) for field in self._fields]
+        payload = json.dumps({"d": direction, "k": values}, separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, cursor: str) -> tuple[list, str]:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            values = payload["k"]
+            direction = payload["d"]
+        except (ValueError, TypeError, KeyError) as exc:
+            raise InvalidCursor(str(exc)) from exc
+        if (
+            direction not in (CURSOR_NEXT, CURSOR_PREVIOUS)
+            or not isinstance(values, list)
+            or len(values) != len(self._fields)
+        ):
+            raise InvalidCursor("Cursor tidak sesuai urutan paginasi.")
+        return values, direction
+
+    def _order_by(self, reverse: bool) -> list[str]:
+        order_by = []
+        for field, descending in zip(self._fields, self._descending):
+            if descending != reverse:
+                order_by.append(f"-{field}")
+            else:
+                order_by.append(field)
+        return order_by
+
+    def _seek_filter(self, values: list, reverse: bool) -> models.Q:
+        # (a, b) > (va, vb)  ==>  a > va OR (a = va AND b > vb)
+        clauses = []
+        for idx, field in enumerate(self._fields):
+            descending = self._descending[idx] != reverse
+            lookup = "lt" if descending else "gt"
+            equal = {self._fields[pos]: values[pos] for pos in range(idx)}
+            clauses.append(models.Q(**equal, **{f"{field}__{lookup}": values[idx]}))
+        return reduce(lambda left, right: left | right, clauses)
+
+
+class KnownCountPaginator(Paginator):
+    """Paginator biasa, tetapi jumlah total diambil dari counter, bukan COUNT(*)."""
+
+    def __init__(self, object_list, per_page, count: int, **kwargs) -> None:
+        super().__init__(object_list, per_page, **kwargs)
+        self._known_count = count
+
+    @property
+    def count(self) -> int:
+        return self._known_count
+
+
+def _serialize(value):
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
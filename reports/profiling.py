@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+
+from .models import ProfileRun
+
+PROFILE_HEADER = "HTTP_X_PROFILE"
+PROFILE_PARAM = "_profile"
+DEFAULT_INTERVAL_MS = 2.0
+DEFAULT_KEEP = 200
+MAX_STACK_DEPTH = 128
+MIN_FLAME_WIDTH = 0.001
+
+
+def profiling_requested(request) -> bool:
+    """Profiling hanya untuk staff yang meminta lewat header `X-Profile` atau `?_profile=1`."""
+    if request.META.get(PROFILE_HEADER, "") not in ("1", "true") and request.GET.get(
+        PROFILE_PARAM
+    ) not in ("1", "true"):
+        return False
+    user = getattr(request, "user", None)
+    return bool(user and user.is_authenticated and user.is_staff)
+
+
+class StackSampler:
+    """Profiler sampling: thread terpisah membaca stack thread target setiap interval.
+
+    Hasilnya berupa hitungan collapsed stack (`root;...;leaf`), format yang
+    dipakai flamegraph.pl dan speedscope. Overhead hanya ada selama sampling.
+    """
+
+    def __init__(self, thread_id: int, interval: float) -> None:
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._labels: dict = {}
+
+    def __enter__(self) -> "StackSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    @property
+    def sample_count(self) -> int:
+        return sum(self.stacks.values())
+
+    def collapsed(self) -> str:
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            frames = []
+            while frame is not None and len(frames) < MAX_STACK_DEPTH:
+                frames.append(self._label(frame.f_code))
+                frame = frame.f_back
+            self.stacks[";".join(reversed(frames))] += 1
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+            label = label.replace(";", ":")
+            self._labels[code] = label
+        return label
+
+
+def interval_ms() -> float:
+    return getattr(settings, "PROFILE_SAMPLE_INTERVAL_MS", DEFAULT_INTERVAL_MS)
+
+
+def save_profile(request, response, sampler: StackSampler, duration: float, recorder) -> ProfileRun:
+    match = getattr(request, "resolver_match", None)
+    run = ProfileRun.objects.create(
+        user=request.user if request.user.is_authenticated else None,
+        method=request.method,
+        path=request.get_full_path()[:1024],
+        view_name=match.view_name if match else "",
+        status_code=response.status_code,
+        duration_ms=duration * 1000,
+        query_count=recorder.count,
+        query_ms=recorder.duration * 1000,
+        interval_ms=sampler.interval * 1000,
+        sample_count=sampler.sample_count,
+        stacks=sampler.collapsed(),
+    )
+    keep = getattr(settings, "PROFILE_KEEP", DEFAULT_KEEP)
+    boundary = list(ProfileRun.objects.order_by("-id").values_list("id", flat=True)[keep : keep + 1])
+    if boundary:
+        ProfileRun.objects.filter(id__lte=boundary[0]).delete()
+    return run
+
+
+def parse_collapsed(text: str) -> Counter:
+    stacks = Counter()
+    for line in text.splitlines():
+        stack, _, count = line.rpartition(" ")
+        if stack and count.isdigit():
+            stacks[stack] += int(count)
+    return stacks
+
+
+def flame_layout(text: str) -> tuple[list[dict], int]:
+    """Ubah collapsed stack menjadi kotak flame graph (posisi dan lebar dalam persen).
+
+    Mengembalikan daftar kotak dan kedalaman maksimum. Kotak yang lebih
+    sempit dari MIN_FLAME_WIDTH total sampel dibuang agar halaman ringan.
+    """
+    stacks = parse_collapsed(text)
+    total = sum(stacks.values())
+    if not total:
+        return [], 0
+
+    root: dict = {"value": 0, "children": {}}
+    for stack, count in stacks.items():
+        node = root
+        node["value"] += count
+        for frame in stack.split(";"):
+            node = node["children"].setdefault(frame, {"value": 0, "children": {}})
+            node["value"] += count
+
+    boxes = []
+    max_depth = 0
+    pending = [(root["children"], 0.0, 0)]
+    while pending:
+        children, offset, depth = pending.pop()
+        for name, node in sorted(children.items()):
+            width = node["value"] / total
+            if width >= MIN_FLAME_WIDTH:
+                boxes.append(
+                    {
+                        "name": name,
+                        "samples": node["value"],
+                        "left": offset * 100,
+                        "width": width * 100,
+                        "depth": depth,
+                        "percent": width * 100,
+                        "hue": int(hashlib.md5(_module(name).encode()).hexdigest()[:2], 16) % 60,
+                    }
+                )
+                max_depth = max(max_depth, depth + 1)
+                pending.append((node["children"], offset, depth + 1))
+            offset += width
+    return boxes, max_depth
+
+
+def _module(label: str) -> str:
+    start = label.rfind("(")
+    return label[start + 1 :].split(":")[0] if start != -1 else label
+
+
+def _short_path(filename: str) -> str:
+    base = str(settings.BASE_DIR) + os.sep
+    if filename.startswith(base):
+        return filename[len(base) :]
+    marker = "site-packages" + os.sep
+    position = filename.find(marker)
+    if position != -1:
+        return filename[position + len(marker) :]
+    return os.path.basename(filename)
+
+
+def profile_call(func, interval: float | None = None):
+    """Jalankan `func` di bawah sampler pada thread saat ini; mengembalikan (hasil, sampler, durasi)."""
+    sampler = StackSampler(threading.get_ident(), (interval or interval_ms()) / 1000)
+    started = time.perf_counter()
+    with sampler:
+        result = func()
+    return result, sampler, time.perf_counter() - started
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+
+from django.db import connections
+
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*%s\s*,?)+\)", re.IGNORECASE)
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_SPACES = re.compile(r"\s+")
+
+
+def fingerprint(sql: str) -> str:
+    """Bentuk SQL tanpa nilai: literal jadi `?` dan daftar `IN (...)` diringkas.
+
+    Dua query dengan fingerprint sama tetapi parameter berbeda adalah ciri
+    khas N+1 (query per baris).
+    """
+    sql = _IN_LIST.sub("IN (...)", sql)
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    return _SPACES.sub(" ", sql).strip()
+
+
+@dataclass
+class QueryRecorder:
+    """Execute wrapper yang mencatat jumlah, durasi, dan fingerprint query."""
+
+    count: int = 0
+    duration: float = 0.0
+    fingerprints: Counter = field(default_factory=Counter)
+    fingerprint_time: Counter = field(default_factory=Counter)
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            key = fingerprint(sql)
+            self.count += 1
+            self.duration += elapsed
+            self.fingerprints[key] += 1
+            self.fingerprint_time[key] += elapsed
+
+    @property
+    def duplicates(self) -> list[tuple[str, int]]:
+        """Fingerprint yang dieksekusi lebih dari sekali, terbanyak lebih dulu."""
+        return [(sql, count) for sql, count in self.fingerprints.most_common() if count > 1]
+
+    @property
+    def duplicate_count(self) -> int:
+        return sum(count - 1 for _, count in self.duplicates)
+
+    def header_value(self) -> str:
+        return (
+            f"queries={self.count}; time-ms={self.duration * 1000:.1f}; "
+            f"duplicates={self.duplicate_count}"
+        )
+
+    def summary(self, limit: int = 10) -> list[dict]:
+        return [
+            {
+                "sql": sql,
+                "count": count,
+                "time_ms": self.fingerprint_time[sql] * 1000,
+            }
+            for sql, count in self.fingerprints.most_common(limit)
+        ]
+
+
+@contextmanager
+def record_queries(using: str | None = None):
+    """Catat query pada satu alias database, atau semua alias bila `using` kosong."""
+    recorder = QueryRecorder()
+    aliases = [using] if using else list(connections)
+    with ExitStack() as stack:
+        for alias in aliases:
+            stack.enter_context(connections[alias].execute_wrapper(recorder))
+        yield recorder
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import numpy as np
+from django.db.models import Max
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from .models import Fact, Filing, RatioDefinition, RatioRun, RatioValue
+
+FILING_BATCH_SIZE = 500
+WRITE_BATCH_SIZE = 1000
+
+
+def compute_ratios(full: bool = False) -> RatioRun:
+    """Hitung rasio keuangan untuk filing baru atau definisi yang berubah.
+
+    Tanpa `full`, hanya filing yang diunggah setelah run terakhir yang
+    dihitung untuk semua definisi, ditambah definisi yang diubah sejak run
+    terakhir untuk seluruh filing.
+    """
+    started_at = timezone.now()
+    last_run = None if full else RatioRun.objects.exclude(finished_at=None).first()
+    definitions = list(RatioDefinition.objects.filter(is_active=True))
+    watermark = Filing.objects.aggregate(latest=Max("uploaded_at"))["latest"]
+
+    jobs: list[tuple[list[RatioDefinition], list[int]]] = []
+    if last_run is None:
+        jobs.append((definitions, list(Filing.objects.values_list("id", flat=True))))
+    else:
+        changed = [d for d in definitions if d.updated_at > last_run.started_at]
+        unchanged = [d for d in definitions if d.updated_at <= last_run.started_at]
+        new_filings = Filing.objects.all()
+        if last_run.filing_watermark:
+            new_filings = new_filings.filter(uploaded_at__gt=last_run.filing_watermark)
+        new_filing_ids = list(new_filings.values_list("id", flat=True))
+        if changed:
+            jobs.append((changed, list(Filing.objects.values_list("id", flat=True))))
+        if unchanged and new_filing_ids:
+            jobs.append((unchanged, new_filing_ids))
+
+    filing_ids_touched: set[int] = set()
+    value_count = 0
+    for job_definitions, filing_ids in jobs:
+        if not job_definitions:
+            continue
+        for start in range(0, len(filing_ids), FILING_BATCH_SIZE):
+            batch = filing_ids[start : start + FILING_BATCH_SIZE]
+            value_count += _compute_batch(job_definitions, batch, started_at)
+            filing_ids_touched.update(batch)
+
+    return RatioRun.objects.create(
+        started_at=started_at,
+        finished_at=timezone.now(),
+        filing_watermark=watermark,
+        full=last_run is None,
+        filing_count=len(filing_ids_touched),
+        value_count=value_count,
+    )
+
+
+def compute_filing_ratios(filing_ids: list[int]) -> int:
+    """Hitung semua rasio aktif hanya untuk filing tertentu (mis. hasil restore)."""
+    definitions = list(RatioDefinition.objects.filter(is_active=True))
+    if not definitions:
+        return 0
+    computed_at = timezone.now()
+    value_count = 0
+    for start in range(0, len(filing_ids), FILING_BATCH_SIZE):
+        value_count += _compute_batch(
+            definitions, filing_ids[start : start + FILING_BATCH_SIZE], computed_at
+        )
+    return value_count
+
+
+def ratio_choices() -> list[tuple[str, str]]:
+    return list(
+        RatioDefinition.objects.filter(is_active=True).values_list("code", "name")
+    )
+
+
+def ratio_values_for_filing(filing_id: int) -> dict[str, RatioValue]:
+    return {
+        value.ratio.code: value
+        for value in RatioValue.objects.select_related("ratio").filter(filing_id=filing_id)
+    }
+
+
+def _compute_batch(
+    definitions: list[RatioDefinition], filing_ids: list[int], computed_at
+) -> int:
+    concept_index: dict[str, int] = {}
+    numerators = []
+    denominators = []
+    for definition in definitions:
+        numerators.append(_concept_positions(definition.numerator_list(), concept_index))
+        denominators.append(_concept_positions(definition.denominator_list(), concept_index))
+
+    filing_index = {filing_id: pos for pos, filing_id in enumerate(filing_ids)}
+    values = _load_values(filing_index, concept_index)  # F x C, NaN bila tidak ada
+
+    results = np.full((len(filing_ids), len(definitions)), np.nan)
+    statuses = np.full((len(filing_ids), len(definitions)), RatioValue.STATUS_OK, dtype=object)
+    for col, definition in enumerate(definitions):
+        numerator = _first_available(values, numerators[col])
+        denominator = _first_available(values, denominators[col])
+        missing = np.isnan(numerator) | np.isnan(denominator)
+        zero = ~missing & (denominator == 0)
+        valid = ~missing & ~zero
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = numerator / denominator * float(definition.multiplier)
+        results[:, col] = np.where(valid, ratio, np.nan)
+        statuses[missing, col] = RatioValue.STATUS_MISSING
+        statuses[zero, col] = RatioValue.STATUS_ZERO_DENOMINATOR
+
+    rows = [
+        RatioValue(
+            ratio=definition,
+            filing_id=filing_id,
+            value=None if np.isnan(results[row, col]) else float(results[row, col]),
+            status=statuses[row, col],
+            computed_at=computed_at,
+        )
+        for row, filing_id in enumerate(filing_ids)
+        for col, definition in enumerate(definitions)
+    ]
+    RatioValue.objects.bulk_create(
+        rows,
+        batch_size=WRITE_BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=["ratio", "filing"],
+        update_fields=["value", "status", "computed_at"],
+    )
+    return len(rows)
+
+
+def _concept_positions(codes: list[str], concept_index: dict[str, int]) -> list[int]:
+    return [concept_index.setdefault(code.lower(), len(concept_index)) for code in codes]
+
+
+def _load_values(filing_index: dict[int, int], concept_index: dict[str, int]) -> np.ndarray:
+    values = np.full((len(filing_index), len(concept_index)), np.nan)
+    if not filing_index or not concept_index:
+        return values
+    # Urutan sama dengan _fact_lookup di views: fakta pertama per nama yang dipakai.
+    facts = (
+        Fact.objects.filter(filing_id__in=list(filing_index))
+        .annotate(name_lower=Lower("name"))
+        .filter(name_lower__in=list(concept_index))
+        .order_by("filing_id", "name", "order", "id")
+        .values_list("filing_id", "name_lower", "value")
+        .iterator(chunk_size=5000)
+    )
+    seen = np.zeros(values.shape, dtype=bool)
+    for filing_id, name_lower, raw_value in facts:
+        row = filing_index[filing_id]
+        col = concept_index[name_lower]
+        if seen[row, col]:
+            continue
+        seen[row, col] = True
+        values[row, col] = _as_float(raw_value)
+    return values
+
+
+def _first_available(values: np.ndarray, columns: list[int]) -> np.ndarray:
+    result = np.full(values.shape[0], np.nan)
+    for col in columns:
+        result = np.where(np.isnan(result), values[:, col], result)
+    return result
+
+
+def _as_float(value: str | None) -> float:
+    if not value:
+        return np.nan
+    try:
+        return float(value.replace(",", ""))
+    except ValueError:
+        return np.nan
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from itertools import groupby
+from typing import Iterator
+
+from django.db import connection
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce, Collate
+
+from .models import Filing
+
+STATUS_CHANGED = "changed"
+STATUS_ADDED = "added"
+STATUS_REMOVED = "removed"
+STATUSES = (STATUS_CHANGED, STATUS_ADDED, STATUS_REMOVED)
+
+# Pengganti NULL agar urutan database dan Python sama di semua backend.
+NO_DATE = date(1, 1, 1)
+# Urutan biner (codepoint) agar perbandingan string Python cocok dengan ORDER BY.
+BINARY_COLLATIONS = {"postgresql": "C", "mysql": "utf8mb4_bin"}
+
+FactKey = tuple[str, date, date, date, str]
+
+
+@dataclass
+class FactChange:
+    status: str
+    concept: str
+    period_start: date | None
+    period_end: date | None
+    instant_date: date | None
+    unit: str
+    old_value: str | None
+    new_value: str | None
+    delta: float | None = None
+    delta_percent: float | None = None
+
+    @property
+    def magnitude(self) -> float | None:
+        if self.delta is not None:
+            return abs(self.delta)
+        number = _as_float(self.new_value if self.old_value is None else self.old_value)
+        return abs(number) if number is not None else None
+
+
+def diff_filings(
+    original: Filing,
+    restated: Filing,
+    min_delta: float = 0,
+    min_percent: float = 0,
+    statuses=STATUSES,
+) -> Iterator[FactChange]:
+    """Bandingkan dua filing dengan merge join atas fakta yang sudah terurut.
+
+    Kedua filing dibaca sebagai stream terurut (konsep, periode konteks, unit)
+    sehingga memori hanya menampung satu grup kunci dari setiap sisi.
+    Fakta dengan kunci sama dipasangkan sesuai urutan kemunculannya.
+    """
+    left = groupby(_sorted_facts(original), key=lambda row: row[0])
+    right = groupby(_sorted_facts(restated), key=lambda row: row[0])
+    left_group = next(left, None)
+    right_group = next(right, None)
+
+    while left_group or right_group:
+        if right_group is None or (left_group and left_group[0] < right_group[0]):
+            changes = _unmatched(left_group, STATUS_REMOVED)
+            left_group = next(left, None)
+        elif left_group is None or right_group[0] < left_group[0]:
+            changes = _unmatched(right_group, STATUS_ADDED)
+            right_group = next(right, None)
+        else:
+            changes = _matched(left_group, right_group)
+            left_group = next(left, None)
+            right_group = next(right, None)
+
+        for change in changes:
+            if change.status in statuses and _passes_filter(change, min_delta, min_percent):
+                yield change
+
+
+def _sorted_facts(filing: Filing) -> Iterator[tuple[FactKey, str]]:
+    name = F("name")
+    unit = F("unit")
+    collation = BINARY_COLLATIONS.get(connection.vendor)
+    if collation:
+        name = Collate(name, collation)
+        unit = Collate(unit, collation)
+    rows = (
+        filing.facts.annotate(
+            sort_name=name,
+            sort_start=Coalesce("context__start_date", Value(NO_DATE)),
+            sort_end=Coalesce("context__end_date", Value(NO_DATE)),
+            sort_instant=Coalesce("context__instant_date", Value(NO_DATE)),
+            sort_unit=unit,
+        )
+        .order_by("sort_name", "sort_start", "sort_end", "sort_instant", "sort_unit", "order", "id")
+        .values_list("sort_name", "sort_start", "sort_end", "sort_instant", "sort_unit", "value")
+        .iterator(chunk_size=5000)
+    )
+    for concept, start, end, instant, unit_ref, value in rows:
+        yield (concept, start, end, instant, unit_ref), value
+
+
+def _matched(left_group, right_group) -> list[FactChange]:
+    key = left_group[0]
+    old_values = [value for _, value in left_group[1]]
+    new_values = [value for _, value in right_group[1]]
+    changes = []
+    for old_value, new_value in zip(old_values, new_values):
+        if _same_value(old_value, new_value):
+            continue
+        change = _change(STATUS_CHANGED, key, old_value, new_value)
+        old_number = _as_float(old_value)
+        new_number = _as_float(new_value)
+        if old_number is not None and new_number is not None:
+            change.delta = new_number - old_number
+            if old_number:
+                change.delta_percent = change.delta / abs(old_number) * 100
+        changes.append(change)
+    for old_value in old_values[len(new_values) :]:
+        changes.append(_change(STATUS_REMOVED, key, old_value, None))
+    for new_value in new_values[len(old_values) :]:
+        changes.append(_change(STATUS_ADDED, key, None, new_value))
+    return changes
+
+
+def _unmatched(group, status: str) -> list[FactChange]:
+    key, rows = group
+    if status == STATUS_REMOVED:
+        return [_change(status, key, value, None) for _, value in rows]
+    return [_change(status, key, None, value) for _, value in rows]
+
+
+def _change(status: str, key: FactKey, old_value, new_value) -> FactChange:
+    concept, start, end, instant, unit = key
+    return FactChange(
+        status=status,
+        concept=concept,
+        period_start=None if start == NO_DATE else start,
+        period_end=None if end == NO_DATE else end,
+        instant_date=None if instant == NO_DATE else instant,
+        unit=unit,
+        old_value=old_value,
+        new_value=new_value,
+    )
+
+
+def _passes_filter(change: FactChange, min_delta: float, min_percent: float) -> bool:
+    if not min_delta and not min_percent:
+        return True
+    magnitude = change.magnitude
+    if magnitude is None or magnitude < min_delta:
+        return False
+    if min_percent and change.status == STATUS_CHANGED:
+        return change.delta_percent is None or abs(change.delta_percent) >= min_percent
+    return True
+
+
+def _same_value(old_value: str, new_value: str) -> bool:
+    if old_value == new_value:
+        return True
+    old_number = _as_float(old_value)
+    new_number = _as_float(new_value)
+    return old_number is not None and old_number == new_number
+
+
+def _as_float(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return float(value.replace(",", ""))
+    except ValueError:
+        return None
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+
+from django.db.models import Case, F, IntegerField, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce
+
+from .models import Company, ConceptValue, Filing, RatioValue
+
+METRIC_CONCEPT = "concept"
+METRIC_RATIO = "ratio"
+
+
+@dataclass
+class ScreenerQuery:
+    metric_type: str
+    metric: str
+    period_end: date
+    sector: str = ""
+    subsector: str = ""
+    min_value: float | None = None
+    max_value: float | None = None
+    growth: bool = False
+    descending: bool = True
+
+
+@dataclass
+class ScreenerRow:
+    rank: int
+    company: Company
+    filing_id: int
+    value: float | None
+    prior_value: float | None = None
+    growth: float | None = None
+
+
+@dataclass
+class ScreenerResult:
+    rows: list[ScreenerRow]
+    total: int
+
+
+def screen(query: ScreenerQuery, limit: int = 50, offset: int = 0) -> ScreenerResult:
+    """Peringkat seluruh emiten untuk satu konsep/rasio pada satu periode.
+
+    Tanpa `growth`, penyaringan, pengurutan, dan paginasi dikerjakan oleh
+    indeks (konsep, periode, nilai) atau (rasio, nilai) di database.
+    """
+    if query.growth:
+        return _screen_growth(query, limit, offset)
+
+    queryset = _metric_queryset(query, query.period_end)
+    if query.min_value is not None:
+        queryset = queryset.filter(value__gte=query.min_value)
+    if query.max_value is not None:
+        queryset = queryset.filter(value__lte=query.max_value)
+    total = queryset.count()
+
+    company_field = _company_field(query)
+    ordering = F("value").desc() if query.descending else F("value").asc()
+    page = queryset.select_related(company_field).order_by(
+        ordering, f"{company_field}__ticker"
+    )[offset : offset + limit]
+    rows = [
+        ScreenerRow(
+            rank=offset + pos + 1,
+            company=row.filing.company if query.metric_type == METRIC_RATIO else row.company,
+            filing_id=row.filing_id,
+            value=row.value,
+        )
+        for pos, row in enumerate(page)
+    ]
+    return ScreenerResult(rows=rows, total=total)
+
+
+def period_choices() -> list[date]:
+    return list(
+        Filing.objects.annotate(period=_filing_period())
+        .exclude(period=None)
+        .order_by("-period")
+        .values_list("period", flat=True)
+        .distinct()
+    )
+
+
+def sector_choices() -> list[tuple[str, str]]:
+    return list(
+        Company.objects.exclude(sector="")
+        .order_by("sector", "subsector")
+        .values_list("sector", "subsector")
+        .distinct()
+    )
+
+
+def _company_field(query: ScreenerQuery) -> str:
+    return "filing__company" if query.metric_type == METRIC_RATIO else "company"
+
+
+def _metric_queryset(query: ScreenerQuery, period_end: date):
+    if query.metric_type == METRIC_RATIO:
+        queryset = RatioValue.objects.filter(
+            ratio__code=query.metric, filing=_latest_filing(period_end), value__isnull=False
+        )
+    else:
+        concept = query.metric.lower()
+        queryset = ConceptValue.objects.filter(
+            concept=concept, period_end=period_end, period_start=_preferred_span(concept, period_end)
+        )
+    company_field = _company_field(query)
+    if query.sector:
+        queryset = queryset.filter(**{f"{company_field}__sector": query.sector})
+    if query.subsector:
+        queryset = queryset.filter(**{f"{company_field}__subsector": query.subsector})
+    return queryset
+
+
+def _filing_period() -> Coalesce:
+    return Coalesce("period_end", "instant_date")
+
+
+def _latest_filing(period_end: date) -> Subquery:
+    """Filing terbaru per emiten untuk periode ini (akhir periode atau tanggal instant).
+
+    Emiten bisa punya beberapa filing untuk periode yang sama (mis. laporan
+    yang disajikan kembali dengan label berbeda); hanya unggahan terakhir
+    yang diperingkat.
+    """
+    filings = (
+        Filing.objects.alias(period=_filing_period())
+        .filter(company=OuterRef("filing__company"), period=period_end)
+        .order_by("-uploaded_at", "-id")
+        .values("pk")[:1]
+    )
+    return Subquery(filings)
+
+
+def _preferred_span(concept: str, period_end: date) -> Subquery:
+    """Awal periode yang dipakai per emiten: nilai instant, lalu durasi terpanjang.
+
+    Satu emiten bisa punya beberapa nilai yang berakhir di tanggal yang sama
+    (mis. kuartal IV dan tahun berjalan); hanya satu yang boleh diperingkat.
+    """
+    spans = (
+        ConceptValue.objects.filter(
+            company=OuterRef("company"), concept=concept, period_end=period_end
+        )
+        .annotate(
+            is_duration=Case(
+                When(period_start=F("period_end"), then=Value(0)),
+                default=Value(1),
+                output_field=IntegerField(),
+            )
+        )
+        .order_by("is_duration", "period_start")
+        .values("period_start")[:1]
+    )
+    return Subquery(spans)
+
+
+def _screen_growth(query: ScreenerQuery, limit: int, offset: int) -> ScreenerResult:
+    current = _values_by_company(query, query.period_end)
+    prior = _values_by_company(query, _one_year_before(query.period_end))
+
+    candidates = []
+    for company_id, (filing_id, value) in current.items():
+        prior_value = prior.get(company_id, (None, None))[1]
+        if not prior_value:
+            continue
+        growth = (value - prior_value) / abs(prior_value) * 100
+        if query.min_value is not None and growth < query.min_value:
+            continue
+        if query.max_value is not None and growth > query.max_value:
+            continue
+        candidates.append((company_id, filing_id, value, prior_value, growth))
+
+    candidates.sort(key=lambda row: row[4], reverse=query.descending)
+    page = candidates[offset : offset + limit]
+    companies = Company.objects.in_bulk([row[0] for row in page])
+    rows = [
+        ScreenerRow(
+            rank=offset + pos + 1,
+            company=companies[company_id],
+            filing_id=filing_id,
+            value=value,
+            prior_value=prior_value,
+            growth=growth,
+        )
+        for pos, (company_id, filing_id, value, prior_value, growth) in enumerate(page)
+    ]
+    return ScreenerResult(rows=rows, total=len(candidates))
+
+
+def _values_by_company(query: ScreenerQuery, period_end: date) -> dict[int, tuple]:
+    company_field = _company_field(query)
+    rows = _metric_queryset(query, period_end).values_list(
+        f"{company_field}_id", "filing_id", "value"
+    )
+    return {company_id: (filing_id, value) for company_id, filing_id, value in rows}
+
+
+def _one_year_before(value: date) -> date:
+    try:
+        return value.replace(year=value.year - 1)
+    except ValueError:
+        return value.replace(year=value.year - 1, day=28)
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+from django.db import connection
+from django.utils.html import escape, strip_tags
+from django.utils.safestring import mark_safe
+
+from .models import Fact
+
+FACT_SEARCH_TABLE = "reports_fact_search"
+SNIPPET_START = "\x02"
+SNIPPET_END = "\x03"
+INDEX_BATCH_SIZE = 500
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+@dataclass
+class FactSearchHit:
+    fact: Fact
+    rank: float
+    name_html: str
+    snippet_html: str
+
+
+def search_supported() -> bool:
+    return connection.vendor in ("sqlite", "postgresql")
+
+
+def search_text(value: str | None) -> str:
+    """Bentuk teks nilai fakta untuk indeks: tag HTML textBlock dibuang."""
+    if not value:
+        return ""
+    if "<" in value:
+        value = strip_tags(value)
+    return " ".join(value.split())
+
+
+def index_filing_facts(filing_id: int) -> int:
+    """Masukkan seluruh fakta milik filing ke indeks full-text."""
+    if not search_supported():
+        return 0
+    fact_rows = (
+        Fact.objects.filter(filing_id=filing_id)
+        .order_by()
+        .values_list("id", "name", "value")
+        .iterator(chunk_size=INDEX_BATCH_SIZE)
+    )
+    if connection.vendor == "sqlite":
+        sql = (
+            f"INSERT INTO {FACT_SEARCH_TABLE} (rowid, name, value_text, filing_id) "
+            "VALUES (%s, %s, %s, %s)"
+        )
+    else:
+        sql = (
+            f"INSERT INTO {FACT_SEARCH_TABLE} (fact_id, name, value_text, filing_id) "
+            "VALUES (%s, %s, %s, %s)"
+        )
+
+    indexed = 0
+    batch = []
+    with connection.cursor() as cursor:
+        for fact_id, name, value in fact_rows:
+            batch.append((fact_id, name, search_text(value), filing_id))
+            if len(batch) >= INDEX_BATCH_SIZE:
+                cursor.executemany(sql, batch)
+                indexed += len(batch)
+                batch = []
+        if batch:
+            cursor.executemany(sql, batch)
+            indexed += len(batch)
+    return indexed
+
+
+def remove_filing_facts(filing_id: int) -> None:
+    """Hapus entri indeks milik filing; dipanggil sebelum fakta dihapus."""
+    if not search_supported():
+        return
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            cursor.execute(
+                f"DELETE FROM {FACT_SEARCH_TABLE} WHERE rowid IN "
+                "(SELECT id FROM reports_fact WHERE filing_id = %s)",
+                [filing_id],
+            )
+        else:
+            cursor.execute(
+                f"DELETE FROM {FACT_SEARCH_TABLE} WHERE filing_id = %s", [filing_id]
+            )
+
+
+def search_filing_facts(
+    filing_id: int, query: str, limit: int, offset: int = 0
+) -> list[FactSearchHit]:
+    """Cari fakta dalam satu filing, diurutkan berdasarkan relevansi."""
+    terms = _TOKEN_RE.findall(query.lower())
+    if not terms or not search_supported():
+        return []
+
+    if connection.vendor == "sqlite":
+        # Token filing_id ikut di MATCH sehingga FTS5 memotong doclist per filing;
+        # bobot bm25 kolom filing_id nol agar tidak memengaruhi relevansi.
+        match = "filing_id : {} AND {{name value_text}} : ({})".format(
+            int(filing_id), " ".join(f'"{term}"*' for term in terms)
+        )
+        sql = (
+            "SELECT rowid, bm25({table}, 1.0, 1.0, 0.0) AS rank, "
+            "highlight({table}, 0, %s, %s), "
+            "snippet({table}, 1, %s, %s, '...', 16) "
+            "FROM {table} WHERE {table} MATCH %s "
+            "ORDER BY rank LIMIT %s OFFSET %s"
+        ).format(table=FACT_SEARCH_TABLE)
+        params = [
+            SNIPPET_START,
+            SNIPPET_END,
+            SNIPPET_START,
+            SNIPPET_END,
+            match,
+            limit,
+            offset,
+        ]
+    else:
+        match = " & ".join(f"{term}:*" for term in terms)
+        headline_options = (
+            f"StartSel={SNIPPET_START}, StopSel={SNIPPET_END}, MaxFragments=1, MaxWords=24"
+        )
+        sql = (
+            "SELECT fact_id, -ts_rank(document, query) AS rank, "
+            "ts_headline('simple', name, query, %s), "
+            "ts_headline('simple', value_text, query, %s) "
+            "FROM {table}, to_tsquery('simple', %s) query "
+            "WHERE filing_id = %s AND document @@ query "
+            "ORDER BY rank LIMIT %s OFFSET %s"
+        ).format(table=FACT_SEARCH_TABLE)
+        params = [headline_options, headline_options, match, filing_id, limit, offset]
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+
+    facts = Fact.objects.select_related("context").in_bulk([row[0] for row in rows])
+    hits = []
+    for fact_id, rank, name_marked, snippet_marked in rows:
+        fact = facts.get(fact_id)
+        if fact is None:
+            continue
+        hits.append(
+            FactSearchHit(
+                fact=fact,
+                rank=rank,
+                name_html=_mark_html(name_marked),
+                snippet_html=_mark_html(snippet_marked),
+            )
+        )
+    return hits
+
+
+def _mark_html(text: str | None) -> str:
+    escaped = str(escape(text or ""))
+    return mark_safe(
+        escaped.replace(SNIPPET_START, "<mark>").replace(SNIPPET_END, "</mark>")
+    )
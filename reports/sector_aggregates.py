@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date
+from itertools import groupby
+from typing import Iterable
+
+import numpy as np
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Company, ConceptValue, SectorAggregate
+
+CONCEPT_BATCH_SIZE = 500
+WRITE_BATCH_SIZE = 1000
+QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+STAT_FIELDS = [
+    "count",
+    "total",
+    "min_value",
+    "max_value",
+    "median",
+    "p10",
+    "p25",
+    "p75",
+    "p90",
+    "updated_at",
+]
+
+# (sektor, subsektor, industri, subindustri)
+HierarchyPath = tuple[str, str, str, str]
+# (level, sektor, subsektor, industri, subindustri); level di bawah node dikosongkan.
+HierarchyNode = tuple[str, str, str, str, str]
+AggregateKey = tuple[str, date, date]
+
+
+def company_path(company: Company) -> HierarchyPath:
+    return (company.sector, company.subsector, company.industry, company.subindustry)
+
+
+def aggregate_keys(filing_id: int | None = None, company_id: int | None = None) -> set[AggregateKey]:
+    """Pasangan (konsep, awal, akhir periode) milik satu filing atau satu emiten."""
+    queryset = ConceptValue.objects.all()
+    if filing_id is not None:
+        queryset = queryset.filter(filing_id=filing_id)
+    if company_id is not None:
+        queryset = queryset.filter(company_id=company_id)
+    return set(queryset.order_by().values_list("concept", "period_start", "period_end"))
+
+
+def update_filing_aggregates(filing, previous_path: HierarchyPath | None = None) -> int:
+    """Perbarui agregat sektor setelah nilai konsep sebuah filing disimpan.
+
+    Bila klasifikasi emiten berubah, node lama dan baru dihitung ulang untuk
+    seluruh periode emiten tersebut.
+    """
+    path = company_path(Company.objects.get(pk=filing.company_id))
+    if previous_path is not None and previous_path != path:
+        keys = aggregate_keys(company_id=filing.company_id)
+        return refresh_sector_aggregates(previous_path, keys) + refresh_sector_aggregates(
+            path, keys
+        )
+    return refresh_sector_aggregates(path, aggregate_keys(filing_id=filing.pk))
+
+
+def refresh_sector_aggregates(path: HierarchyPath, keys: Iterable[AggregateKey]) -> int:
+    """Hitung ulang node hierarki satu emiten untuk kunci yang diberikan.
+
+    Nilai seluruh anggota sektor dibaca sekali dari ConceptValue, lalu setiap
+    level (sektor hingga subindustri) dihitung dari hasil baca yang sama.
+    """
+    nodes = _hierarchy_nodes(path)
+    keys = set(keys)
+    if not nodes or not keys:
+        return 0
+
+    written = 0
+    concepts = sorted({key[0] for key in keys})
+    for start in range(0, len(concepts), CONCEPT_BATCH_SIZE):
+        batch = set(concepts[start : start + CONCEPT_BATCH_SIZE])
+        batch_keys = {key for key in keys if key[0] in batch}
+        rows = (
+            ConceptValue.objects.filter(
+                company__sector=path[0],
+                concept__in=batch,
+                period_end__in={key[2] for key in batch_keys},
+            )
+            .order_by()
+            .values_list(
+                "concept",
+                "period_start",
+                "period_end",
+                "company__sector",
+                "company__subsector",
+                "company__industry",
+                "company__subindustry",
+                "value",
+            )
+            .iterator(chunk_size=5000)
+        )
+        grouped: dict[tuple[HierarchyNode, AggregateKey], list[float]] = defaultdict(list)
+        for concept, period_start, period_end, *member_path, value in rows:
+            key = (concept, period_start, period_end)
+            if key not in batch_keys:
+                continue
+            for node in nodes:
+                if _contains(node, member_path):
+                    grouped[(node, key)].append(value)
+
+        aggregates = [_build_aggregate(node, key, values) for (node, key), values in grouped.items()]
+        SectorAggregate.objects.bulk_create(
+            aggregates,
+            batch_size=WRITE_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=[
+                "level",
+                "sector",
+                "subsector",
+                "industry",
+                "subindustry",
+                "concept",
+                "period_start",
+                "period_end",
+            ],
+            update_fields=STAT_FIELDS,
+        )
+        written += len(aggregates)
+
+        for node in nodes:
+            empty = {key for key in batch_keys if (node, key) not in grouped}
+            if empty:
+                _delete_node_keys(node, empty)
+    return written
+
+
+@transaction.atomic
+def rebuild_sector_aggregates() -> int:
+    """Isi ulang seluruh agregat dengan satu pemindaian ConceptValue terurut.
+
+    Hapus dan isi ulang berada dalam satu transaksi sehingga pembaca tidak
+    pernah melihat tabel agregat kosong atau terisi sebagian.
+    """
+    SectorAggregate.objects.all().delete()
+    rows = (
+        ConceptValue.objects.exclude(company__sector="")
+        .order_by("concept", "period_end", "period_start")
+        .values_list(
+            "concept",
+            "period_start",
+            "period_end",
+            "company__sector",
+            "company__subsector",
+            "company__industry",
+            "company__subindustry",
+            "value",
+        )
+        .iterator(chunk_size=5000)
+    )
+    pending: list[SectorAggregate] = []
+    total = 0
+    for key, group in groupby(rows, key=lambda row: row[:3]):
+        grouped: dict[HierarchyNode, list[float]] = defaultdict(list)
+        for *_, sector, subsector, industry, subindustry, value in group:
+            for node in _hierarchy_nodes((sector, subsector, industry, subindustry)):
+                grouped[node].append(value)
+        pending.extend(_build_aggregate(node, key, values) for node, values in grouped.items())
+        if len(pending) >= WRITE_BATCH_SIZE:
+            SectorAggregate.objects.bulk_create(pending, batch_size=WRITE_BATCH_SIZE)
+            total += len(pending)
+            pending = []
+    SectorAggregate.objects.bulk_create(pending, batch_size=WRITE_BATCH_SIZE)
+    return total + len(pending)
+
+
+def _hierarchy_nodes(path: HierarchyPath) -> list[HierarchyNode]:
+    nodes = []
+    for depth, level in enumerate(SectorAggregate.LEVELS, start=1):
+        if not path[depth - 1]:
+            break
+        fields = tuple(path[:depth]) + ("",) * (len(path) - depth)
+        nodes.append((level,) + fields)
+    return nodes
+
+
+def _contains(node: HierarchyNode, member_path) -> bool:
+    depth = SectorAggregate.LEVELS.index(node[0]) + 1
+    return tuple(member_path[:depth]) == node[1 : depth + 1]
+
+
+def _build_aggregate(node: HierarchyNode, key: AggregateKey, values: list[float]) -> SectorAggregate:
+    level, sector, subsector, industry, subindustry = node
+    array = np.asarray(values, dtype=np.float64)
+    p10, p25, p50, p75, p90 = np.quantile(array, QUANTILES)
+    return SectorAggregate(
+        level=level,
+        sector=sector,
+        subsector=subsector,
+        industry=industry,
+        subindustry=subindustry,
+        concept=key[0],
+        period_start=key[1],
+        period_end=key[2],
+        count=int(array.size),
+        total=float(array.sum()),
+        min_value=float(array.min()),
+        max_value=float(array.max()),
+        median=float(p50),
+        p10=float(p10),
+        p25=float(p25),
+        p75=float(p75),
+        p90=float(p90),
+        updated_at=timezone.now(),
+    )
+
+
+def _delete_node_keys(node: HierarchyNode, keys: set[AggregateKey]) -> None:
+    level, sector, subsector, industry, subindustry = node
+    candidates = SectorAggregate.objects.filter(
+        level=level,
+        sector=sector,
+        subsector=subsector,
+        industry=industry,
+        subindustry=subindustry,
+        concept__in={key[0] for key in keys},
+    ).values_list("id", "concept", "period_start", "period_end")
+    stale = [pk for pk, *key in candidates if tuple(key) in keys]
+    if stale:
+        SectorAggregate.objects.filter(id__in=stale).delete()
@@ -2,11 +2,25 @@ from __future__ import annotations
 
 from typing import Iterable
 
-from django.db import transaction
+from django.db import connection, transaction
 from django.utils import timezone
 
-from .models import Company, Context, Fact, Filing
+from .catalog import add_facts_to_catalog, remove_filing_from_catalog
+from .concept_values import index_filing_values
+from .fact_cache import invalidate_filing
+from .file_cleanup import enqueue_file_deletion, schedule_file_cleanup
+from .metrics import FACTS_INGESTED, INGEST_STAGE_SECONDS, UPLOAD_FAILURES
+from .models import Company, ConceptValue, Context, Fact, Filing, RatioValue
 from .parser import ParsedContext, ParsedFact, ParsedResult, XBRLParser
+from .search import index_filing_facts, remove_filing_facts
+from .sector_aggregates import (
+    aggregate_keys,
+    company_path,
+    refresh_sector_aggregates,
+    update_filing_aggregates,
+)
+from .site_stats import refresh_company_stats
+from .warmup import warm_company_async
 
 
 class UploadConflictError(Exception):
@@ -21,8 +35,23 @@ class UploadResult:
 
 
 def ingest_xbrl(file_obj, overwrite: bool = False) -> UploadResult:
-    parser = XBRLParser(file_obj)
-    parsed = parser.parse()
+    try:
+        with INGEST_STAGE_SECONDS.time(stage="total"):
+            result = _ingest_xbrl(file_obj, overwrite)
+    except Exception as exc:
+        UPLOAD_FAILURES.inc(exception=type(exc).__name__)
+        raise
+    FACTS_INGESTED.inc(result.fact_count)
+    company_id = result.filing.company_id
+    transaction.on_commit(lambda: warm_company_async(company_id))
+    schedule_file_cleanup()
+    return result
+
+
+def _ingest_xbrl(file_obj, overwrite: bool) -> UploadResult:
+    with INGEST_STAGE_SECONDS.time(stage="parse"):
+        parser = XBRLParser(file_obj)
+        parsed = parser.parse()
 
     if not parsed.facts:
         raise ValueError("File XBRL tidak memiliki fakta keuangan yang dapat diproses.")
@@ -41,6 +70,7 @@ def ingest_xbrl(file_obj, overwrite: bool = False) -> UploadResult:
             "subindustry": parsed.subindustry or "",
         },
     )
+    previous_path = company_path(company)
     if not created:
         updated_fields = {}
         if parsed.entity_code and parsed.entity_code != company.entity_code:
@@ -74,7 +104,7 @@ def ingest_xbrl(file_obj, overwrite: bool = False) -> UploadResult:
 
     with transaction.atomic():
         if existing:
-            existing.delete()
+            delete_filing(existing)
 
         file_obj.seek(0)
         filing = Filing.objects.create(
@@ -90,12 +120,73 @@ def ingest_xbrl(file_obj, overwrite: bool = False) -> UploadResult:
             uploaded_at=timezone.now(),
         )
 
-        context_lookup = _persist_contexts(filing, parsed.contexts)
-        fact_count = _persist_facts(filing, parsed.facts, context_lookup)
+        with INGEST_STAGE_SECONDS.time(stage="contexts"):
+            context_lookup = _persist_contexts(filing, parsed.contexts)
+        with INGEST_STAGE_SECONDS.time(stage="facts"):
+            fact_count = _persist_facts(filing, parsed.facts, context_lookup)
+        with INGEST_STAGE_SECONDS.time(stage="search_index"):
+            index_filing_facts(filing.pk)
+        with INGEST_STAGE_SECONDS.time(stage="catalog"):
+            add_facts_to_catalog(parsed.facts)
+        with INGEST_STAGE_SECONDS.time(stage="concept_values"):
+            index_filing_values(filing, parsed.facts, context_lookup)
+        with INGEST_STAGE_SECONDS.time(stage="sector_aggregates"):
+            update_filing_aggregates(filing, previous_path)
+        refresh_company_stats(company.pk)
 
     return UploadResult(filing=filing, fact_count=fact_count, context_count=len(context_lookup))
 
 
+def delete_filing(filing: Filing) -> None:
+    """Hapus filing beserta data turunannya; file XBRL masuk antrean pembersihan.
+
+    Fakta dan konteks dihapus dengan satu DELETE berbasis set per tabel
+    sebelum `filing.delete()`, sehingga collector Django tidak perlu memuat
+    dan meng-update (SET_NULL) ratusan ribu baris satu per satu. Semuanya
+    tetap satu transaksi; cache fakta baru dibuang setelah commit.
+    """
+    with transaction.atomic():
+        aggregate_path = company_path(filing.company)
+        keys = aggregate_keys(filing_id=filing.pk)
+        remove_filing_facts(filing.pk)
+        remove_filing_from_catalog(filing.pk)
+        filing_id = filing.pk
+        transaction.on_commit(lambda: invalidate_filing(filing_id))
+        _purge_filing_rows(filing.pk)
+        filing.delete()
+        enqueue_file_deletion(filing.xbrl_file.name)
+        refresh_sector_aggregates(aggregate_path, keys)
+        refresh_company_stats(filing.company_id)
+
+
+def delete_filings(filing_ids: Iterable[int]) -> int:
+    """Hapus banyak filing; satu transaksi per filing agar lock tidak tertahan lama."""
+    deleted = 0
+    for filing in Filing.objects.select_related("company").filter(pk__in=list(filing_ids)):
+        delete_filing(filing)
+        deleted += 1
+    schedule_file_cleanup()
+    return deleted
+
+
+def delete_company(company: Company) -> None:
+    """Hapus emiten lewat `delete_filings` agar indeks, katalog, dan agregat ikut dibersihkan."""
+    delete_filings(Filing.objects.filter(company=company).values_list("pk", flat=True))
+    company.delete()
+
+
+def _purge_filing_rows(filing_id: int) -> None:
+    # Fakta lebih dulu karena mereferensikan konteks.
+    with connection.cursor() as cursor:
+        for model in (Fact, Context):
+            cursor.execute(
+                f"DELETE FROM {connection.ops.quote_name(model._meta.db_table)} WHERE filing_id = %s",
+                [filing_id],
+            )
+    ConceptValue.objects.filter(filing_id=filing_id).delete()
+    RatioValue.objects.filter(filing_id=filing_id).delete()
+
+
 def _persist_contexts(
     filing: Filing, parsed_contexts: Iterable[ParsedContext]
 ) -> dict[str, Context]:
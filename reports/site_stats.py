@@ -0,0 +1,78 @@
+"""Statistik turunan: counter situs dan ringkasan filing per emiten.
+
+Counter (`SiteCounter`) diperbarui lewat sinyal `post_save`/`post_delete`
+di dalam transaksi yang sama dengan perubahan datanya, sehingga juga
+benar untuk perubahan dari admin dan restore snapshot. Ringkasan per
+emiten dihitung ulang dari filing emiten tersebut setiap kali ada
+ingest atau hapus filing.
+"""
+
+from __future__ import annotations
+
+from django.db import transaction
+from django.db.models import F, Max, Min
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_delete, post_save
+
+from .models import Company, Filing, ReportTemplate, SiteCounter
+
+COUNTED_MODELS = {
+    Company: SiteCounter.COMPANIES,
+    Filing: SiteCounter.FILINGS,
+    ReportTemplate: SiteCounter.TEMPLATES,
+}
+
+
+def refresh_company_stats(company_id: int) -> None:
+    """Hitung ulang filing terbaru, jumlah filing, dan rentang periode satu emiten."""
+    filings = Filing.objects.filter(company_id=company_id)
+    summary = filings.annotate(period=Coalesce("period_end", "instant_date")).aggregate(
+        first_period_end=Min("period"),
+        last_period_end=Max("period"),
+    )
+    latest = filings.order_by("-uploaded_at", "-id").values_list("id", flat=True).first()
+    Company.objects.filter(pk=company_id).update(
+        latest_filing_id=latest,
+        filing_count=filings.count(),
+        **summary,
+    )
+
+
+def adjust_counter(name: str, delta: int) -> None:
+    updated = SiteCounter.objects.filter(name=name).update(value=F("value") + delta)
+    if not updated:
+        SiteCounter.objects.create(name=name, value=_source_count(name))
+
+
+@transaction.atomic
+def repair_statistics() -> dict[str, int]:
+    """Hitung ulang semua counter dan ringkasan emiten dari tabel sumber."""
+    counters = {}
+    for name in SiteCounter.NAMES:
+        counters[name] = _source_count(name)
+        SiteCounter.objects.update_or_create(name=name, defaults={"value": counters[name]})
+    for company_id in Company.objects.values_list("id", flat=True).iterator():
+        refresh_company_stats(company_id)
+    return counters
+
+
+def _source_count(name: str) -> int:
+    model = next(model for model, counter in COUNTED_MODELS.items() if counter == name)
+    return model.objects.count()
+
+
+def _on_save(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        adjust_counter(COUNTED_MODELS[sender], 1)
+
+
+def _on_delete(sender, instance, **kwargs):
+    adjust_counter(COUNTED_MODELS[sender], -1)
+
+
+def connect_signals() -> None:
+    for model in COUNTED_MODELS:
+        post_save.connect(_on_save, sender=model, dispatch_uid=f"site_counter_save_{model.__name__}")
+        post_delete.connect(
+            _on_delete, sender=model, dispatch_uid=f"site_counter_delete_{model.__name__}"
+        )
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import hashlib
+import time
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+
+from .models import SlowQuery
+from .query_budget import fingerprint
+
+DEFAULT_THRESHOLD_MS = 100.0
+DEFAULT_BUFFER_SIZE = 1000
+SHAPE_MAX_LENGTH = 255
+
+
+@dataclass
+class CapturedQuery:
+    alias: str
+    sql: str
+    params: object
+    many: bool
+    duration_ms: float
+
+
+@dataclass
+class SlowQueryCapture:
+    """Execute wrapper yang hanya menyimpan query di atas ambang durasi.
+
+    Di jalur cepat hanya ada dua pembacaan `perf_counter` dan satu
+    perbandingan; normalisasi, EXPLAIN, dan penulisan ke database ditunda
+    sampai `store_slow_queries` dipanggil di luar wrapper.
+    """
+
+    threshold: float
+    captured: list[CapturedQuery] = field(default_factory=list)
+
+    def wrapper(self, alias: str):
+        def capture(execute, sql, params, many, context):
+            started = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                elapsed = time.perf_counter() - started
+                if elapsed >= self.threshold:
+                    self.captured.append(CapturedQuery(alias, sql, params, many, elapsed * 1000))
+
+        return capture
+
+
+def threshold_ms() -> float:
+    return getattr(settings, "SLOW_QUERY_THRESHOLD_MS", DEFAULT_THRESHOLD_MS)
+
+
+@contextmanager
+def capture_slow_queries(threshold: float | None = None):
+    """Tangkap query lambat di semua alias database selama blok berjalan."""
+    capture = SlowQueryCapture((threshold_ms() if threshold is None else threshold) / 1000)
+    with ExitStack() as stack:
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(capture.wrapper(alias)))
+        yield capture
+
+
+def store_slow_queries(
+    captured: list[CapturedQuery],
+    method: str = "",
+    path: str = "",
+    view_name: str = "",
+) -> int:
+    """Simpan query yang tertangkap beserta rencana EXPLAIN ke ring buffer."""
+    if not captured:
+        return 0
+    explain_enabled = getattr(settings, "SLOW_QUERY_EXPLAIN", True)
+    rows = []
+    for query in captured:
+        normalized = fingerprint(query.sql)
+        rows.append(
+            SlowQuery(
+                fingerprint=hashlib.sha1(normalized.encode("utf-8")).hexdigest(),
+                sql=normalized,
+                params_shape=params_shape(query.params, query.many),
+                duration_ms=query.duration_ms,
+                database=query.alias,
+                method=method,
+                path=path[:512],
+                view_name=view_name or "",
+                explain=explain_query(query) if explain_enabled else "",
+            )
+        )
+    try:
+        SlowQuery.objects.bulk_create(rows)
+        trim_slow_queries()
+    except DatabaseError:
+        # Penangkapan query lambat tidak boleh menggagalkan request.
+        return 0
+    return len(rows)
+
+
+def trim_slow_queries(size: int | None = None) -> int:
+    """Pertahankan hanya `size` entri terbaru (ring buffer)."""
+    if size is None:
+        size = getattr(settings, "SLOW_QUERY_BUFFER_SIZE", DEFAULT_BUFFER_SIZE)
+    boundary = SlowQuery.objects.order_by("-id").values_list("id", flat=True)[size : size + 1]
+    boundary = list(boundary)
+    if not boundary:
+        return 0
+    deleted, _ = SlowQuery.objects.filter(id__lte=boundary[0]).delete()
+    return deleted
+
+
+def explain_query(query: CapturedQuery) -> str:
+    """Rencana eksekusi dari backend; hanya untuk SELECT agar aman dijalankan ulang."""
+    if query.many or not query.sql.lstrip().upper().startswith(("SELECT", "WITH")):
+        return ""
+    connection = connections[query.alias]
+    prefix = "EXPLAIN QUERY PLAN " if connection.vendor == "sqlite" else "EXPLAIN "
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(prefix + query.sql, query.params)
+            rows = cursor.fetchall()
+    except DatabaseError as exc:
+        return f"EXPLAIN gagal: {exc}"
+    return "\n".join(" | ".join(str(value) for value in row) for row in rows)
+
+
+def params_shape(params, many: bool = False) -> str:
+    """Ringkasan tipe parameter tanpa nilainya, mis. `(int, str, int×120)`."""
+    if params is None:
+        return ""
+    if many:
+        rows = list(params) if not isinstance(params, (list, tuple)) else params
+        inner = params_shape(rows[0]) if rows else "()"
+        return f"{len(rows)}× {inner}"[:SHAPE_MAX_LENGTH]
+    if isinstance(params, dict):
+        items = [f"{key}: {type(value).__name__}" for key, value in params.items()]
+        return "{" + ", ".join(items)[:SHAPE_MAX_LENGTH - 2] + "}"
+
+    parts: list[list] = []
+    for value in params:
+        name = type(value).__name__
+        if parts and parts[-1][0] == name:
+            parts[-1][1] += 1
+        else:
+            parts.append([name, 1])
+    text = ", ".join(name if count == 1 else f"{name}×{count}" for name, count in parts)
+    return f"({text})"[:SHAPE_MAX_LENGTH]
@@ -0,0 +1,480 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from itertools import groupby
+from pathlib import Path
+from typing import Iterable
+
+import pyarrow as pa
+from django.db import connection, connections, transaction
+from django.utils import timezone
+
+from .catalog import add_facts_to_catalog
+from .concept_values import reindex_filing_values
+from .file_cleanup import schedule_file_cleanup
+from .models import Company, Context, Fact, Filing
+from .parser import ParsedFact
+from .ratios import compute_filing_ratios
+from .search import index_filing_facts
+from .sector_aggregates import (
+    aggregate_keys,
+    company_path,
+    refresh_sector_aggregates,
+    update_filing_aggregates,
+)
+from .services import delete_filing
+from .site_stats import refresh_company_stats
+
+# Versi 2: chunk Arrow IPC (sebelumnya marshal, yang bergantung versi Python).
+SNAPSHOT_VERSION = 2
+MANIFEST_NAME = "manifest.json"
+COMPRESSION = "zstd"
+INSERT_BATCH_SIZE = 5000
+
+COMPANY_FIELDS = (
+    "ticker",
+    "name",
+    "entity_code",
+    "entity_name",
+    "entity_main_industry",
+    "sector",
+    "subsector",
+    "industry",
+    "subindustry",
+)
+FILING_FIELDS = (
+    "period_label",
+    "period_start",
+    "period_end",
+    "instant_date",
+    "context_reference",
+    "document_type",
+    "source_filename",
+    "xbrl_file",
+    "uploaded_at",
+)
+CONTEXT_FIELDS = (
+    "context_id",
+    "entity_identifier",
+    "start_date",
+    "end_date",
+    "instant_date",
+    "period_type",
+)
+FACT_FIELDS = ("name", "namespace", "value", "decimals", "unit", "order")
+
+CONTEXT_SCHEMA = pa.schema(
+    [
+        ("context_id", pa.string()),
+        ("entity_identifier", pa.string()),
+        ("start_date", pa.date32()),
+        ("end_date", pa.date32()),
+        ("instant_date", pa.date32()),
+        ("period_type", pa.string()),
+    ]
+)
+FACT_SCHEMA = pa.schema(
+    [
+        # Posisi context di tabel context chunk yang sama (null bila tanpa context).
+        ("context", pa.int32()),
+        ("name", pa.string()),
+        ("namespace", pa.string()),
+        ("value", pa.large_string()),
+        ("decimals", pa.string()),
+        ("unit", pa.string()),
+        ("order", pa.int64()),
+    ]
+)
+
+
+@dataclass
+class SnapshotResult:
+    filings: int = 0
+    facts: int = 0
+    skipped: int = 0
+    filing_ids: list[int] = field(default_factory=list)
+
+    def add(self, other: "SnapshotResult") -> None:
+        self.filings += other.filings
+        self.facts += other.facts
+        self.skipped += other.skipped
+        self.filing_ids.extend(other.filing_ids)
+
+
+def dump_snapshot(
+    output_dir: str | Path,
+    tickers: Iterable[str] | None = None,
+    periods: Iterable[str] | None = None,
+) -> SnapshotResult:
+    """Tulis snapshot: dua file Arrow IPC (context dan fakta) per filing dan satu manifest.
+
+    Arrow IPC berformat tetap lintas versi Python dan dibaca tanpa
+    mengeksekusi kode, sehingga snapshot aman dipindahkan antar mesin.
+    Restore cukup membaca kolom lalu melakukan insert massal.
+    """
+    root = Path(output_dir)
+    (root / "filings").mkdir(parents=True, exist_ok=True)
+    filings = _filter_filings(Filing.objects.select_related("company"), tickers, periods)
+
+    result = SnapshotResult()
+    chunks = []
+    company_ids = set()
+    for filing in filings.order_by("company__ticker", "period_label", "id").iterator():
+        contexts, facts = _filing_tables(filing)
+        prefix = f"filings/{filing.company.ticker}-{filing.pk}"
+        chunks.append(
+            {
+                "ticker": filing.company.ticker,
+                "period_label": filing.period_label,
+                "filing": _filing_row(filing),
+                "contexts": _write_table(root, f"{prefix}.contexts.arrow", contexts),
+                "facts": _write_table(root, f"{prefix}.facts.arrow", facts),
+            }
+        )
+        company_ids.add(filing.company_id)
+        result.filings += 1
+        result.facts += facts.num_rows
+
+    manifest = {
+        "version": SNAPSHOT_VERSION,
+        "created_at": timezone.now().isoformat(),
+        "filters": {"tickers": sorted(tickers or []), "periods": sorted(periods or [])},
+        "companies": [
+            dict(zip(COMPANY_FIELDS, row))
+            for row in Company.objects.filter(id__in=company_ids)
+            .order_by("ticker")
+            .values_list(*COMPANY_FIELDS)
+        ],
+        "chunks": chunks,
+    }
+    (root / MANIFEST_NAME).write_text(json.dumps(manifest, indent=1), encoding="utf-8")
+    return result
+
+
+def restore_snapshot(
+    input_dir: str | Path,
+    tickers: Iterable[str] | None = None,
+    periods: Iterable[str] | None = None,
+    workers: int = 1,
+    replace: bool = False,
+    skip_derived: bool = False,
+) -> SnapshotResult:
+    """Pulihkan snapshot, opsional hanya untuk emiten/periode tertentu.
+
+    Dengan `workers` > 1 chunk dibagi per emiten ke beberapa proses yang hanya
+    menyisipkan baris milik filing masing-masing; penghapusan (`replace`) dan
+    data turunan yang dipakai bersama (katalog konsep, agregat sektor, rasio,
+    statistik emiten) dikerjakan serial oleh proses induk agar worker tidak
+    saling berebut baris. SQLite tidak mendukung penulisan paralel sehingga
+    selalu dipulihkan dalam satu proses, dengan data turunan diperbarui
+    inkremental per filing.
+    """
+    root = Path(input_dir)
+    manifest = json.loads((root / MANIFEST_NAME).read_text(encoding="utf-8"))
+    if manifest.get("version") != SNAPSHOT_VERSION:
+        raise ValueError("Versi snapshot tidak didukung.")
+
+    ticker_filter = {ticker.upper() for ticker in tickers or []}
+    period_filter = set(periods or [])
+    chunks = [
+        chunk
+        for chunk in manifest["chunks"]
+        if (not ticker_filter or chunk["ticker"] in ticker_filter)
+        and (not period_filter or chunk["period_label"] in period_filter)
+    ]
+    _restore_companies(
+        [row for row in manifest["companies"] if row["ticker"] in {c["ticker"] for c in chunks}],
+        skip_derived,
+    )
+
+    result = SnapshotResult()
+    if connection.vendor == "sqlite":
+        workers = 1
+    if workers > 1 and len(chunks) > 1:
+        chunks, result.skipped = _claim_chunks(chunks, replace)
+        shards = [
+            (str(root), shard, False, skip_derived, True)
+            for shard in _shard_by_company(chunks, workers)
+            if shard
+        ]
+        # Koneksi induk ditutup agar setiap proses hasil fork membuka koneksinya sendiri.
+        connections.close_all()
+        context = multiprocessing.get_context("fork")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            for shard_result in pool.map(_restore_shard, shards):
+                result.add(shard_result)
+        _update_derived(result.filing_ids, skip_derived)
+    else:
+        result.add(_restore_shard((str(root), chunks, replace, skip_derived, False)))
+
+    if replace:
+        schedule_file_cleanup()
+    return result
+
+
+def _filter_filings(queryset, tickers, periods):
+    if tickers:
+        queryset = queryset.filter(company__ticker__in=[ticker.upper() for ticker in tickers])
+    if periods:
+        queryset = queryset.filter(period_label__in=list(periods))
+    return queryset
+
+
+def _filing_row(filing: Filing) -> dict:
+    return {
+        field: filing.xbrl_file.name if field == "xbrl_file" else _encode(getattr(filing, field))
+        for field in FILING_FIELDS
+    }
+
+
+def _filing_tables(filing: Filing) -> tuple[pa.Table, pa.Table]:
+    contexts = {field: [] for field in CONTEXT_FIELDS}
+    context_positions = {}
+    for pk, *values in (
+        Context.objects.filter(filing=filing).order_by("id").values_list("id", *CONTEXT_FIELDS)
+    ):
+        context_positions[pk] = len(context_positions)
+        for field, value in zip(CONTEXT_FIELDS, values):
+            contexts[field].append(value)
+
+    facts = {field: [] for field in ("context",) + FACT_FIELDS}
+    rows = (
+        Fact.objects.filter(filing=filing)
+        .order_by("order", "id")
+        .values_list("context_id", *FACT_FIELDS)
+        .iterator(chunk_size=5000)
+    )
+    for context_pk, *values in rows:
+        facts["context"].append(context_positions.get(context_pk))
+        for field, value in zip(FACT_FIELDS, values):
+            facts[field].append(value)
+    return (
+        pa.Table.from_pydict(contexts, schema=CONTEXT_SCHEMA),
+        pa.Table.from_pydict(facts, schema=FACT_SCHEMA),
+    )
+
+
+def _write_table(root: Path, name: str, table: pa.Table) -> dict:
+    sink = pa.BufferOutputStream()
+    options = pa.ipc.IpcWriteOptions(compression=COMPRESSION)
+    with pa.ipc.new_file(sink, table.schema, options=options) as writer:
+        writer.write_table(table)
+    data = sink.getvalue().to_pybytes()
+    (root / name).write_bytes(data)
+    return {"file": name, "rows": table.num_rows, "sha256": hashlib.sha256(data).hexdigest()}
+
+
+def _read_table(root: Path, entry: dict, schema: pa.Schema) -> dict[str, list]:
+    data = (root / entry["file"]).read_bytes()
+    if hashlib.sha256(data).hexdigest() != entry["sha256"]:
+        raise ValueError(f"Checksum chunk {entry['file']} tidak cocok.")
+    table = pa.ipc.open_file(pa.BufferReader(data)).read_all()
+    if not table.schema.equals(schema):
+        raise ValueError(f"Skema chunk {entry['file']} tidak sesuai.")
+    return table.to_pydict()
+
+
+def _restore_companies(rows: list[dict], skip_derived: bool) -> None:
+    existing = Company.objects.in_bulk([row["ticker"] for row in rows], field_name="ticker")
+    for row in rows:
+        company = existing.get(row["ticker"])
+        if company is None:
+            Company.objects.create(**row)
+            continue
+        previous_path = company_path(company)
+        Company.objects.filter(pk=company.pk).update(**row)
+        company.refresh_from_db()
+        if not skip_derived and company_path(company) != previous_path:
+            # Klasifikasi berubah: node lama dan baru dihitung ulang untuk seluruh periode emiten.
+            keys = aggregate_keys(company_id=company.pk)
+            refresh_sector_aggregates(previous_path, keys)
+            refresh_sector_aggregates(company_path(company), keys)
+
+
+def _claim_chunks(chunks: list[dict], replace: bool) -> tuple[list[dict], int]:
+    """Sebelum restore paralel: lewati atau hapus (`replace`) filing yang sudah ada."""
+    companies = dict(Company.objects.values_list("ticker", "id"))
+    existing = {
+        (filing.company_id, filing.period_label): filing
+        for filing in Filing.objects.select_related("company").filter(
+            company_id__in={companies[chunk["ticker"]] for chunk in chunks}
+        )
+    }
+    claimed = []
+    skipped = 0
+    for chunk in chunks:
+        filing = existing.get((companies[chunk["ticker"]], chunk["period_label"]))
+        if filing is not None:
+            if not replace:
+                skipped += 1
+                continue
+            delete_filing(filing)
+        claimed.append(chunk)
+    return claimed, skipped
+
+
+def _shard_by_company(chunks: list[dict], workers: int) -> list[list[dict]]:
+    """Bagi chunk per emiten agar filing satu emiten tidak dipulihkan dua worker sekaligus."""
+    shards: list[list[dict]] = [[] for _ in range(workers)]
+    groups = [
+        list(group)
+        for _, group in groupby(
+            sorted(chunks, key=lambda chunk: chunk["ticker"]), key=lambda chunk: chunk["ticker"]
+        )
+    ]
+    for group in sorted(groups, key=len, reverse=True):
+        min(shards, key=len).extend(group)
+    return shards
+
+
+def _restore_shard(args: tuple[str, list[dict], bool, bool, bool]) -> SnapshotResult:
+    root, chunks, replace, skip_derived, defer_derived = args
+    root_path = Path(root)
+    companies = dict(Company.objects.values_list("ticker", "id"))
+    result = SnapshotResult()
+    for chunk in chunks:
+        payload = {
+            "filing": chunk["filing"],
+            "contexts": _read_table(root_path, chunk["contexts"], CONTEXT_SCHEMA),
+            "facts": _read_table(root_path, chunk["facts"], FACT_SCHEMA),
+        }
+        restored = _restore_filing(
+            companies[chunk["ticker"]], payload, replace, skip_derived, defer_derived
+        )
+        if restored is None:
+            result.skipped += 1
+        else:
+            result.filings += 1
+            result.facts += restored[1]
+            result.filing_ids.append(restored[0])
+    if defer_derived:
+        connection.close()
+    return result
+
+
+def _restore_filing(
+    company_id: int,
+    payload: dict,
+    replace: bool,
+    skip_derived: bool = False,
+    defer_derived: bool = False,
+) -> tuple[int, int] | None:
+    """Pulihkan satu filing; mengembalikan (id filing, jumlah fakta) atau None bila dilewati.
+
+    Dengan `defer_derived` hanya baris milik filing ini yang ditulis; katalog,
+    agregat, rasio, dan statistik emiten diperbarui kemudian oleh `_update_derived`.
+    """
+    filing_row = payload["filing"]
+    with transaction.atomic():
+        existing = Filing.objects.filter(
+            company_id=company_id, period_label=filing_row["period_label"]
+        ).first()
+        if existing:
+            if not replace:
+                return None
+            delete_filing(existing)
+
+        filing = Filing(company_id=company_id)
+        for field in FILING_FIELDS:
+            setattr(filing, field, _decode(field, filing_row[field]))
+        filing.save()
+        # uploaded_at memakai auto_now_add; kembalikan nilai asli dari snapshot.
+        Filing.objects.filter(pk=filing.pk).update(
+            uploaded_at=_decode("uploaded_at", filing_row["uploaded_at"])
+        )
+
+        contexts = payload["contexts"]
+        context_objects = Context.objects.bulk_create(
+            [
+                Context(filing=filing, **dict(zip(CONTEXT_FIELDS, row)))
+                for row in zip(*(contexts[field] for field in CONTEXT_FIELDS))
+            ],
+            batch_size=INSERT_BATCH_SIZE,
+        )
+        context_pks = [context.pk for context in context_objects]
+
+        facts = payload["facts"]
+        rows = (
+            (filing.pk, None if position is None else context_pks[position], *values)
+            for position, *values in zip(facts["context"], *(facts[field] for field in FACT_FIELDS))
+        )
+        fact_count = _insert_facts(rows)
+        index_filing_facts(filing.pk)
+        reindex_filing_values(filing)
+        if defer_derived:
+            return filing.pk, fact_count
+        if not skip_derived:
+            add_facts_to_catalog(
+                ParsedFact(name, namespace, value, None, None, None)
+                for name, namespace, value in zip(facts["name"], facts["namespace"], facts["value"])
+            )
+            update_filing_aggregates(filing)
+            compute_filing_ratios([filing.pk])
+        refresh_company_stats(company_id)
+    return filing.pk, fact_count
+
+
+def _update_derived(filing_ids: list[int], skip_derived: bool) -> None:
+    """Perbarui data turunan bersama secara serial setelah semua worker selesai."""
+    filings = list(Filing.objects.filter(pk__in=filing_ids).order_by("company_id", "id"))
+    for filing in filings:
+        with transaction.atomic():
+            if not skip_derived:
+                add_facts_to_catalog(
+                    ParsedFact(name, namespace, value, None, None, None)
+                    for name, namespace, value in Fact.objects.filter(filing=filing)
+                    .order_by("order", "id")
+                    .values_list("name", "namespace", "value")
+                    .iterator(chunk_size=INSERT_BATCH_SIZE)
+                )
+                update_filing_aggregates(filing)
+    if not skip_derived:
+        compute_filing_ratios([filing.pk for filing in filings])
+    for company_id in sorted({filing.company_id for filing in filings}):
+        refresh_company_stats(company_id)
+
+
+def _insert_facts(rows) -> int:
+    """Insert fakta dengan executemany langsung, melewati pembuatan objek model."""
+    quote = connection.ops.quote_name
+    columns = [Fact._meta.get_field(field).column for field in ("filing", "context") + FACT_FIELDS]
+    sql = "INSERT INTO {} ({}) VALUES ({})".format(
+        quote(Fact._meta.db_table),
+        ", ".join(quote(column) for column in columns),
+        ", ".join(["%s"] * len(columns)),
+    )
+    total = 0
+    batch = []
+    with connection.cursor() as cursor:
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= INSERT_BATCH_SIZE:
+                cursor.executemany(sql, batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            cursor.executemany(sql, batch)
+            total += len(batch)
+    return total
+
+
+def _encode(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _decode(field: str, value):
+    if value is None:
+        return None
+    if field == "uploaded_at":
+        return datetime.fromisoformat(value)
+    if field.endswith("_date") or field in ("period_start", "period_end"):
+        return date.fromisoformat(value)
+    return value
+
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from datetime import date
+from io import BytesIO
+from typing import IO
+from xml.sax.saxutils import escape
+
+XBRLI_NS = "http://www.xbrl.org/2003/instance"
+XBRLDI_NS = "http://xbrl.org/2006/xbrldi"
+ISO4217_NS = "http://www.xbrl.org/2003/iso4217"
+COR_NS = "http://www.idx.co.id/xbrl/taxonomy/2020-01-01/cor"
+DEI_NS = "http://www.idx.co.id/xbrl/taxonomy/2020-01-01/dei"
+
+# Konsep inti yang dipakai template dan rasio bawaan; selalu muncul di konteks utama.
+CORE_CONCEPTS = (
+    "CashAndCashEquivalents",
+    "Currentassets",
+    "Assets",
+    "Currentliabilities",
+    "Liabilities",
+    "Equity",
+    "Salesandrevenue",
+    "Totalgrossprofit",
+    "ProfitLoss",
+)
+CONCEPT_STEMS = (
+    "TradeReceivables",
+    "OtherReceivables",
+    "Inventories",
+    "PrepaidExpenses",
+    "PropertyPlantAndEquipment",
+    "IntangibleAssets",
+    "DeferredTaxAssets",
+    "TradePayables",
+    "AccruedExpenses",
+    "ShortTermBankLoans",
+    "LongTermBankLoans",
+    "EmployeeBenefitsObligations",
+    "CostOfSalesAndRevenue",
+    "SellingExpenses",
+    "GeneralAndAdministrativeExpenses",
+    "FinanceIncome",
+    "FinanceCosts",
+    "IncomeTaxExpense",
+    "DividendsPaid",
+    "PaymentsForAcquisitionOfPropertyPlantAndEquipment",
+)
+QUALIFIERS = ("ThirdParties", "RelatedParties", "Current", "NonCurrent", "Gross", "Net")
+DIMENSIONS = (
+    ("SegmentAxis", ("Banking", "Consumer", "Mining", "Property", "Infrastructure")),
+    ("GeographicalAxis", ("Jawa", "Sumatera", "Kalimantan", "Sulawesi", "Overseas")),
+    ("RelatedPartyAxis", ("Parent", "Subsidiary", "Associate", "KeyManagement")),
+    ("CurrencyAxis", ("IDR", "USD", "SGD", "JPY")),
+)
+TEXT_BLOCK_EVERY = 25
+WORDS = (
+    "perusahaan",
+    "laporan",
+    "keuangan",
+    "konsolidasian",
+    "entitas",
+    "anak",
+    "kebijakan",
+    "akuntansi",
+    "signifikan",
+    "pengukuran",
+    "nilai",
+    "wajar",
+    "aset",
+    "liabilitas",
+    "periode",
+    "berjalan",
+)
+
+
+@dataclass
+class SyntheticSpec:
+    fact_count: int = 1000
+    context_count: int = 8
+    dimension_depth: int = 1
+    text_block_size: int = 2000
+    ticker: str = "SYNT"
+    period_end: date = date(2024, 12, 31)
+    sector: str = "Keuangan"
+    subsector: str = "Bank"
+    industry: str = "Bank"
+    subindustry: str = "Bank"
+    seed: int = 0
+
+
+def generate_instance(spec: SyntheticSpec) -> BytesIO:
+    """Instance XBRL sintetis di memori, siap untuk `XBRLParser`/`ingest_xbrl`."""
+    buffer = BytesIO()
+    write_instance(buffer, spec)
+    buffer.seek(0)
+    buffer.name = f"{spec.ticker}-{spec.period_end.isoformat()}-{spec.fact_count}.xbrl"
+    return buffer
+
+
+def write_instance(output: IO[bytes], spec: SyntheticSpec) -> int:
+    """Tulis instance XBRL bergaya IDX secara bertahap; hasil identik untuk seed yang sama.
+
+    Empat konteks pertama adalah tahun berjalan/lalu (durasi dan instan);
+    sisanya konteks berdimensi dengan `dimension_depth` explicit member.
+    Setiap konsep ke-TEXT_BLOCK_EVERY adalah textBlock sepanjang
+    `text_block_size` karakter. Mengembalikan jumlah fakta yang ditulis.
+    """
+    rng = random.Random(spec.seed)
+    contexts = _contexts(spec, rng)
+    concepts = _concepts(spec.fact_count, len(contexts))
+
+    def write(text: str) -> None:
+        output.write(text.encode("utf-8"))
+
+    write(
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        f'<xbrli:xbrl xmlns:xbrli="{XBRLI_NS}" xmlns:xbrldi="{XBRLDI_NS}" '
+        f'xmlns:iso4217="{ISO4217_NS}" xmlns:idx-cor="{COR_NS}" xmlns:idx-dei="{DEI_NS}">\n'
+    )
+    for context_id, period, members in contexts:
+        write(_context_xml(spec.ticker, context_id, period, members))
+    write(
+        '  <xbrli:unit id="IDR"><xbrli:measure>iso4217:IDR</xbrli:measure></xbrli:unit>\n'
+        '  <xbrli:unit id="Shares"><xbrli:measure>xbrli:shares</xbrli:measure></xbrli:unit>\n'
+    )
+
+    current = contexts[0][0]
+    period_start = date(spec.period_end.year, 1, 1)
+    dei = (
+        ("EntityCode", spec.ticker),
+        ("EntityName", f"PT {spec.ticker.title()} Sintetis Tbk"),
+        ("EntityMainIndustry", spec.industry),
+        ("Sector", spec.sector),
+        ("Subsector", spec.subsector),
+        ("Industry", spec.industry),
+        ("Subindustry", spec.subindustry),
+        ("DocumentPeriodStartDate", period_start.isoformat()),
+        ("DocumentPeriodEndDate", spec.period_end.isoformat()),
+    )
+    for name, value in dei:
+        write(f'  <idx-dei:{name} contextRef="{current}">{escape(value)}</idx-dei:{name}>\n')
+
+    written = 0
+    for position in range(spec.fact_count):
+        concept = concepts[position // len(contexts)]
+        context_id = contexts[position % len(contexts)][0]
+        if concept.endswith("TextBlock"):
+            value = escape(_text_block(rng, spec.text_block_size))
+            write(f'  <idx-cor:{concept} contextRef="{context_id}">{value}</idx-cor:{concept}>\n')
+        else:
+            value = rng.randrange(-10**9, 10**13) if rng.random() < 0.1 else rng.randrange(10**6, 10**13)
+            write(
+                f'  <idx-cor:{concept} contextRef="{context_id}" unitRef="IDR" decimals="-6">'
+                f"{value}</idx-cor:{concept}>\n"
+            )
+        written += 1
+    write("</xbrli:xbrl>\n")
+    return written
+
+
+def _contexts(spec: SyntheticSpec, rng: random.Random) -> list[tuple[str, tuple, tuple]]:
+    end = spec.period_end
+    try:
+        prior_end = end.replace(year=end.year - 1)
+    except ValueError:
+        prior_end = end.replace(year=end.year - 1, day=28)
+    base = [
+        ("CurrentYearDuration", (date(end.year, 1, 1), end), ()),
+        ("CurrentYearInstant", (end,), ()),
+        ("PriorEndYearDuration", (date(prior_end.year, 1, 1), prior_end), ()),
+        ("PriorEndYearInstant", (prior_end,), ()),
+    ]
+    contexts = base[: max(spec.context_count, 1)]
+    depth = max(0, min(spec.dimension_depth, len(DIMENSIONS)))
+    for position in range(len(contexts), spec.context_count):
+        period = base[position % len(base)][1]
+        members = tuple(
+            (axis, rng.choice(values)) for axis, values in DIMENSIONS[:depth]
+        )
+        contexts.append((f"{base[position % len(base)][0]}_D{position}", period, members))
+    return contexts
+
+
+def _concepts(fact_count: int, context_count: int) -> list[str]:
+    needed = -(-fact_count // context_count)
+    concepts = list(CORE_CONCEPTS[:needed])
+    position = 0
+    while len(concepts) < needed:
+        stem = CONCEPT_STEMS[position % len(CONCEPT_STEMS)]
+        qualifier = QUALIFIERS[(position // len(CONCEPT_STEMS)) % len(QUALIFIERS)]
+        suffix = position // (len(CONCEPT_STEMS) * len(QUALIFIERS))
+        name = f"{stem}{qualifier}{suffix or ''}"
+        if len(concepts) % TEXT_BLOCK_EVERY == TEXT_BLOCK_EVERY - 1:
+            name = f"{stem}Policy{position}TextBlock"
+        concepts.append(name)
+        position += 1
+    return concepts
+
+
+def _context_xml(ticker: str, context_id: str, period: tuple, members: tuple) -> str:
+    segment = ""
+    if members:
+        explicit = "".join(
+            f'<xbrldi:explicitMember dimension="idx-cor:{axis}">idx-cor:{member}Member</xbrldi:explicitMember>'
+            for axis, member in members
+        )
+        segment = f"<xbrli:segment>{explicit}</xbrli:segment>"
+    if len(period) == 2:
+        period_xml = (
+            f"<xbrli:startDate>{period[0].isoformat()}</xbrli:startDate>"
+            f"<xbrli:endDate>{period[1].isoformat()}</xbrli:endDate>"
+        )
+    else:
+        period_xml = f"<xbrli:instant>{period[0].isoformat()}</xbrli:instant>"
+    return (
+        f'  <xbrli:context id="{context_id}"><xbrli:entity>'
+        f'<xbrli:identifier scheme="http://www.idx.co.id">{ticker}</xbrli:identifier>{segment}'
+        f"</xbrli:entity><xbrli:period>{period_xml}</xbrli:period></xbrli:context>\n"
+    )
+
+
+def _text_block(rng: random.Random, size: int) -> str:
+    parts = ["<p>"]
+    length = 3
+    while length < size:
+        word = rng.choice(WORDS)
+        parts.append(word + " ")
+        length += len(word) + 1
+    parts.append("</p>")
+    return "".join(parts)[: max(size, 7)]
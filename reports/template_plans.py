@@ -0,0 +1,85 @@
+"""Template laporan yang sudah dikompilasi, di-memo per proses.
+
+Kunci memo adalah pk template plus `items_changed_at`, yang diperbarui
+sinyal setiap kali item template disimpan atau dihapus. Template yang
+sudah dimuat view cukup dibandingkan kolomnya, tanpa query tambahan.
+`bulk_create` dan `QuerySet.update()` tidak memicu sinyal; kode yang
+mengubah item lewat jalur itu wajib memanggil `touch_template`.
+"""
+
+from __future__ import annotations
+
+import threading
+
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+from .fact_cache import LookupFact
+from .models import ReportTemplate, TemplateItem
+
+_plans: dict[int, tuple] = {}
+_lock = threading.Lock()
+
+
+class TemplatePlan:
+    """Template yang sudah dikompilasi: kode lowercase per item dan gabungan konsep."""
+
+    def __init__(self, template: ReportTemplate) -> None:
+        self.template = template
+        self.items: list[tuple[TemplateItem, list[str]]] = []
+        self.concepts: set[str] = set()
+        for item in template.items.all():
+            codes = [code.lower() for code in [item.primary_fact] + item.fallback_list()]
+            self.items.append((item, codes))
+            self.concepts.update(codes)
+
+    def resolve(self, fact_lookup: dict[str, LookupFact]) -> list[LookupFact | None]:
+        resolved = []
+        for _, codes in self.items:
+            fact = None
+            for code in codes:
+                fact = fact_lookup.get(code)
+                if fact:
+                    break
+            resolved.append(fact)
+        return resolved
+
+
+def compile_template_plan(template: ReportTemplate) -> TemplatePlan:
+    version = template.items_changed_at
+    with _lock:
+        cached = _plans.get(template.pk)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    plan = TemplatePlan(template)
+    with _lock:
+        _plans[template.pk] = (version, plan)
+    return plan
+
+
+def clear_template_plans() -> None:
+    with _lock:
+        _plans.clear()
+
+
+def touch_template(template: ReportTemplate) -> None:
+    """Tandai item template berubah sehingga plan yang di-memo dikompilasi ulang."""
+    template.items_changed_at = timezone.now()
+    ReportTemplate.objects.filter(pk=template.pk).update(
+        items_changed_at=template.items_changed_at
+    )
+
+
+def _touch_template(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    ReportTemplate.objects.filter(pk=instance.template_id).update(
+        items_changed_at=timezone.now()
+    )
+
+
+def connect_signals() -> None:
+    post_save.connect(_touch_template, sender=TemplateItem, dispatch_uid="template_plan_item_save")
+    post_delete.connect(
+        _touch_template, sender=TemplateItem, dispatch_uid="template_plan_item_delete"
+    )
@@ -0,0 +1,76 @@
+"""Utilitas pengujian untuk menjaga batas query per view.
+
+Contoh (lihat juga `reports/tests/test_query_budgets.py`)::
+
+    class FilingDetailQueryTests(QueryBudgetMixin, TestCase):
+        def test_budget(self):
+            self.client.force_login(self.user)
+            self.assertQueryBudget("filing_detail", kwargs={"pk": self.filing.pk}, max_queries=6)
+
+Bila `max_queries` tidak diberikan, batas diambil dari `settings.QUERY_BUDGETS`
+berdasarkan nama URL, sama dengan yang dipakai `QueryBudgetMiddleware`.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.test import Client
+from django.urls import reverse
+
+from .query_budget import QueryRecorder, record_queries
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@contextmanager
+def query_budget(max_queries: int, max_duplicates: int | None = None, using: str | None = None):
+    """Gagal bila blok menjalankan lebih dari `max_queries` query atau terlalu banyak duplikat."""
+    with record_queries(using) as recorder:
+        yield recorder
+    check_budget(recorder, max_queries, max_duplicates)
+
+
+def check_budget(recorder: QueryRecorder, max_queries: int, max_duplicates: int | None = None) -> None:
+    problems = []
+    if recorder.count > max_queries:
+        problems.append(f"{recorder.count} query, batas {max_queries}")
+    if max_duplicates is not None and recorder.duplicate_count > max_duplicates:
+        problems.append(f"{recorder.duplicate_count} query duplikat, batas {max_duplicates}")
+    if not problems:
+        return
+    details = "\n".join(
+        f"  {count}x {sql}" for sql, count in recorder.duplicates[:10]
+    ) or "\n".join(f"  {item['count']}x {item['sql']}" for item in recorder.summary(10))
+    raise QueryBudgetExceeded("; ".join(problems) + "\n" + details)
+
+
+def assert_view_query_budget(
+    client: Client,
+    view_name: str,
+    max_queries: int | None = None,
+    max_duplicates: int | None = 0,
+    kwargs: dict | None = None,
+    data: dict | None = None,
+):
+    """Panggil view lewat test client dan pastikan query-nya tetap dalam batas."""
+    if max_queries is None:
+        try:
+            max_queries = settings.QUERY_BUDGETS[view_name]
+        except (AttributeError, KeyError):
+            raise ValueError(f"Tidak ada batas query untuk view {view_name}.") from None
+    with query_budget(max_queries, max_duplicates):
+        response = client.get(reverse(view_name, kwargs=kwargs), data)
+    return response
+
+
+class QueryBudgetMixin:
+    """Mixin untuk `django.test.TestCase`."""
+
+    def assertQueryBudget(self, view_name: str, max_queries: int | None = None, **options):
+        response = assert_view_query_budget(self.client, view_name, max_queries, **options)
+        self.assertLess(response.status_code, 400)
+        return response
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import shutil
+import tempfile
+from dataclasses import replace
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.core.files import File
+from django.test import TestCase, override_settings
+
+from reports.models import Filing, ReportTemplate, TemplateItem
+from reports.services import ingest_xbrl
+from reports.synthetic import SyntheticSpec, generate_instance
+from reports.template_plans import clear_template_plans, touch_template
+
+SMALL_SPEC = SyntheticSpec(fact_count=120, context_count=4, text_block_size=200)
+BALANCE_SHEET_ITEMS = (
+    ("Kas dan setara kas", "CashAndCashEquivalents", ""),
+    ("Jumlah aset lancar", "Currentassets", ""),
+    ("Jumlah aset", "Assets", ""),
+    ("Jumlah liabilitas", "Liabilities", "Currentliabilities"),
+    ("Jumlah ekuitas", "Equity", ""),
+)
+
+
+class ReportsTestCase(TestCase):
+    """Basis pengujian: file dan cache di direktori sementara, tanpa thread latar."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls._media_root = tempfile.mkdtemp(prefix="lapxbrl-test-")
+        cls._isolated_settings = override_settings(
+            MEDIA_ROOT=cls._media_root,
+            METRICS_ENABLED=False,
+            FACT_CACHE_ENABLED=False,
+            CACHE_WARMUP_ON_START=False,
+            CACHE_WARMUP_AFTER_INGEST=False,
+            FILE_CLEANUP_ON_COMMIT=False,
+            QUERY_BUDGET_ENABLED=False,
+            SLOW_QUERY_CAPTURE_ENABLED=False,
+            PROFILING_ENABLED=False,
+        )
+        cls._isolated_settings.enable()
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls._isolated_settings.disable()
+        shutil.rmtree(cls._media_root, ignore_errors=True)
+
+    def setUp(self):
+        super().setUp()
+        clear_template_plans()
+
+    @staticmethod
+    def create_user(username: str = "admin"):
+        return get_user_model().objects.create_user(username, password="rahasia", is_staff=True)
+
+    @staticmethod
+    def ingest(spec: SyntheticSpec = SMALL_SPEC, overwrite: bool = False, **changes) -> Filing:
+        instance = generate_instance(replace(spec, **changes))
+        return ingest_xbrl(File(instance, name=instance.name), overwrite=overwrite).filing
+
+    @classmethod
+    def ingest_year(cls, ticker: str, year: int, **changes) -> Filing:
+        return cls.ingest(ticker=ticker, period_end=date(year, 12, 31), **changes)
+
+    @staticmethod
+    def create_balance_sheet_template() -> ReportTemplate:
+        template = ReportTemplate.objects.create(name="Laporan Posisi Keuangan", slug="neraca")
+        TemplateItem.objects.bulk_create(
+            TemplateItem(
+                template=template,
+                label=label,
+                primary_fact=primary,
+                fallback_facts=fallback,
+                order=position,
+            )
+            for position, (label, primary, fallback) in enumerate(BALANCE_SHEET_ITEMS)
+        )
+        touch_template(template)
+        return template
@@ -0,0 +1,48 @@
+from unittest import mock
+
+from reports.catalog import add_facts_to_catalog, remove_filing_from_catalog
+from reports.models import Concept
+from reports.parser import ParsedFact
+
+from .base import ReportsTestCase
+
+
+def parsed(name: str, value: str = "1") -> ParsedFact:
+    return ParsedFact(name, "idx-cor", value, "c0", "IDR", "0")
+
+
+class ConceptCatalogTests(ReportsTestCase):
+    def test_counts_accumulate_per_filing(self):
+        add_facts_to_catalog([parsed("Assets", ""), parsed("Assets", "10"), parsed("Equity")])
+        add_facts_to_catalog([parsed("ASSETS", "20")])
+
+        assets = Concept.objects.get(name_lower="assets")
+        self.assertEqual((assets.name, assets.fact_count, assets.filing_count), ("Assets", 3, 2))
+        self.assertEqual(assets.example_value, "10")
+        self.assertEqual(Concept.objects.get(name_lower="equity").filing_count, 1)
+
+    def test_concept_inserted_concurrently_is_incremented(self):
+        real_bulk_create = Concept.objects.bulk_create
+
+        def racing_bulk_create(objs, *args, **kwargs):
+            # Ingest lain meng-commit konsep yang sama tepat sebelum INSERT ini.
+            Concept.objects.create(name="Assets", name_lower="assets", fact_count=5, filing_count=1)
+            return real_bulk_create(objs, *args, **kwargs)
+
+        with mock.patch.object(Concept.objects, "bulk_create", side_effect=racing_bulk_create):
+            add_facts_to_catalog([parsed("Assets"), parsed("Equity")])
+
+        assets = Concept.objects.get(name_lower="assets")
+        self.assertEqual((assets.fact_count, assets.filing_count), (6, 2))
+        self.assertEqual(Concept.objects.get(name_lower="equity").fact_count, 1)
+
+    def test_remove_filing_drops_empty_concepts(self):
+        first = self.ingest_year("AAAA", 2024)
+        self.ingest_year("AAAA", 2023)
+        assets = Concept.objects.get(name_lower="assets")
+        self.assertEqual(assets.filing_count, 2)
+
+        remove_filing_from_catalog(first.pk)
+        assets.refresh_from_db()
+        self.assertEqual(assets.filing_count, 1)
+        self.assertEqual(assets.fact_count, first.facts.filter(name="Assets").count())
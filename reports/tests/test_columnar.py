@@ -0,0 +1,82 @@
+import shutil
+import tempfile
+from datetime import date
+from pathlib import Path
+
+import pyarrow.dataset as ds
+
+from reports.columnar import _filing_path, export_columnar
+from reports.models import Fact, Filing
+from reports.services import delete_filing
+
+from .base import ReportsTestCase
+
+
+class ColumnarExportTests(ReportsTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.first = cls.ingest_year("AAAA", 2023)
+        cls.second = cls.ingest_year("AAAA", 2024)
+        cls.other = cls.ingest_year("BBBB", 2024)
+
+    def setUp(self):
+        super().setUp()
+        self.root = Path(tempfile.mkdtemp(prefix="lapxbrl-columnar-"))
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+
+    def dataset_rows(self, table: str = "facts") -> int:
+        return ds.dataset(self.root / table, format="parquet", partitioning="hive").count_rows()
+
+    def partition_files(self) -> set[str]:
+        return {
+            str(path.relative_to(self.root)) for path in (self.root / "facts").rglob("*.parquet")
+        }
+
+    def test_incremental_export(self):
+        result = export_columnar(self.root)
+        self.assertEqual((result.exported, result.removed, result.unchanged), (3, 0, 0))
+        self.assertEqual(result.fact_rows, Fact.objects.count())
+        self.assertEqual(self.dataset_rows(), Fact.objects.count())
+        self.assertEqual(
+            self.partition_files(),
+            {
+                f"facts/year=2023/filing-{self.first.pk}.parquet",
+                f"facts/year=2024/filing-{self.second.pk}.parquet",
+                f"facts/year=2024/filing-{self.other.pk}.parquet",
+            },
+        )
+
+        result = export_columnar(self.root)
+        self.assertEqual((result.exported, result.removed, result.unchanged), (0, 0, 3))
+
+    def test_deleted_and_moved_filings_leave_no_files(self):
+        export_columnar(self.root)
+        delete_filing(Filing.objects.get(pk=self.first.pk))
+        # Periode dikoreksi ke tahun lain: file pindah partisi.
+        Filing.objects.filter(pk=self.other.pk).update(period_end=date(2025, 3, 31))
+
+        result = export_columnar(self.root)
+        self.assertEqual((result.exported, result.removed, result.unchanged), (1, 1, 1))
+        self.assertEqual(
+            self.partition_files(),
+            {
+                f"facts/year=2024/filing-{self.second.pk}.parquet",
+                f"facts/year=2025/filing-{self.other.pk}.parquet",
+            },
+        )
+        self.assertEqual(self.dataset_rows(), Fact.objects.count())
+        self.assertEqual(self.dataset_rows("contexts"), self.second.contexts.count() * 2)
+
+    def test_full_export_removes_stale_partitions(self):
+        export_columnar(self.root)
+        # Sisa run yang terputus sebelum manifest disimpan.
+        stale = _filing_path(self.root, "facts", 2019, "999999")
+        stale.parent.mkdir(parents=True)
+        shutil.copy(_filing_path(self.root, "facts", 2024, str(self.other.pk)), stale)
+        delete_filing(Filing.objects.get(pk=self.first.pk))
+
+        result = export_columnar(self.root, full=True)
+        self.assertEqual((result.exported, result.removed, result.unchanged), (2, 1, 0))
+        self.assertFalse(stale.exists())
+        self.assertFalse((self.root / "facts" / "year=2023").exists())
+        self.assertEqual(self.dataset_rows(), Fact.objects.count())
@@ -0,0 +1,137 @@
+from django.core.files.storage import default_storage
+from django.db import connection
+from django.urls import reverse
+
+from reports.file_cleanup import process_file_cleanup, process_file_cleanup_async
+from reports.models import (
+    Company,
+    Concept,
+    ConceptValue,
+    Context,
+    Fact,
+    Filing,
+    PendingFileDeletion,
+    RatioValue,
+    SectorAggregate,
+    SiteCounter,
+)
+from reports.ratios import compute_ratios
+from reports.search import FACT_SEARCH_TABLE, search_supported
+from reports.sector_aggregates import rebuild_sector_aggregates
+from reports.services import delete_company, delete_filing, delete_filings
+
+from .base import ReportsTestCase
+
+
+class DeleteFilingTests(ReportsTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.old = cls.ingest_year("AAAA", 2023)
+        cls.filing = cls.ingest_year("AAAA", 2024, seed=1)
+        cls.other = cls.ingest_year("BBBB", 2024, seed=2)
+        compute_ratios(full=True)
+        cls.company = Company.objects.get(ticker="AAAA")
+        cls.user = cls.create_user()
+
+    def search_rows(self, filing_id: int) -> int:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT COUNT(*) FROM {FACT_SEARCH_TABLE} WHERE filing_id = %s", [filing_id]
+            )
+            return cursor.fetchone()[0]
+
+    def aggregate_rows(self) -> list[tuple]:
+        return list(
+            SectorAggregate.objects.order_by("level", "concept", "period_start", "period_end", "sector")
+            .values_list(
+                "level", "sector", "concept", "period_start", "period_end", "count", "total", "median"
+            )
+        )
+
+    def assertFilingPurged(self, filing_id: int):
+        for model in (Fact, Context, ConceptValue, RatioValue):
+            with self.subTest(model=model.__name__):
+                self.assertFalse(model.objects.filter(filing_id=filing_id).exists())
+        self.assertFalse(Filing.objects.filter(pk=filing_id).exists())
+        if search_supported():
+            self.assertEqual(self.search_rows(filing_id), 0)
+
+    def test_delete_filing_removes_derived_rows(self):
+        filing_id = self.filing.pk
+        other_facts = self.other.facts.count()
+        self.assertGreater(Fact.objects.filter(filing_id=filing_id).count(), 0)
+
+        delete_filing(Filing.objects.get(pk=filing_id))
+
+        self.assertFilingPurged(filing_id)
+        self.assertEqual(self.other.facts.count(), other_facts)
+        if search_supported():
+            self.assertEqual(self.search_rows(self.other.pk), other_facts)
+
+    def test_delete_filing_updates_catalog_and_statistics(self):
+        concept = Concept.objects.get(name_lower="assets")
+        filings_before = SiteCounter.values()[SiteCounter.FILINGS]
+
+        delete_filing(Filing.objects.get(pk=self.filing.pk))
+
+        concept.refresh_from_db()
+        self.assertEqual(concept.filing_count, 2)
+        self.assertEqual(SiteCounter.values()[SiteCounter.FILINGS], filings_before - 1)
+        self.company.refresh_from_db()
+        self.assertEqual(self.company.latest_filing_id, self.old.pk)
+        self.assertEqual(self.company.filing_count, 1)
+        self.assertEqual(self.company.last_period_end, self.old.period_end)
+
+        incremental = self.aggregate_rows()
+        self.assertTrue(incremental)
+        rebuild_sector_aggregates()
+        self.assertEqual(incremental, self.aggregate_rows())
+
+    def test_file_is_removed_by_cleanup_queue(self):
+        name = self.filing.xbrl_file.name
+        self.assertTrue(default_storage.exists(name))
+
+        delete_filing(Filing.objects.get(pk=self.filing.pk))
+
+        self.assertEqual(list(PendingFileDeletion.objects.values_list("name", flat=True)), [name])
+        self.assertTrue(default_storage.exists(name))
+        result = process_file_cleanup()
+        self.assertEqual(result.deleted, 1)
+        self.assertFalse(default_storage.exists(name))
+        self.assertFalse(PendingFileDeletion.objects.exists())
+
+    def test_delete_filings_schedules_cleanup_once(self):
+        with self.settings(FILE_CLEANUP_ON_COMMIT=True):
+            with self.captureOnCommitCallbacks() as callbacks:
+                deleted = delete_filings([self.old.pk, self.filing.pk, 0])
+
+        self.assertEqual(deleted, 2)
+        self.assertEqual(callbacks.count(process_file_cleanup_async), 1)
+        self.assertFilingPurged(self.old.pk)
+        self.assertFilingPurged(self.filing.pk)
+        self.assertEqual(PendingFileDeletion.objects.count(), 2)
+        self.company.refresh_from_db()
+        self.assertIsNone(self.company.latest_filing_id)
+        self.assertEqual(self.company.filing_count, 0)
+        self.assertTrue(Filing.objects.filter(pk=self.other.pk).exists())
+
+    def test_delete_company(self):
+        filing_ids = [self.old.pk, self.filing.pk]
+        delete_company(self.company)
+
+        self.assertFalse(Company.objects.filter(ticker="AAAA").exists())
+        for filing_id in filing_ids:
+            self.assertFilingPurged(filing_id)
+        self.assertEqual(SiteCounter.values()[SiteCounter.COMPANIES], 1)
+
+    def test_dashboard_delete_views(self):
+        self.client.force_login(self.user)
+        response = self.client.post(reverse("delete_filing", kwargs={"pk": self.filing.pk}))
+        self.assertRedirects(response, reverse("upload_xbrl"))
+        self.assertFilingPurged(self.filing.pk)
+
+        response = self.client.post(
+            reverse("bulk_delete_filings"), {"filing_ids": [str(self.old.pk), str(self.other.pk)]}
+        )
+        self.assertRedirects(response, reverse("upload_xbrl"))
+        self.assertFalse(Filing.objects.exists())
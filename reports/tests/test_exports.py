@@ -0,0 +1,66 @@
+import io
+import re
+import zipfile
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from reports import exports
+
+
+class StreamXlsxTests(SimpleTestCase):
+    def workbook(self, rows, header=("Nama", "Nilai"), sheet_name="Data") -> zipfile.ZipFile:
+        content = b"".join(exports.stream_xlsx(header, rows, sheet_name=sheet_name))
+        archive = zipfile.ZipFile(io.BytesIO(content))
+        self.assertIsNone(archive.testzip())
+        return archive
+
+    def sheet_rows(self, archive: zipfile.ZipFile, number: int) -> list[str]:
+        xml = archive.read(f"xl/worksheets/sheet{number}.xml").decode("utf-8")
+        return re.findall(r'<t xml:space="preserve">([^<]*)</t>', xml)
+
+    def test_single_sheet(self):
+        archive = self.workbook([("a", 1), ("b", 2)])
+        self.assertNotIn("xl/worksheets/sheet2.xml", archive.namelist())
+        self.assertEqual(self.sheet_rows(archive, 1), ["Nama", "Nilai", "a", "b"])
+        workbook = archive.read("xl/workbook.xml").decode("utf-8")
+        self.assertEqual(re.findall(r'<sheet name="([^"]+)"', workbook), ["Data"])
+
+    def test_empty_rows_keep_header_sheet(self):
+        archive = self.workbook([])
+        self.assertEqual(self.sheet_rows(archive, 1), ["Nama", "Nilai"])
+
+    def test_rows_beyond_limit_roll_over_to_new_sheet(self):
+        rows = [(f"baris-{index}", index) for index in range(7)]
+        with mock.patch.object(exports, "XLSX_MAX_ROWS", 4):
+            archive = self.workbook(iter(rows))
+        names = [f"baris-{index}" for index in range(7)]
+        self.assertEqual(self.sheet_rows(archive, 1), ["Nama", "Nilai"] + names[:3])
+        self.assertEqual(self.sheet_rows(archive, 2), ["Nama", "Nilai"] + names[3:6])
+        self.assertEqual(self.sheet_rows(archive, 3), ["Nama", "Nilai"] + names[6:])
+        self.assertNotIn("xl/worksheets/sheet4.xml", archive.namelist())
+
+        workbook = archive.read("xl/workbook.xml").decode("utf-8")
+        self.assertEqual(
+            re.findall(r'<sheet name="([^"]+)"', workbook), ["Data", "Data (2)", "Data (3)"]
+        )
+        relationships = archive.read("xl/_rels/workbook.xml.rels").decode("utf-8")
+        for number in (1, 2, 3):
+            self.assertIn(f'Target="worksheets/sheet{number}.xml"', relationships)
+            self.assertIn(
+                f'PartName="/xl/worksheets/sheet{number}.xml"',
+                archive.read("[Content_Types].xml").decode("utf-8"),
+            )
+        self.assertIn('Id="rId4"', relationships)
+
+    def test_exact_limit_does_not_add_empty_sheet(self):
+        with mock.patch.object(exports, "XLSX_MAX_ROWS", 4):
+            archive = self.workbook([("a", 1), ("b", 2), ("c", 3)])
+        self.assertNotIn("xl/worksheets/sheet2.xml", archive.namelist())
+
+    def test_rollover_sheet_name_fits_excel_limit(self):
+        with mock.patch.object(exports, "XLSX_MAX_ROWS", 2):
+            archive = self.workbook([("a", 1), ("b", 2)], sheet_name="L" * 40)
+        workbook = archive.read("xl/workbook.xml").decode("utf-8")
+        names = re.findall(r'<sheet name="([^"]+)"', workbook)
+        self.assertEqual(names, ["L" * 31, "L" * 27 + " (2)"])
@@ -0,0 +1,130 @@
+import shutil
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.db import transaction
+
+from reports import fact_cache
+from reports.fact_cache import (
+    MAX_VALUE_CHARS,
+    _MemoryLRU,
+    cached_fact_lookup,
+    filing_fact_maps,
+    filing_key,
+    get_store,
+    load_lookup_facts,
+)
+from reports.models import Fact, Filing
+from reports.services import delete_filing
+
+from .base import ReportsTestCase
+
+
+class FactCacheTests(ReportsTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.filing = cls.ingest_year("AAAA", 2024)
+        cls.other = cls.ingest_year("BBBB", 2024)
+
+    def setUp(self):
+        super().setUp()
+        cache_dir = tempfile.mkdtemp(prefix="lapxbrl-cache-")
+        self.addCleanup(shutil.rmtree, cache_dir, ignore_errors=True)
+        override = self.settings(
+            FACT_CACHE_ENABLED=True, FACT_CACHE_PATH=Path(cache_dir) / "facts.sqlite3"
+        )
+        override.enable()
+        self.addCleanup(override.disable)
+        for name in ("_store", "_memory"):
+            patcher = mock.patch.object(fact_cache, name, None)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def assertCached(self, filing: Filing, cached: bool = True):
+        key = filing_key(filing)
+        self.assertEqual(fact_cache._get_memory().get(key) is not None, cached)
+        self.assertEqual(get_store().get(key) is not None, cached)
+
+    def test_cold_and_warm_lookups_match_database(self):
+        filings = [self.filing, self.other]
+        with self.assertNumQueries(1):
+            cold = filing_fact_maps(filings)
+        with self.assertNumQueries(0):
+            warm = filing_fact_maps(filings)
+        expected = load_lookup_facts([filing.pk for filing in filings])
+        self.assertEqual(cold, expected)
+        self.assertEqual(warm, expected)
+
+        # Proses lain: memori kosong, store SQLite bersama tetap terisi.
+        fact_cache._get_memory().clear()
+        with self.assertNumQueries(0):
+            self.assertEqual(filing_fact_maps(filings), expected)
+
+    def test_concept_subset(self):
+        concepts = {"assets", "equity", "tidakada"}
+        self.assertEqual(
+            cached_fact_lookup(self.filing, concepts),
+            load_lookup_facts([self.filing.pk], concepts)[self.filing.pk],
+        )
+        self.assertEqual(set(cached_fact_lookup(self.filing, concepts)), {"assets", "equity"})
+        self.assertEqual(cached_fact_lookup(None, concepts), {})
+
+    def test_long_values_are_not_cached(self):
+        text_block = self.filing.facts.filter(name__endswith="TextBlock").first()
+        self.assertGreater(len(text_block.value), MAX_VALUE_CHARS)
+        facts = cached_fact_lookup(self.filing)
+        self.assertEqual(facts[text_block.name.lower()].value, "")
+        self.assertNotEqual(facts["assets"].value, "")
+
+    def test_delete_invalidates_after_commit(self):
+        cached_fact_lookup(self.filing)
+        cached_fact_lookup(self.other)
+        filing = Filing.objects.get(pk=self.filing.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            delete_filing(filing)
+        self.assertCached(self.filing, cached=False)
+        self.assertCached(self.other)
+
+    def test_rolled_back_delete_keeps_cache(self):
+        cached_fact_lookup(self.filing)
+        filing = Filing.objects.get(pk=self.filing.pk)
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    delete_filing(filing)
+                    raise RuntimeError("batal")
+            except RuntimeError:
+                pass
+        self.assertEqual(callbacks, [])
+        self.assertTrue(Fact.objects.filter(filing_id=self.filing.pk).exists())
+        self.assertCached(self.filing)
+
+    def test_reupload_serves_new_values(self):
+        before = cached_fact_lookup(self.filing)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            restated = self.ingest_year("AAAA", 2024, overwrite=True, seed=7)
+        self.assertNotEqual(restated.pk, self.filing.pk)
+        self.assertCached(self.filing, cached=False)
+
+        after = cached_fact_lookup(restated)
+        self.assertEqual(after, load_lookup_facts([restated.pk])[restated.pk])
+        self.assertNotEqual(after["assets"], before["assets"])
+
+    def test_memory_lru_is_bounded_by_bytes(self):
+        memory = _MemoryLRU(max_bytes=100)
+        memory.set("1:a", "pertama", 40)
+        memory.set("2:a", "kedua", 40)
+        memory.get("1:a")
+        memory.set("3:a", "ketiga", 40)
+        self.assertEqual(memory.size, 80)
+        self.assertIsNone(memory.get("2:a"))
+        self.assertEqual(memory.get("1:a"), "pertama")
+
+        memory.set("4:a", "terlalu besar", 101)
+        self.assertIsNone(memory.get("4:a"))
+        memory.delete_prefix("1:")
+        self.assertEqual((memory.size, memory.get("1:a")), (40, None))
@@ -0,0 +1,73 @@
+import multiprocessing
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.test import SimpleTestCase
+
+from reports.metrics import DEAD_WORKERS_FILE, Counter, Histogram, MetricsRegistry
+
+
+class MultiProcessMetricsTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix="lapxbrl-metrics-")
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        override = self.settings(METRICS_DIR=self.directory, METRICS_FLUSH_INTERVAL=0)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.registry = MetricsRegistry()
+        self.requests = Counter("test_requests_total", "Request.", ("view",), registry=self.registry)
+        self.latency = Histogram(
+            "test_latency_seconds", "Latensi.", buckets=(0.1, 1.0), registry=self.registry
+        )
+
+    def run_worker(self, requests: int, latency: float) -> None:
+        def work():
+            self.requests.inc(requests, view="home")
+            self.latency.observe(latency)
+            self.registry.flush()
+
+        process = multiprocessing.get_context("fork").Process(target=work)
+        process.start()
+        process.join()
+        self.assertEqual(process.exitcode, 0)
+
+    def totals(self) -> tuple[float, list[float]]:
+        collected = self.registry.collect()
+        return (
+            collected["test_requests_total"][("home",)][0],
+            collected["test_latency_seconds"][()],
+        )
+
+    def test_values_from_processes_are_summed(self):
+        self.requests.inc(2, view="home")
+        self.latency.observe(0.05)
+        self.run_worker(3, 0.5)
+
+        requests, latency = self.totals()
+        self.assertEqual(requests, 5)
+        # Bucket 0.1, 1.0, +Inf, lalu sum dan count.
+        self.assertEqual(latency, [1, 1, 0, 0.55, 2])
+
+    def test_totals_survive_worker_exit(self):
+        self.requests.inc(2, view="home")
+        self.run_worker(3, 0.5)
+        self.assertEqual(self.totals()[0], 5)
+
+        # Worker pertama sudah berhenti; nilainya pindah ke akumulator, bukan hilang.
+        self.run_worker(4, 2.0)
+        requests, latency = self.totals()
+        self.assertEqual(requests, 9)
+        self.assertEqual(latency[-1], 2)
+        self.assertEqual(self.totals()[0], 9)
+
+        files = sorted(path.name for path in Path(self.directory).glob("metrics-*.json"))
+        self.assertIn(DEAD_WORKERS_FILE, files)
+        self.assertEqual(len(files), 2)
+
+        self.requests.inc(1, view="home")
+        self.assertEqual(self.totals()[0], 10)
+        self.assertIn(
+            'test_requests_total{view="home"} 10', self.registry.render().splitlines()
+        )
+
@@ -0,0 +1,92 @@
+from django.urls import reverse
+from django.utils import timezone
+
+from reports.models import Fact, Filing
+from reports.pagination import KeysetPaginator
+
+from .base import ReportsTestCase
+
+
+class KeysetPaginatorTests(ReportsTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.filing = cls.ingest_year("AAAA", 2024)
+        for year in (2019, 2020, 2021, 2022, 2023):
+            cls.ingest_year("BBBB", year)
+        # Waktu upload kembar memaksa urutan ditentukan kolom id.
+        Filing.objects.update(uploaded_at=timezone.now())
+        cls.user = cls.create_user()
+
+    def walk_forward(self, paginator):
+        pages, cursor = [], None
+        while True:
+            page = paginator.get_page(cursor)
+            pages.append(page)
+            if not page.has_next:
+                return pages
+            cursor = page.next_cursor
+
+    def test_forward_pages_cover_queryset_in_order(self):
+        queryset = Fact.objects.filter(filing=self.filing)
+        paginator = KeysetPaginator(queryset, ("order", "id"), per_page=25)
+        pages = self.walk_forward(paginator)
+
+        seen = [fact.pk for page in pages for fact in page]
+        expected = list(queryset.order_by("order", "id").values_list("pk", flat=True))
+        self.assertEqual(seen, expected)
+        self.assertFalse(pages[0].has_previous)
+        self.assertEqual(pages[0].previous_cursor, "")
+        self.assertTrue(all(page.has_previous for page in pages[1:]))
+        self.assertEqual(pages[-1].next_cursor, "")
+
+    def test_previous_cursor_returns_same_page(self):
+        paginator = KeysetPaginator(Filing.objects.all(), ("-uploaded_at", "-id"), per_page=2)
+        pages = self.walk_forward(paginator)
+        self.assertEqual([len(page) for page in pages], [2, 2, 2])
+
+        for position in range(len(pages) - 1, 0, -1):
+            previous = paginator.get_page(pages[position].previous_cursor)
+            self.assertEqual(list(previous), list(pages[position - 1]))
+            self.assertTrue(previous.has_next)
+            self.assertEqual(previous.has_previous, position > 1)
+
+    def test_descending_ties_break_on_id(self):
+        paginator = KeysetPaginator(Filing.objects.all(), ("-uploaded_at", "-id"), per_page=4)
+        pages = self.walk_forward(paginator)
+        seen = [filing.pk for page in pages for filing in page]
+        self.assertEqual(seen, sorted(Filing.objects.values_list("pk", flat=True), reverse=True))
+
+    def test_invalid_cursor_falls_back_to_first_page(self):
+        paginator = KeysetPaginator(Filing.objects.all(), ("-uploaded_at", "-id"), per_page=2)
+        first = paginator.get_page(None)
+        for cursor in ("bukan-cursor", "eyJkIjoibiJ9", paginator.encode_cursor(first.object_list[0], "x")):
+            with self.subTest(cursor=cursor):
+                self.assertEqual(list(paginator.get_page(cursor)), list(first))
+
+    def test_estimated_count_is_capped(self):
+        queryset = Fact.objects.filter(filing=self.filing)
+        total = queryset.count()
+        self.assertEqual(KeysetPaginator(queryset, ("order", "id"), 25).estimated_count(), None)
+        self.assertEqual(
+            KeysetPaginator(queryset, ("order", "id"), 25, count_cap=total).estimated_count(),
+            (total, False),
+        )
+        self.assertEqual(
+            KeysetPaginator(queryset, ("order", "id"), 25, count_cap=10).estimated_count(),
+            (10, True),
+        )
+
+    def test_views_follow_cursor(self):
+        self.client.force_login(self.user)
+        page = self.client.get(reverse("upload_xbrl"), {"q": "BBBB"}).context["latest_filings"]
+        self.assertEqual(len(page), 5)
+        self.assertFalse(page.has_other_pages())
+
+        url = reverse("filing_detail", kwargs={"pk": self.filing.pk})
+        first = self.client.get(url).context["facts_page"]
+        second = self.client.get(url, {"cursor": first.next_cursor}).context["facts_page"]
+        self.assertTrue(first.has_next)
+        self.assertGreater(
+            (second.object_list[0].order, second.object_list[0].pk),
+            (first.object_list[-1].order, first.object_list[-1].pk),
+        )
@@ -0,0 +1,54 @@
+from reports.models import Company, Filing
+from reports.testing import QueryBudgetMixin
+
+from .base import ReportsTestCase
+
+
+class ViewQueryBudgetTests(QueryBudgetMixin, ReportsTestCase):
+    """Batas query per view; N+1 baru membuat tes ini gagal, bukan hanya lebih lambat."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_balance_sheet_template()
+        for ticker in ("AAAA", "BBBB", "CCCC"):
+            for year in (2022, 2023, 2024):
+                cls.ingest_year(ticker, year)
+        cls.company = Company.objects.get(ticker="AAAA")
+        cls.filing = Filing.objects.filter(company=cls.company).latest("period_end")
+        cls.user = cls.create_user()
+
+    def test_home(self):
+        self.assertQueryBudget("home")
+
+    def test_company_list(self):
+        self.assertQueryBudget("company_list")
+        self.assertQueryBudget("company_list", data={"q": "AA"})
+
+    def test_report(self):
+        for view_name in ("report_neraca", "report_laba_rugi", "report_arus_kas"):
+            with self.subTest(view_name=view_name):
+                response = self.assertQueryBudget(view_name, data={"company": self.company.pk})
+                self.assertEqual(response.context["primary_filing"], self.filing)
+                self.assertTrue(response.context["report_blocks"])
+
+    def test_combined_report(self):
+        response = self.assertQueryBudget("report_lengkap", data={"company": self.company.pk})
+        self.assertEqual(response.context["primary_filing"], self.filing)
+
+    def test_peer_report(self):
+        response = self.assertQueryBudget(
+            "report_peer", data={"tickers": "AAAA,BBBB,CCCC", "period": self.filing.period_label}
+        )
+        self.assertEqual(len(response.context["columns"]), 3)
+        self.assertTrue(response.context["rows"])
+
+    def test_screener(self):
+        response = self.assertQueryBudget(
+            "screener", data={"metric_type": "concept", "metric": "Assets", "period": "2024-12-31"}
+        )
+        self.assertEqual(response.context["result"].total, 3)
+
+    def test_filing_detail(self):
+        self.client.force_login(self.user)
+        self.assertQueryBudget("filing_detail", kwargs={"pk": self.filing.pk})
+        self.assertQueryBudget("filing_detail", kwargs={"pk": self.filing.pk}, data={"q": "Assets"})
@@ -0,0 +1,116 @@
+import csv
+import io
+import zipfile
+from unittest import mock
+
+from django.urls import reverse
+
+from reports import views
+from reports.exports import CONTENT_TYPES, FORMAT_CSV, FORMAT_XLSX
+from reports.template_plans import compile_template_plan
+
+from .base import ReportsTestCase
+
+
+class CombinedReportTests(ReportsTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_balance_sheet_template()
+        cls.previous = cls.ingest_year("AAAA", 2023)
+        cls.current = cls.ingest_year("AAAA", 2024, seed=1)
+
+    def params(self, **extra) -> dict:
+        return {
+            "company": self.current.company_id,
+            "primary": self.current.pk,
+            "comparison": self.previous.pk,
+            **extra,
+        }
+
+    def block_slugs(self, response) -> list[str]:
+        return [block["template"].slug for block in response.context["report_blocks"]]
+
+    def test_renders_all_statements(self):
+        response = self.client.get(reverse("report_lengkap"), self.params())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.block_slugs(response), list(views.COMBINED_REPORT_SLUGS))
+
+        # Setiap blok sama dengan halaman laporan tunggalnya.
+        for block, url_name in zip(
+            response.context["report_blocks"],
+            ("report_neraca", "report_laba_rugi", "report_arus_kas"),
+        ):
+            with self.subTest(report=block["template"].slug):
+                single = self.client.get(reverse(url_name), self.params())
+                (expected,) = single.context["report_blocks"]
+                columns = ("label", "primary_value", "delta_value")
+                self.assertEqual(
+                    [[row[key] for key in columns] for row in block["rows"]],
+                    [[row[key] for key in columns] for row in expected["rows"]],
+                )
+
+        balance_sheet = response.context["report_blocks"][0]["rows"]
+        self.assertTrue(all(row["primary_value"] is not None for row in balance_sheet))
+        for row in balance_sheet:
+            self.assertEqual(row["delta_value"], row["primary_value"] - row["comparison_value"])
+
+    def test_loads_union_of_concepts_once_per_filing(self):
+        with mock.patch.object(
+            views, "load_lookup_facts", wraps=views.load_lookup_facts
+        ) as load:
+            response = self.client.get(reverse("report_lengkap"), self.params())
+        concepts = set()
+        for template in response.context["report_templates"]:
+            concepts |= compile_template_plan(template).concepts
+        self.assertEqual(
+            sorted(call.args[0] for call in load.call_args_list),
+            [[self.previous.pk], [self.current.pk]],
+        )
+        for call in load.call_args_list:
+            self.assertEqual(call.args[1], concepts)
+
+    def test_csv_export_matches_report(self):
+        report = self.client.get(reverse("report_lengkap"), self.params())
+        response = self.client.get(
+            reverse("report_lengkap_export"), self.params(format=FORMAT_CSV)
+        )
+        self.assertEqual(response["Content-Type"], CONTENT_TYPES[FORMAT_CSV])
+        self.assertEqual(
+            response["Content-Disposition"],
+            f'attachment; filename="laporan-lengkap-AAAA-{self.current.period_label}.csv"',
+        )
+
+        header, *rows = csv.reader(io.StringIO(b"".join(response.streaming_content).decode()))
+        self.assertEqual(
+            header,
+            [
+                "Laporan",
+                "Item",
+                "Level",
+                self.current.period_label,
+                self.previous.period_label,
+                "Selisih",
+                "Selisih %",
+            ],
+        )
+        expected = [
+            [
+                block["template"].name,
+                row["label"],
+                str(row["level"]),
+                "" if row["primary_value"] is None else str(row["primary_value"]),
+            ]
+            for block in report.context["report_blocks"]
+            for row in block["rows"]
+        ]
+        self.assertEqual([row[:4] for row in rows], expected)
+
+    def test_xlsx_export(self):
+        response = self.client.get(
+            reverse("report_lengkap_export"), self.params(format=FORMAT_XLSX)
+        )
+        self.assertEqual(response["Content-Type"], CONTENT_TYPES[FORMAT_XLSX])
+        archive = zipfile.ZipFile(io.BytesIO(b"".join(response.streaming_content)))
+        self.assertIsNone(archive.testzip())
+        sheet = archive.read("xl/worksheets/sheet1.xml").decode("utf-8")
+        self.assertIn("Jumlah aset", sheet)
@@ -0,0 +1,146 @@
+from datetime import date
+
+from django.urls import reverse
+
+from reports.models import Company, Context, Fact, Filing
+from reports.restatement import (
+    STATUS_ADDED,
+    STATUS_CHANGED,
+    STATUS_REMOVED,
+    diff_filings,
+)
+
+from .base import ReportsTestCase
+
+YEAR = (date(2024, 1, 1), date(2024, 12, 31), None)
+YEAR_END = (None, None, date(2024, 12, 31))
+PRIOR_YEAR_END = (None, None, date(2023, 12, 31))
+
+
+def create_filing(company: Company, label: str, facts) -> Filing:
+    filing = Filing.objects.create(
+        company=company, period_label=label, xbrl_file=f"xbrl/{label}.xbrl"
+    )
+    contexts = {}
+    for order, (name, period, unit, value) in enumerate(facts):
+        if period not in contexts:
+            start, end, instant = period
+            contexts[period] = Context.objects.create(
+                filing=filing,
+                context_id=f"c{len(contexts)}",
+                start_date=start,
+                end_date=end,
+                instant_date=instant,
+            )
+        Fact.objects.create(
+            filing=filing,
+            context=contexts[period],
+            name=name,
+            unit=unit,
+            value=value,
+            order=order,
+        )
+    return filing
+
+
+class RestatementDiffTests(ReportsTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        company = Company.objects.create(ticker="AAAA")
+        cls.original = create_filing(
+            company,
+            "2024",
+            [
+                ("Assets", YEAR_END, "IDR", "1000"),
+                ("Assets", PRIOR_YEAR_END, "IDR", "900"),
+                ("Equity", YEAR_END, "IDR", "400"),
+                ("Liabilities", YEAR_END, "IDR", "600"),
+                ("ProfitLoss", YEAR, "IDR", "50"),
+                ("Inventories", YEAR_END, "IDR", "10"),
+                ("Inventories", YEAR_END, "IDR", "20"),
+                ("GeneralInformationTextBlock", YEAR, "", "<p>Lama</p>"),
+            ],
+        )
+        cls.restated = create_filing(
+            company,
+            "2024 (disajikan kembali)",
+            [
+                ("Assets", YEAR_END, "IDR", "1,000"),
+                ("Assets", PRIOR_YEAR_END, "IDR", "950"),
+                ("Equity", YEAR_END, "IDR", "401"),
+                ("ProfitLoss", YEAR, "IDR", "50.0"),
+                ("ProfitLoss", YEAR, "USD", "3"),
+                ("Inventories", YEAR_END, "IDR", "10"),
+                ("GeneralInformationTextBlock", YEAR, "", "<p>Baru</p>"),
+            ],
+        )
+        cls.user = cls.create_user()
+
+    def changes(self, **options):
+        return {
+            (change.status, change.concept, change.instant_date or change.period_end, change.unit): change
+            for change in diff_filings(self.original, self.restated, **options)
+        }
+
+    def test_statuses(self):
+        changes = self.changes()
+        self.assertEqual(
+            set(changes),
+            {
+                (STATUS_CHANGED, "Assets", date(2023, 12, 31), "IDR"),
+                (STATUS_CHANGED, "Equity", date(2024, 12, 31), "IDR"),
+                (STATUS_CHANGED, "GeneralInformationTextBlock", date(2024, 12, 31), ""),
+                (STATUS_REMOVED, "Inventories", date(2024, 12, 31), "IDR"),
+                (STATUS_REMOVED, "Liabilities", date(2024, 12, 31), "IDR"),
+                (STATUS_ADDED, "ProfitLoss", date(2024, 12, 31), "USD"),
+            },
+        )
+
+        prior_assets = changes[(STATUS_CHANGED, "Assets", date(2023, 12, 31), "IDR")]
+        self.assertEqual((prior_assets.old_value, prior_assets.new_value), ("900", "950"))
+        self.assertEqual(prior_assets.delta, 50)
+        self.assertAlmostEqual(prior_assets.delta_percent, 50 / 9)
+
+        text = changes[(STATUS_CHANGED, "GeneralInformationTextBlock", date(2024, 12, 31), "")]
+        self.assertIsNone(text.delta)
+
+        # Fakta duplikat dipasangkan berurutan; kelebihan di sisi lama terhitung dihapus.
+        inventories = changes[(STATUS_REMOVED, "Inventories", date(2024, 12, 31), "IDR")]
+        self.assertEqual((inventories.old_value, inventories.new_value), ("20", None))
+
+        added = changes[(STATUS_ADDED, "ProfitLoss", date(2024, 12, 31), "USD")]
+        self.assertEqual((added.period_start, added.instant_date), (date(2024, 1, 1), None))
+
+    def test_status_filter(self):
+        for status in (STATUS_CHANGED, STATUS_ADDED, STATUS_REMOVED):
+            with self.subTest(status=status):
+                changes = self.changes(statuses=(status,))
+                self.assertTrue(changes)
+                self.assertEqual({key[0] for key in changes}, {status})
+
+    def test_magnitude_filters(self):
+        changes = self.changes(min_delta=5)
+        self.assertNotIn((STATUS_CHANGED, "Equity", date(2024, 12, 31), "IDR"), changes)
+        self.assertNotIn((STATUS_ADDED, "ProfitLoss", date(2024, 12, 31), "USD"), changes)
+        self.assertNotIn((STATUS_CHANGED, "GeneralInformationTextBlock", date(2024, 12, 31), ""), changes)
+        self.assertIn((STATUS_CHANGED, "Assets", date(2023, 12, 31), "IDR"), changes)
+        self.assertIn((STATUS_REMOVED, "Liabilities", date(2024, 12, 31), "IDR"), changes)
+
+        changes = self.changes(min_percent=10)
+        self.assertNotIn((STATUS_CHANGED, "Assets", date(2023, 12, 31), "IDR"), changes)
+        self.assertIn((STATUS_REMOVED, "Liabilities", date(2024, 12, 31), "IDR"), changes)
+
+    def test_identical_filings_have_no_changes(self):
+        self.assertEqual(list(diff_filings(self.original, self.original)), [])
+
+    def test_diff_view_counts(self):
+        self.client.force_login(self.user)
+        response = self.client.get(
+            reverse("filing_diff", kwargs={"pk": self.restated.pk}),
+            {"against": self.original.pk},
+        )
+        self.assertEqual(
+            response.context["counts"],
+            {STATUS_CHANGED: 3, STATUS_ADDED: 1, STATUS_REMOVED: 2},
+        )
+        self.assertEqual(response.context["total_changes"], 6)
@@ -0,0 +1,172 @@
+from datetime import date
+
+from django.utils import timezone
+
+from reports.models import Company, ConceptValue, Filing, RatioValue
+from reports.ratios import compute_ratios
+from reports.screener import METRIC_CONCEPT, METRIC_RATIO, ScreenerQuery, period_choices, screen
+
+from .base import ReportsTestCase
+
+PERIOD_END = date(2024, 12, 31)
+PRIOR_END = date(2023, 12, 31)
+
+
+class ScreenerTests(ReportsTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        companies = (
+            ("AAAA", "Keuangan", 1),
+            ("BBBB", "Keuangan", 2),
+            ("CCCC", "Energi", 3),
+            ("DDDD", "Energi", 4),
+        )
+        for ticker, sector, seed in companies:
+            for year in (2023, 2024):
+                cls.ingest_year(ticker, year, sector=sector, seed=seed * 10 + year)
+        # EEEE hanya punya tahun berjalan sehingga tidak ikut peringkat pertumbuhan.
+        cls.ingest_year("EEEE", 2024, sector="Energi", seed=99)
+        compute_ratios(full=True)
+
+    def instant_values(self, concept: str, period_end: date = PERIOD_END) -> dict[str, float]:
+        return dict(
+            ConceptValue.objects.filter(
+                concept=concept, period_start=period_end, period_end=period_end
+            ).values_list("company__ticker", "value")
+        )
+
+    def query(self, **options) -> ScreenerQuery:
+        options.setdefault("metric_type", METRIC_CONCEPT)
+        options.setdefault("metric", "Assets")
+        options.setdefault("period_end", PERIOD_END)
+        return ScreenerQuery(**options)
+
+    def tickers(self, result) -> list[str]:
+        return [row.company.ticker for row in result.rows]
+
+    def test_ranks_by_value(self):
+        values = self.instant_values("assets")
+        expected = sorted(values, key=values.get, reverse=True)
+
+        result = screen(self.query())
+        self.assertEqual(result.total, 5)
+        self.assertEqual(self.tickers(result), expected)
+        self.assertEqual([row.rank for row in result.rows], [1, 2, 3, 4, 5])
+        self.assertEqual([row.value for row in result.rows], [values[t] for t in expected])
+
+        ascending = screen(self.query(descending=False))
+        self.assertEqual(self.tickers(ascending), expected[::-1])
+
+    def test_pages_continue_rank(self):
+        values = self.instant_values("assets")
+        expected = sorted(values, key=values.get, reverse=True)
+        page = screen(self.query(), limit=2, offset=2)
+        self.assertEqual(page.total, 5)
+        self.assertEqual(self.tickers(page), expected[2:4])
+        self.assertEqual([row.rank for row in page.rows], [3, 4])
+
+    def test_filters(self):
+        values = self.instant_values("assets")
+        threshold = sorted(values.values())[2]
+        result = screen(self.query(min_value=threshold))
+        self.assertEqual(
+            set(self.tickers(result)), {t for t, v in values.items() if v >= threshold}
+        )
+        result = screen(self.query(max_value=threshold, sector="Energi"))
+        self.assertEqual(
+            set(self.tickers(result)),
+            {
+                t
+                for t, v in values.items()
+                if v <= threshold and Company.objects.get(ticker=t).sector == "Energi"
+            },
+        )
+
+    def test_one_row_per_company_when_spans_share_period_end(self):
+        # Fakta sintetis tersedia untuk konteks instant dan durasi tahun berjalan.
+        for concept in ("assets", "salesandrevenue"):
+            with self.subTest(concept=concept):
+                result = screen(self.query(metric=concept))
+                self.assertEqual(result.total, 5)
+                self.assertEqual(len(set(self.tickers(result))), 5)
+                values = self.instant_values(concept)
+                for row in result.rows:
+                    self.assertEqual(row.value, values[row.company.ticker])
+
+    def test_longest_duration_wins_without_instant(self):
+        company = Company.objects.get(ticker="AAAA")
+        spans = ConceptValue.objects.filter(
+            company=company, concept="salesandrevenue", period_end=PERIOD_END
+        )
+        spans.filter(period_start=PERIOD_END).delete()
+        annual = spans.get()
+        ConceptValue.objects.create(
+            company=company,
+            filing=annual.filing,
+            concept="salesandrevenue",
+            period_start=date(2024, 10, 1),
+            period_end=PERIOD_END,
+            value=1e18,
+        )
+
+        result = screen(self.query(metric="Salesandrevenue"))
+        self.assertEqual(result.total, 5)
+        self.assertEqual(self.tickers(result).count("AAAA"), 1)
+        row = next(row for row in result.rows if row.company.ticker == "AAAA")
+        self.assertEqual(row.value, annual.value)
+
+    def test_growth_uses_prior_year(self):
+        current = self.instant_values("equity")
+        prior = self.instant_values("equity", PRIOR_END)
+        growth = {
+            ticker: (current[ticker] - prior[ticker]) / abs(prior[ticker]) * 100
+            for ticker in prior
+        }
+        result = screen(self.query(metric="Equity", growth=True))
+        self.assertEqual(result.total, 4)
+        self.assertEqual(self.tickers(result), sorted(growth, key=growth.get, reverse=True))
+        for row in result.rows:
+            self.assertAlmostEqual(row.growth, growth[row.company.ticker])
+            self.assertEqual(row.prior_value, prior[row.company.ticker])
+
+    def test_ratio_metric(self):
+        values = dict(
+            RatioValue.objects.filter(ratio__code="der", filing__period_end=PERIOD_END)
+            .exclude(value=None)
+            .values_list("filing__company__ticker", "value")
+        )
+        result = screen(self.query(metric_type=METRIC_RATIO, metric="der"))
+        self.assertEqual(result.total, len(values))
+        self.assertEqual(self.tickers(result), sorted(values, key=values.get, reverse=True))
+        self.assertTrue(all(row.filing_id for row in result.rows))
+
+    def test_ratio_metric_ranks_latest_filing_per_company(self):
+        original = RatioValue.objects.get(
+            ratio__code="der", filing__company__ticker="AAAA", filing__period_end=PERIOD_END
+        )
+        restated = Filing.objects.create(
+            company=original.filing.company,
+            period_label="FY 2024 (disajikan kembali)",
+            period_end=PERIOD_END,
+            xbrl_file="xbrl/restated.xbrl",
+        )
+        RatioValue.objects.create(
+            ratio=original.ratio, filing=restated, value=1e9, computed_at=timezone.now()
+        )
+
+        result = screen(self.query(metric_type=METRIC_RATIO, metric="der"))
+        self.assertEqual(self.tickers(result).count("AAAA"), 1)
+        self.assertEqual(result.rows[0].company.ticker, "AAAA")
+        self.assertEqual(result.rows[0].filing_id, restated.pk)
+        self.assertEqual(result.rows[0].value, 1e9)
+
+    def test_ratio_metric_matches_instant_only_filing(self):
+        instant = date(2024, 6, 30)
+        filing = Filing.objects.get(company__ticker="EEEE", period_end=PERIOD_END)
+        Filing.objects.filter(pk=filing.pk).update(period_end=None, instant_date=instant)
+        expected = RatioValue.objects.get(ratio__code="der", filing=filing).value
+
+        result = screen(self.query(metric_type=METRIC_RATIO, metric="der", period_end=instant))
+        self.assertEqual(result.total, 1)
+        self.assertEqual((result.rows[0].filing_id, result.rows[0].value), (filing.pk, expected))
+        self.assertIn(instant, period_choices())
@@ -0,0 +1,70 @@
+from unittest import skipUnless
+
+from django.urls import reverse
+
+from reports.search import search_filing_facts, search_supported, search_text
+
+from .base import ReportsTestCase
+
+
+@skipUnless(search_supported(), "Full-text search tidak tersedia untuk database ini.")
+class FactSearchTests(ReportsTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.filing = cls.ingest_year("AAAA", 2024)
+        cls.other = cls.ingest_year("BBBB", 2024)
+        cls.user = cls.create_user()
+
+    def test_results_are_scoped_to_filing(self):
+        hits = search_filing_facts(self.filing.pk, "assets", limit=100)
+        self.assertTrue(hits)
+        self.assertEqual({hit.fact.filing_id for hit in hits}, {self.filing.pk})
+        other_hits = search_filing_facts(self.other.pk, "assets", limit=100)
+        self.assertEqual({hit.fact.filing_id for hit in other_hits}, {self.other.pk})
+        self.assertTrue({hit.fact.pk for hit in hits}.isdisjoint(hit.fact.pk for hit in other_hits))
+
+    def test_prefix_terms_match_names(self):
+        hits = search_filing_facts(self.filing.pk, "current", limit=100)
+        names = {hit.fact.name for hit in hits}
+        self.assertIn("Currentassets", names)
+        self.assertIn("Currentliabilities", names)
+        expected = self.filing.facts.filter(name__istartswith="current").count()
+        self.assertEqual(len(hits), expected)
+        self.assertIn("<mark>", hits[0].name_html)
+
+    def test_text_blocks_are_searched_without_markup(self):
+        hits = search_filing_facts(self.filing.pk, "konsolidasian", limit=100)
+        self.assertTrue(hits)
+        self.assertTrue(all(hit.fact.name.endswith("TextBlock") for hit in hits))
+        self.assertIn("<mark>konsolidasian</mark>", hits[0].snippet_html)
+        self.assertNotIn("&lt;p&gt;", hits[0].snippet_html)
+
+    def test_ranked_pages_do_not_overlap(self):
+        all_hits = search_filing_facts(self.filing.pk, "current", limit=100)
+        first = search_filing_facts(self.filing.pk, "current", limit=3)
+        second = search_filing_facts(self.filing.pk, "current", limit=3, offset=3)
+        self.assertEqual(
+            [hit.fact.pk for hit in first + second], [hit.fact.pk for hit in all_hits[:6]]
+        )
+        ranks = [hit.rank for hit in all_hits]
+        self.assertEqual(ranks, sorted(ranks))
+
+    def test_query_syntax_is_not_interpreted(self):
+        for query in ('"', "assets OR", "NEAR(assets)", "a*b:c", "!!"):
+            with self.subTest(query=query):
+                hits = search_filing_facts(self.filing.pk, query, limit=10)
+                self.assertTrue(all(hit.fact.filing_id == self.filing.pk for hit in hits))
+
+    def test_search_text_strips_html(self):
+        self.assertEqual(search_text("<p>Kebijakan  <b>akuntansi</b></p>"), "Kebijakan akuntansi")
+        self.assertEqual(search_text(None), "")
+
+    def test_filing_detail_uses_index(self):
+        self.client.force_login(self.user)
+        response = self.client.get(
+            reverse("filing_detail", kwargs={"pk": self.filing.pk}), {"q": "equity"}
+        )
+        self.assertTrue(response.context["search_mode"])
+        self.assertEqual(
+            {hit.fact.name for hit in response.context["search_hits"]}, {"Equity"}
+        )
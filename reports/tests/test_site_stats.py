@@ -0,0 +1,116 @@
+from datetime import date, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from reports.models import Company, Filing, ReportTemplate, SiteCounter
+from reports.services import delete_company, delete_filing
+from reports.site_stats import refresh_company_stats, repair_statistics
+
+from .base import ReportsTestCase
+
+
+def source_counts() -> dict[str, int]:
+    return {
+        SiteCounter.COMPANIES: Company.objects.count(),
+        SiteCounter.FILINGS: Filing.objects.count(),
+        SiteCounter.TEMPLATES: ReportTemplate.objects.count(),
+    }
+
+
+class SiteCounterTests(ReportsTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.first = cls.ingest_year("AAAA", 2023)
+        cls.second = cls.ingest_year("AAAA", 2024, seed=1)
+        cls.other = cls.ingest_year("BBBB", 2024, seed=2)
+
+    def test_signals_follow_creates_and_deletes(self):
+        self.assertEqual(SiteCounter.values(), source_counts())
+
+        template = ReportTemplate.objects.create(name="Rasio", slug="rasio")
+        self.assertEqual(SiteCounter.values(), source_counts())
+        template.delete()
+        self.assertEqual(SiteCounter.values(), source_counts())
+
+        delete_filing(self.second)
+        self.assertEqual(SiteCounter.values(), source_counts())
+
+        # Filing ikut terhapus lewat cascade; sinyal tetap terpanggil per baris.
+        delete_company(Company.objects.get(ticker="BBBB"))
+        self.assertEqual(SiteCounter.values(), source_counts())
+
+    def test_missing_counter_row_is_seeded_from_source(self):
+        SiteCounter.objects.filter(name=SiteCounter.FILINGS).delete()
+        self.ingest_year("CCCC", 2024, seed=3)
+        self.assertEqual(SiteCounter.values(), source_counts())
+
+    def test_repair_statistics_recomputes_counters_and_company_stats(self):
+        SiteCounter.objects.update(value=999)
+        Company.objects.update(latest_filing=None, filing_count=0, last_period_end=None)
+
+        self.assertEqual(repair_statistics(), source_counts())
+        self.assertEqual(SiteCounter.values(), source_counts())
+        company = Company.objects.get(ticker="AAAA")
+        self.assertEqual(company.latest_filing_id, self.second.pk)
+        self.assertEqual(company.filing_count, 2)
+        self.assertEqual(company.first_period_end, date(2023, 12, 31))
+        self.assertEqual(company.last_period_end, date(2024, 12, 31))
+
+    def test_repair_statistics_command(self):
+        SiteCounter.objects.all().delete()
+        stdout = StringIO()
+        call_command("repair_statistics", stdout=stdout)
+        self.assertEqual(SiteCounter.values(), source_counts())
+        self.assertIn("Statistik diperbaiki", stdout.getvalue())
+
+    def test_home_uses_counters(self):
+        SiteCounter.objects.filter(name=SiteCounter.COMPANIES).update(value=42)
+        response = self.client.get(reverse("home"))
+        self.assertEqual(response.context["company_count"], 42)
+        self.assertEqual(response.context["filing_count"], 3)
+
+
+class CompanyStatsTests(ReportsTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.older = cls.ingest_year("AAAA", 2023)
+        cls.newer = cls.ingest_year("AAAA", 2024, seed=1)
+        cls.company = Company.objects.get(ticker="AAAA")
+
+    def test_ingest_and_delete_refresh_company(self):
+        self.company.refresh_from_db()
+        self.assertEqual(self.company.latest_filing_id, self.newer.pk)
+        self.assertEqual(self.company.filing_count, 2)
+
+        delete_filing(self.newer)
+        self.company.refresh_from_db()
+        self.assertEqual(self.company.latest_filing_id, self.older.pk)
+        self.assertEqual(self.company.filing_count, 1)
+        self.assertEqual(self.company.last_period_end, date(2023, 12, 31))
+
+    def test_latest_filing_follows_upload_time_and_instant_periods(self):
+        # Filing 2023 diunggah ulang belakangan; periodenya hanya tanggal instant.
+        Filing.objects.filter(pk=self.older.pk).update(
+            uploaded_at=timezone.now() + timedelta(hours=1),
+            period_end=None,
+            instant_date=date(2022, 12, 31),
+        )
+        refresh_company_stats(self.company.pk)
+        self.company.refresh_from_db()
+        self.assertEqual(self.company.latest_filing_id, self.older.pk)
+        self.assertEqual(self.company.first_period_end, date(2022, 12, 31))
+        self.assertEqual(self.company.last_period_end, date(2024, 12, 31))
+
+    def test_report_defaults_to_latest_filing(self):
+        # Pointer tersimpan dipakai sebagai filing utama, bukan urutan query.
+        Company.objects.filter(pk=self.company.pk).update(latest_filing=self.older)
+        response = self.client.get(reverse("report_laba_rugi"), {"company": self.company.pk})
+        self.assertEqual(response.context["primary_filing"], self.older)
+
+        response = self.client.get(
+            reverse("report_laba_rugi"), {"company": self.company.pk, "primary": self.newer.pk}
+        )
+        self.assertEqual(response.context["primary_filing"], self.newer)
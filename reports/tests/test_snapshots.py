@@ -0,0 +1,161 @@
+import json
+import shutil
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.db import connection
+
+from reports.models import (
+    Company,
+    Concept,
+    ConceptValue,
+    Context,
+    Fact,
+    Filing,
+    PendingFileDeletion,
+    RatioValue,
+    SectorAggregate,
+    SiteCounter,
+)
+from reports.ratios import compute_ratios
+from reports.search import FACT_SEARCH_TABLE, search_filing_facts, search_supported
+from reports.services import delete_company
+from reports.snapshots import (
+    MANIFEST_NAME,
+    _claim_chunks,
+    _restore_shard,
+    _shard_by_company,
+    _update_derived,
+    dump_snapshot,
+    restore_snapshot,
+)
+
+from .base import ReportsTestCase
+
+
+class SnapshotRoundTripTests(ReportsTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for ticker, seed in (("AAAA", 1), ("BBBB", 2)):
+            for year in (2023, 2024):
+                cls.ingest_year(ticker, year, seed=seed * 10 + year)
+        compute_ratios(full=True)
+
+    def setUp(self):
+        super().setUp()
+        self.snapshot_dir = tempfile.mkdtemp(prefix="lapxbrl-snapshot-")
+        self.addCleanup(shutil.rmtree, self.snapshot_dir, ignore_errors=True)
+
+    def state(self) -> dict:
+        filing_key = ("filing__company__ticker", "filing__period_label")
+        state = {
+            "filings": sorted(
+                Filing.objects.values_list(
+                    "company__ticker", "period_label", "period_end", "xbrl_file", "uploaded_at"
+                )
+            ),
+            "contexts": sorted(
+                Context.objects.values_list(
+                    *filing_key, "context_id", "start_date", "end_date", "instant_date"
+                )
+            ),
+            "facts": sorted(
+                Fact.objects.values_list(
+                    *filing_key, "context__context_id", "name", "value", "unit", "order"
+                )
+            ),
+            "concept_values": sorted(
+                ConceptValue.objects.values_list(
+                    "company__ticker", "concept", "period_start", "period_end", "value"
+                )
+            ),
+            "ratios": sorted(RatioValue.objects.values_list(*filing_key, "ratio__code", "value")),
+            "catalog": sorted(
+                Concept.objects.values_list("name_lower", "fact_count", "filing_count")
+            ),
+            "aggregates": sorted(
+                SectorAggregate.objects.values_list(
+                    "level", "sector", "concept", "period_end", "count", "total"
+                )
+            ),
+            "counters": SiteCounter.values(),
+            "companies": sorted(
+                Company.objects.values_list(
+                    "ticker", "sector", "latest_filing__period_label", "filing_count", "last_period_end"
+                )
+            ),
+        }
+        if search_supported():
+            with connection.cursor() as cursor:
+                cursor.execute(f"SELECT COUNT(*) FROM {FACT_SEARCH_TABLE}")
+                state["search_rows"] = cursor.fetchone()[0]
+        return state
+
+    def test_dump_and_restore_into_empty_database(self):
+        before = self.state()
+        dumped = dump_snapshot(self.snapshot_dir)
+        self.assertEqual((dumped.filings, dumped.facts), (4, Fact.objects.count()))
+
+        for company in Company.objects.all():
+            delete_company(company)
+        self.assertFalse(Fact.objects.exists())
+
+        restored = restore_snapshot(self.snapshot_dir)
+        self.assertEqual(
+            (restored.filings, restored.facts, restored.skipped), (4, dumped.facts, 0)
+        )
+        self.assertEqual(self.state(), before)
+        if search_supported():
+            filing = Filing.objects.get(company__ticker="AAAA", period_end__year=2024)
+            self.assertEqual(
+                {hit.fact.name for hit in search_filing_facts(filing.pk, "equity", limit=10)},
+                {"Equity"},
+            )
+
+    def test_restore_filters_and_skips_existing(self):
+        dump_snapshot(self.snapshot_dir)
+        result = restore_snapshot(self.snapshot_dir)
+        self.assertEqual((result.filings, result.skipped), (0, 4))
+
+        delete_company(Company.objects.get(ticker="BBBB"))
+        result = restore_snapshot(self.snapshot_dir, tickers=["bbbb"])
+        self.assertEqual((result.filings, result.skipped), (2, 0))
+        self.assertEqual(Filing.objects.filter(company__ticker="BBBB").count(), 2)
+
+    def test_replace_command(self):
+        before = self.state()
+        old_ids = set(Filing.objects.values_list("pk", flat=True))
+        call_command("dump_snapshot", self.snapshot_dir, "--ticker", "AAAA", stdout=StringIO())
+
+        call_command("restore_snapshot", self.snapshot_dir, "--replace", stdout=StringIO())
+
+        aaaa_ids = set(Filing.objects.filter(company__ticker="AAAA").values_list("pk", flat=True))
+        self.assertEqual(len(aaaa_ids), 2)
+        self.assertTrue(aaaa_ids.isdisjoint(old_ids))
+        # File lama diantrekan untuk dihapus tetapi dipakai lagi oleh filing hasil restore.
+        self.assertEqual(PendingFileDeletion.objects.count(), 2)
+        self.assertEqual(self.state(), before)
+
+    def test_deferred_shards_match_serial_restore(self):
+        """Jalur `workers` > 1 (PostgreSQL) dijalankan dalam proses agar bisa diuji di SQLite."""
+        before = self.state()
+        dump_snapshot(self.snapshot_dir)
+        manifest = json.loads((Path(self.snapshot_dir) / MANIFEST_NAME).read_text())
+        chunks = manifest["chunks"]
+
+        claimed, skipped = _claim_chunks(chunks, replace=True)
+        self.assertEqual((len(claimed), skipped), (4, 0))
+        shards = _shard_by_company(claimed, 3)
+        self.assertEqual(sorted(len(shard) for shard in shards), [0, 2, 2])
+        for shard in shards:
+            self.assertEqual(len({chunk["ticker"] for chunk in shard}), min(len(shard), 1))
+
+        filing_ids = []
+        for shard in shards:
+            result = _restore_shard((self.snapshot_dir, shard, False, False, True))
+            filing_ids.extend(result.filing_ids)
+        self.assertEqual(len(filing_ids), 4)
+        _update_derived(filing_ids, skip_derived=False)
+        self.assertEqual(self.state(), before)
@@ -0,0 +1,57 @@
+from reports.models import ReportTemplate, TemplateItem
+from reports.template_plans import compile_template_plan, touch_template
+
+from .base import ReportsTestCase
+
+
+class TemplatePlanTests(ReportsTestCase):
+    def setUp(self):
+        super().setUp()
+        self.template = self.create_balance_sheet_template()
+
+    def plan(self):
+        template = ReportTemplate.objects.prefetch_related("items").get(pk=self.template.pk)
+        return compile_template_plan(template)
+
+    def test_memo_reused_until_items_change(self):
+        plan = self.plan()
+        self.assertEqual(len(plan.items), 5)
+        self.assertIn("currentliabilities", plan.concepts)
+        self.assertIs(self.plan(), plan)
+
+    def test_signals_invalidate_on_save_and_delete(self):
+        plan = self.plan()
+        item = TemplateItem.objects.create(
+            template=self.template, label="Laba ditahan", primary_fact="RetainedEarnings", order=9
+        )
+        updated = self.plan()
+        self.assertIsNot(updated, plan)
+        self.assertIn("retainedearnings", updated.concepts)
+
+        item.delete()
+        self.assertNotIn("retainedearnings", self.plan().concepts)
+
+    def test_bulk_paths_invalidate_with_touch_template(self):
+        self.plan()
+        TemplateItem.objects.bulk_create(
+            [TemplateItem(template=self.template, label="Laba ditahan", primary_fact="RetainedEarnings")]
+        )
+        touch_template(self.template)
+        self.assertIn("retainedearnings", self.plan().concepts)
+
+        self.template.items.filter(primary_fact="RetainedEarnings").update(
+            primary_fact="Sharecapital"
+        )
+        touch_template(self.template)
+        concepts = self.plan().concepts
+        self.assertIn("sharecapital", concepts)
+        self.assertNotIn("retainedearnings", concepts)
+
+    def test_touch_template_updates_instance(self):
+        before = ReportTemplate.objects.get(pk=self.template.pk).items_changed_at
+        touch_template(self.template)
+        self.assertGreater(self.template.items_changed_at, before)
+        self.assertEqual(
+            ReportTemplate.objects.get(pk=self.template.pk).items_changed_at,
+            self.template.items_changed_at,
+        )
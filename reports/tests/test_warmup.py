@@ -0,0 +1,116 @@
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+from unittest import mock
+
+from django.utils import timezone
+
+from reports import fact_cache
+from reports.fact_cache import filing_key
+from reports.models import Filing, ReportTemplate
+from reports.template_plans import compile_template_plan
+from reports.warmup import WARMUP_ENV_FLAG, should_warm_on_start, warm_caches
+
+from .base import ReportsTestCase
+
+
+class WarmCachesTests(ReportsTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_balance_sheet_template()
+        for position, ticker in enumerate(("AAAA", "BBBB", "CCCC", "DDDD")):
+            for year in (2022, 2023, 2024):
+                cls.ingest_year(ticker, year, seed=position * 10 + year)
+        # DDDD paling baru diunggah, lalu CCCC; dalam satu emiten tahun terbaru lebih dulu.
+        now = timezone.now()
+        for offset, ticker in enumerate(("DDDD", "CCCC", "BBBB", "AAAA")):
+            for filing in Filing.objects.filter(company__ticker=ticker):
+                Filing.objects.filter(pk=filing.pk).update(
+                    uploaded_at=now - timedelta(days=offset, hours=2024 - filing.period_end.year)
+                )
+
+    def setUp(self):
+        super().setUp()
+        cache_dir = tempfile.mkdtemp(prefix="lapxbrl-cache-")
+        self.addCleanup(shutil.rmtree, cache_dir, ignore_errors=True)
+        override = self.settings(
+            FACT_CACHE_ENABLED=True,
+            FACT_CACHE_PATH=Path(cache_dir) / "facts.sqlite3",
+            CACHE_WARMUP_TICKERS=["cccc"],
+        )
+        override.enable()
+        self.addCleanup(override.disable)
+        for name in ("_store", "_memory"):
+            patcher = mock.patch.object(fact_cache, name, None)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def warmed_tickers(self) -> set[str]:
+        memory = fact_cache._get_memory()
+        return {
+            filing.company.ticker
+            for filing in Filing.objects.select_related("company")
+            if memory.get(filing_key(filing)) is not None
+        }
+
+    def test_popular_then_configured_then_recent(self):
+        with mock.patch("reports.warmup.popular_tickers", return_value=["BBBB", "ZZZZ"]):
+            result = warm_caches(limit=3, filings_per_company=2)
+
+        self.assertEqual((result.companies, result.filings), (3, 6))
+        self.assertEqual(self.warmed_tickers(), {"BBBB", "CCCC", "DDDD"})
+
+    def test_latest_uploads_are_warmed(self):
+        warm_caches(tickers=["aaaa"], filings_per_company=1)
+        memory = fact_cache._get_memory()
+        filings = Filing.objects.filter(company__ticker="AAAA").order_by("-period_end")
+        self.assertIsNotNone(memory.get(filing_key(filings[0])))
+        self.assertIsNone(memory.get(filing_key(filings[1])))
+
+    def test_template_plans_are_compiled(self):
+        result = warm_caches(tickers=["ZZZZ"])
+        self.assertEqual(result.template_plans, ReportTemplate.objects.count())
+        self.assertEqual(result.companies, 0)
+
+        template = ReportTemplate.objects.get(slug="neraca")
+        with self.assertNumQueries(0):
+            plan = compile_template_plan(template)
+        self.assertIn("assets", plan.concepts)
+
+    def test_cache_disabled_still_compiles_plans(self):
+        with self.settings(FACT_CACHE_ENABLED=False):
+            result = warm_caches()
+        self.assertEqual(result.companies, 0)
+        self.assertGreater(result.template_plans, 0)
+        self.assertGreater(result.templates, 0)
+
+
+class WarmOnStartTests(ReportsTestCase):
+    def check(self, argv, **environ) -> bool:
+        clean = {
+            name: value
+            for name, value in os.environ.items()
+            if name not in ("RUN_MAIN", WARMUP_ENV_FLAG)
+        }
+        with mock.patch.dict(os.environ, {**clean, **environ}, clear=True):
+            return should_warm_on_start(argv)
+
+    def test_only_server_processes_warm_up(self):
+        with self.settings(CACHE_WARMUP_ON_START=True):
+            self.assertTrue(self.check(["/usr/bin/gunicorn", "lapxbrl.wsgi"]))
+            self.assertTrue(self.check(["uwsgi"]))
+            self.assertTrue(self.check(["manage.py", "runserver"], RUN_MAIN="true"))
+            self.assertTrue(self.check(["manage.py", "runserver", "--noreload"]))
+            self.assertFalse(self.check(["manage.py", "runserver"]))
+            self.assertFalse(self.check(["manage.py", "migrate"]))
+            self.assertFalse(self.check(["/venv/bin/pytest", "-q"]))
+            self.assertFalse(self.check(["/venv/bin/celery", "-A", "lapxbrl", "worker"]))
+            self.assertFalse(self.check(["script.py"]))
+            self.assertFalse(self.check([]))
+            self.assertTrue(self.check(["/venv/bin/celery"], **{WARMUP_ENV_FLAG: "1"}))
+
+    def test_disabled_by_setting(self):
+        with self.settings(CACHE_WARMUP_ON_START=False):
+            self.assertFalse(self.check(["gunicorn"], **{WARMUP_ENV_FLAG: "1"}))
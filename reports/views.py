@@ -1,36 +1,90 @@
 from __future__ import annotations
 
+import hashlib
+import json
 from decimal import Decimal, InvalidOperation
+from statistics import median
 
 from django import forms
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import logout
-from django.contrib.auth.mixins import LoginRequiredMixin
+from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.core.paginator import Paginator
 from django.db import models
+from django.db.models.functions import Upper
+from django.http import HttpResponse, HttpResponseForbidden, HttpResponseNotModified, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse_lazy
+from django.utils.crypto import constant_time_compare
+from django.utils.http import parse_etags, quote_etag
 from django.views import View
 
-from .forms import TemplateForm, TemplateItemForm, XBRLUploadForm
-from .models import Company, Fact, Filing, ReportTemplate, TemplateItem
-from .services import UploadConflictError, ingest_xbrl
+from .catalog import search_concepts
+from .concept_values import concept_series, downsample_series
+from .coverage import analyze_template_coverage
+from .exports import (
+    BULK_FACT_HEADER,
+    FACT_HEADER,
+    FORMAT_CSV,
+    FORMAT_XLSX,
+    bulk_fact_rows,
+    export_response,
+    filing_fact_rows,
+)
+from .fact_cache import LookupFact, cache_enabled, cached_fact_lookups, load_lookup_facts
+from .file_cleanup import schedule_file_cleanup
+from .forms import (
+    ConceptSeriesForm,
+    ScreenerForm,
+    SectorAggregateForm,
+    TemplateForm,
+    TemplateItemForm,
+    XBRLUploadForm,
+)
+from .models import (
+    Company,
+    CoverageRun,
+    Filing,
+    ProfileRun,
+    ReportTemplate,
+    SectorAggregate,
+    SiteCounter,
+    TemplateItem,
+)
+from .metrics import REGISTRY as METRICS_REGISTRY
+from .metrics import REPORT_REQUESTS, record_cache
+from .pagination import KeysetPaginator, KnownCountPaginator
+from .profiling import flame_layout
+from .ratios import ratio_choices
+from .restatement import STATUSES as DIFF_STATUSES
+from .restatement import diff_filings
+from .screener import (
+    METRIC_CONCEPT,
+    ScreenerQuery,
+    period_choices,
+    screen,
+    sector_choices,
+)
+from .search import search_filing_facts, search_supported
+from .services import UploadConflictError, delete_filing, delete_filings, ingest_xbrl
+from .template_plans import TemplatePlan, compile_template_plan
+
+COMBINED_REPORT_SLUGS = ("neraca", "laba-rugi", "arus-kas")
 
 
 class HomeView(View):
     template_name = "reports/public/index.html"
 
     def get(self, request):
-        company_count = Company.objects.count()
-        filing_count = Filing.objects.count()
-        template_count = ReportTemplate.objects.count()
+        counters = SiteCounter.values()
         return render(
             request,
             self.template_name,
             {
-                "company_count": company_count,
-                "filing_count": filing_count,
-                "template_count": template_count,
+                "company_count": counters[SiteCounter.COMPANIES],
+                "filing_count": counters[SiteCounter.FILINGS],
+                "template_count": counters[SiteCounter.TEMPLATES],
             },
         )
 
@@ -42,41 +96,20 @@ class PublicReportView(View):
     def get(self, request):
         report_slug = (self.report_slug or "").strip().lower()
         report_template = _get_report_template(report_slug)
-        companies = list(Company.objects.all())
-        company_id = request.GET.get("company")
-        primary_id = request.GET.get("primary")
-        comparison_id = request.GET.get("comparison")
-
-        selected_company = None
-        if company_id:
-            selected_company = next(
-                (c for c in companies if str(c.id) == company_id), None
-            )
-        if not selected_company and companies:
-            selected_company = companies[0]
-
-        filings = []
-        if selected_company:
-            filings = list(
-                Filing.objects.filter(company=selected_company).order_by("-uploaded_at")
-            )
-
-        primary_filing = _find_filing(filings, primary_id) or (filings[0] if filings else None)
-        comparison_filing = _find_filing(filings, comparison_id)
+        selection = _resolve_report_selection(request)
+        primary_filing = selection["primary_filing"]
+        comparison_filing = selection["comparison_filing"]
 
         report_blocks = []
-        primary_lookup = _fact_lookup(primary_filing) if primary_filing else {}
-        comparison_lookup = _fact_lookup(comparison_filing) if comparison_filing else {}
         if primary_filing and report_template:
+            concepts = _template_concepts([report_template])
+            primary_lookup = _fact_lookup(primary_filing, concepts)
+            comparison_lookup = _fact_lookup(comparison_filing, concepts)
             rows = _build_template_rows(report_template, primary_lookup, comparison_lookup)
             report_blocks.append({"template": report_template, "rows": rows})
 
         context = {
-            "companies": companies,
-            "filings": filings,
-            "selected_company": selected_company,
-            "primary_filing": primary_filing,
-            "comparison_filing": comparison_filing,
+            **selection,
             "report_blocks": report_blocks,
             "report_template": report_template,
             "report_slug": report_slug,
@@ -85,6 +118,143 @@ class PublicReportView(View):
         return render(request, self.template_name, context)
 
 
+class CombinedReportView(View):
+    template_name = "reports/public/combined.html"
+    report_slugs = COMBINED_REPORT_SLUGS
+
+    def get(self, request):
+        return render(request, self.template_name, self.build_context(request))
+
+    def build_context(self, request) -> dict:
+        report_templates = _get_report_templates(self.report_slugs)
+        selection = _resolve_report_selection(request)
+        primary_filing = selection["primary_filing"]
+        comparison_filing = selection["comparison_filing"]
+
+        report_blocks = []
+        if primary_filing and report_templates:
+            concepts = _template_concepts(report_templates)
+            primary_lookup = _fact_lookup(primary_filing, concepts)
+            comparison_lookup = _fact_lookup(comparison_filing, concepts)
+            for report_template in report_templates:
+                rows = _build_template_rows(
+                    report_template, primary_lookup, comparison_lookup
+                )
+                report_blocks.append({"template": report_template, "rows": rows})
+
+        return {
+            **selection,
+            "report_blocks": report_blocks,
+            "report_templates": report_templates,
+            "report_title": "Laporan Keuangan Lengkap",
+        }
+
+
+class CombinedReportExportView(CombinedReportView):
+    def get(self, request):
+        context = self.build_context(request)
+        company = context["selected_company"]
+        primary_filing = context["primary_filing"]
+        comparison_filing = context["comparison_filing"]
+
+        filename = "laporan-lengkap"
+        if company and primary_filing:
+            filename = f"laporan-lengkap-{company.ticker}-{primary_filing.period_label}"
+        header = [
+            "Laporan",
+            "Item",
+            "Level",
+            primary_filing.period_label if primary_filing else "Periode Utama",
+            comparison_filing.period_label if comparison_filing else "Pembanding",
+            "Selisih",
+            "Selisih %",
+        ]
+        rows = (
+            [
+                block["template"].name,
+                row["label"],
+                row["level"],
+                _csv_decimal(row["primary_value"]),
+                _csv_decimal(row["comparison_value"]),
+                _csv_decimal(row["delta_value"]),
+                _csv_decimal(row["delta_percent"], places=2),
+            ]
+            for block in context["report_blocks"]
+            for row in block["rows"]
+        )
+        if request.GET.get("format") == FORMAT_XLSX:
+            rows = (_xlsx_numbers(row, start=3) for row in rows)
+        return export_response(request.GET.get("format", FORMAT_CSV), filename, header, rows)
+
+
+class PeerReportView(View):
+    template_name = "reports/public/peer.html"
+    max_companies = 20
+
+    def get(self, request):
+        report_slug = request.GET.get("report", COMBINED_REPORT_SLUGS[0]).strip().lower()
+        if report_slug not in COMBINED_REPORT_SLUGS:
+            report_slug = COMBINED_REPORT_SLUGS[0]
+        report_template = _get_report_template(report_slug)
+        tickers_param = request.GET.get("tickers", "")
+        tickers = _parse_tickers(tickers_param)[: self.max_companies]
+        period = request.GET.get("period", "").strip()
+
+        companies = []
+        if tickers:
+            by_ticker = {
+                company.ticker: company
+                for company in Company.objects.filter(ticker__in=tickers)
+            }
+            companies = [by_ticker[ticker] for ticker in tickers if ticker in by_ticker]
+
+        period_labels = []
+        if companies:
+            period_labels = list(
+                Filing.objects.filter(company__in=companies)
+                .order_by("-period_label")
+                .values_list("period_label", flat=True)
+                .distinct()
+            )
+        if not period and period_labels:
+            period = period_labels[0]
+
+        rows = []
+        filings_by_company: dict[int, Filing] = {}
+        if companies and period and report_template:
+            filings_by_company = {
+                filing.company_id: filing
+                for filing in Filing.objects.filter(
+                    company__in=companies, period_label=period
+                )
+            }
+            plan = compile_template_plan(report_template)
+            lookups = _fact_lookups(list(filings_by_company.values()), plan.concepts)
+            rows = _build_peer_rows(plan, companies, filings_by_company, lookups)
+
+        return render(
+            request,
+            self.template_name,
+            {
+                "report_slug": report_slug,
+                "report_template": report_template,
+                "report_title": _report_title(report_template, report_slug),
+                "tickers_param": tickers_param,
+                "missing_tickers": [
+                    ticker for ticker in tickers if ticker not in {c.ticker for c in companies}
+                ],
+                "columns": [
+                    {"company": company, "filing": filings_by_company.get(company.id)}
+                    for company in companies
+                ],
+                "period": period,
+                "period_labels": period_labels,
+                "rows": rows,
+                "max_companies": self.max_companies,
+            },
+        )
+
+
 class CompanyListView(View):
     template_name = "reports/public/companies.html"
 
@@ -96,7 +266,13 @@ class CompanyListView(View):
                 models.Q(ticker__icontains=query) | models.Q(name__icontains=query)
             )
 
-        paginator = Paginator(company_qs.order_by("ticker"), 12)
+        company_qs = company_qs.order_by("ticker")
+        if query:
+            paginator = Paginator(company_qs, 12)
+        else:
+            paginator = KnownCountPaginator(
+                company_qs, 12, count=SiteCounter.values()[SiteCounter.COMPANIES]
+            )
         page_number = request.GET.get("page")
         page_obj = paginator.get_page(page_number)
         return render(
@@ -106,42 +282,243 @@ class CompanyListView(View):
         )
 
 
+class CompanySearchView(View):
+    limit = 20
+
+    def get(self, request):
+        query = request.GET.get("q", "")
+        companies = _search_companies(query, self.limit)
+        return JsonResponse(
+            {
+                "results": [
+                    {
+                        "id": company.id,
+                        "ticker": company.ticker,
+                        "name": company.entity_name or company.name,
+                    }
+                    for company in companies
+                ]
+            }
+        )
+
+
+class ConceptSeriesAPIView(View):
+    def get(self, request, ticker: str):
+        form = ConceptSeriesForm(request.GET)
+        if not form.is_valid():
+            return JsonResponse({"errors": form.errors.get_json_data()}, status=400)
+
+        data = form.cleaned_data
+        points = concept_series(
+            ticker,
+            data["concept"],
+            start=data["start"],
+            end=data["end"],
+            annual=data["annual"],
+        )
+        if not points and not Company.objects.filter(ticker=ticker.upper()).exists():
+            return JsonResponse({"errors": {"ticker": ["Emiten tidak ditemukan."]}}, status=404)
+
+        total = len(points)
+        if data["points"]:
+            points = downsample_series(points, data["points"])
+        body = json.dumps(
+            {
+                "ticker": ticker.upper(),
+                "concept": data["concept"].strip().lower(),
+                "total": total,
+                "results": [
+                    {
+                        "period_start": point.period_start.isoformat(),
+                        "period_end": point.period_end.isoformat(),
+                        "instant": point.is_instant,
+                        "value": point.value,
+                        "filing_id": point.filing_id,
+                    }
+                    for point in points
+                ],
+            }
+        )
+        etag = quote_etag(hashlib.md5(body.encode("utf-8")).hexdigest())
+        not_modified = etag in parse_etags(request.headers.get("If-None-Match", ""))
+        record_cache("series_etag", not_modified)
+        if not_modified:
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(body, content_type="application/json")
+        response["ETag"] = etag
+        response["Cache-Control"] = "no-cache"
+        return response
+
+
+class MetricsView(View):
+    content_type = "text/plain; version=0.0.4; charset=utf-8"
+
+    def get(self, request):
+        token = getattr(settings, "METRICS_TOKEN", "")
+        if token and not constant_time_compare(
+            request.headers.get("Authorization", ""), f"Bearer {token}"
+        ):
+            return HttpResponseForbidden("Token metrik tidak valid.")
+        return HttpResponse(METRICS_REGISTRY.render(), content_type=self.content_type)
+
+
+class ScreenerView(View):
+    template_name = "reports/public/screener.html"
+    per_page = 50
+
+    def get(self, request):
+        form, result, page_number = self.run_screen(request)
+        return render(
+            request,
+            self.template_name,
+            {
+                "form": form,
+                "result": result,
+                "page_number": page_number,
+                "has_next": bool(result) and page_number * self.per_page < result.total,
+                "period_choices": period_choices(),
+                "sector_choices": sector_choices(),
+                "ratio_choices": ratio_choices(),
+                "query_string": _query_string_without_page(request),
+            },
+        )
+
+    def run_screen(self, request):
+        form = ScreenerForm(request.GET or None)
+        if not form.is_valid():
+            return form, None, 1
+        data = form.cleaned_data
+        page_number = data["page"] or 1
+        query = ScreenerQuery(
+            metric_type=data["metric_type"] or METRIC_CONCEPT,
+            metric=data["metric"].strip(),
+            period_end=data["period"],
+            sector=data["sector"].strip(),
+            subsector=data["subsector"].strip(),
+            min_value=data["min_value"],
+            max_value=data["max_value"],
+            growth=data["growth"],
+            descending=data["order"] != "asc",
+        )
+        result = screen(
+            query, limit=self.per_page, offset=(page_number - 1) * self.per_page
+        )
+        return form, result, page_number
+
+
+class ScreenerAPIView(ScreenerView):
+    def get(self, request):
+        form, result, page_number = self.run_screen(request)
+        if result is None:
+            return JsonResponse({"errors": form.errors.get_json_data()}, status=400)
+        return JsonResponse(
+            {
+                "total": result.total,
+                "page": page_number,
+                "per_page": self.per_page,
+                "results": [
+                    {
+                        "rank": row.rank,
+                        "company_id": row.company.id,
+                        "ticker": row.company.ticker,
+                        "name": row.company.entity_name or row.company.name,
+                        "sector": row.company.sector,
+                        "subsector": row.company.subsector,
+                        "filing_id": row.filing_id,
+                        "value": row.value,
+                        "prior_value": row.prior_value,
+                        "growth": row.growth,
+                    }
+                    for row in result.rows
+                ],
+            }
+        )
+
+
+class SectorAggregateAPIView(View):
+    max_results = 500
+
+    def get(self, request):
+        form = SectorAggregateForm(request.GET)
+        if not form.is_valid():
+            return JsonResponse({"errors": form.errors.get_json_data()}, status=400)
+
+        data = form.cleaned_data
+        aggregates = SectorAggregate.objects.filter(
+            concept=data["concept"].strip().lower(),
+            level=data["level"] or SectorAggregate.LEVEL_SECTOR,
+        )
+        if data["period"]:
+            aggregates = aggregates.filter(period_end=data["period"])
+        for field in ("sector", "subsector", "industry"):
+            if data[field]:
+                aggregates = aggregates.filter(**{field: data[field]})
+        aggregates = aggregates.order_by(
+            "-period_end", "period_start", "sector", "subsector", "industry", "subindustry"
+        )[: self.max_results]
+
+        return JsonResponse(
+            {
+                "results": [
+                    {
+                        "level": aggregate.level,
+                        "sector": aggregate.sector,
+                        "subsector": aggregate.subsector,
+                        "industry": aggregate.industry,
+                        "subindustry": aggregate.subindustry,
+                        "concept": aggregate.concept,
+                        "period_start": aggregate.period_start.isoformat(),
+                        "period_end": aggregate.period_end.isoformat(),
+                        "count": aggregate.count,
+                        "sum": aggregate.total,
+                        "min": aggregate.min_value,
+                        "max": aggregate.max_value,
+                        "median": aggregate.median,
+                        "quantiles": {
+                            "p10": aggregate.p10,
+                            "p25": aggregate.p25,
+                            "p50": aggregate.median,
+                            "p75": aggregate.p75,
+                            "p90": aggregate.p90,
+                        },
+                    }
+                    for aggregate in aggregates
+                ]
+            }
+        )
+
+
 class UploadXBRLView(LoginRequiredMixin, View):
     template_name = "reports/dashboard/upload.html"
     success_url = reverse_lazy("upload_xbrl")
+    per_page = 10
 
     def get(self, request):
         form = XBRLUploadForm()
         query = request.GET.get("q", "").strip()
-        filings_qs = Filing.objects.select_related("company").order_by("-uploaded_at")
-        if query:
-            filings_qs = filings_qs.filter(
-                models.Q(company__ticker__icontains=query)
-                | models.Q(period_label__icontains=query)
-                | models.Q(company__name__icontains=query)
-            )
-        paginator = Paginator(filings_qs, 10)
-        page_number = request.GET.get("page")
-        latest_filings = paginator.get_page(page_number)
+        latest_filings = self._latest_filings(request, query)
         return render(
             request,
             self.template_name,
             {"form": form, "latest_filings": latest_filings, "query": query},
         )
 
-    def post(self, request):
-        form = XBRLUploadForm(request.POST, request.FILES)
-        query = request.GET.get("q", "").strip()
-        filings_qs = Filing.objects.select_related("company").order_by("-uploaded_at")
+    def _latest_filings(self, request, query: str):
+        filings_qs = Filing.objects.select_related("company")
         if query:
             filings_qs = filings_qs.filter(
                 models.Q(company__ticker__icontains=query)
                 | models.Q(period_label__icontains=query)
                 | models.Q(company__name__icontains=query)
             )
-        paginator = Paginator(filings_qs, 10)
-        page_number = request.GET.get("page")
-        latest_filings = paginator.get_page(page_number)
+        paginator = KeysetPaginator(filings_qs, ("-uploaded_at", "-id"), self.per_page)
+        return paginator.get_page(request.GET.get("cursor"))
+
+    def post(self, request):
+        form = XBRLUploadForm(request.POST, request.FILES)
+        query = request.GET.get("q", "").strip()
+        latest_filings = self._latest_filings(request, query)
 
         if form.is_valid():
             file_obj = form.cleaned_data["file"]
@@ -167,7 +544,7 @@ class UploadXBRLView(LoginRequiredMixin, View):
         return render(
             request,
             self.template_name,
-            {"form": form, "latest_filings": latest_filings},
+            {"form": form, "latest_filings": latest_filings, "query": query},
         )
 
 
@@ -175,7 +552,7 @@ class TemplateListView(LoginRequiredMixin, View):
     template_name = "reports/dashboard/templates_list.html"
 
     def get(self, request):
-        templates = ReportTemplate.objects.order_by("name").all()
+        templates = _templates_with_item_counts()
         return render(
             request,
             self.template_name,
@@ -211,7 +588,7 @@ class TemplateListView(LoginRequiredMixin, View):
             self.template_name,
             {
                 "template_form": template_form,
-                "templates": ReportTemplate.objects.order_by("name").all(),
+                "templates": _templates_with_item_counts(),
             },
         )
 
@@ -337,33 +714,186 @@ class TemplateDetailView(LoginRequiredMixin, View):
         )
 
 
+class ConceptSearchView(LoginRequiredMixin, View):
+    limit = 20
+
+    def get(self, request):
+        concepts = search_concepts(request.GET.get("q", ""), self.limit)
+        return JsonResponse(
+            {
+                "results": [
+                    {
+                        "name": concept.name,
+                        "fact_count": concept.fact_count,
+                        "filing_count": concept.filing_count,
+                        "example_value": concept.example_value,
+                    }
+                    for concept in concepts
+                ]
+            }
+        )
+
+
+class TemplateCoverageView(LoginRequiredMixin, View):
+    template_name = "reports/dashboard/coverage.html"
+
+    def get(self, request):
+        coverage_run = CoverageRun.objects.first()
+        template_id = request.GET.get("template", "")
+        show_all = request.GET.get("all") == "1"
+        template_summaries = []
+        rows = []
+        if coverage_run:
+            template_summaries = coverage_run.results.get("templates", [])
+            rows = [
+                row
+                for row in coverage_run.results.get("items", [])
+                if (show_all or row["weak"])
+                and (not template_id or str(row["template_id"]) == template_id)
+            ]
+            rows.sort(key=lambda row: row["hit_rate"])
+        return render(
+            request,
+            self.template_name,
+            {
+                "coverage_run": coverage_run,
+                "template_summaries": template_summaries,
+                "rows": rows,
+                "selected_template_id": template_id,
+                "show_all": show_all,
+            },
+        )
+
+    def post(self, request):
+        coverage_run = analyze_template_coverage()
+        messages.success(
+            request,
+            f"Analisa cakupan selesai: {coverage_run.item_count} item x "
+            f"{coverage_run.filing_count} filing dalam {coverage_run.duration_ms} ms.",
+        )
+        return redirect("template_coverage")
+
+
 class FilingDetailView(LoginRequiredMixin, View):
     template_name = "reports/dashboard/filing_detail.html"
+    per_page = 25
+    count_cap = 10000
 
     def get(self, request, pk: int):
-        filing = get_object_or_404(
-            Filing.objects.select_related("company").prefetch_related("contexts"),
-            pk=pk,
-        )
+        filing = get_object_or_404(Filing.objects.select_related("company"), pk=pk)
         search_query = request.GET.get("q", "").strip()
-        fact_qs = filing.facts.select_related("context").order_by("order", "id")
+        context = {
+            "filing": filing,
+            "search_query": search_query,
+            "other_filings": Filing.objects.filter(company_id=filing.company_id).exclude(pk=pk),
+        }
+        if search_query and search_supported():
+            context.update(self._search_context(request, filing, search_query))
+            return render(request, self.template_name, context)
+
+        fact_qs = filing.facts.select_related("context")
         if search_query:
             fact_qs = fact_qs.filter(
                 models.Q(name__icontains=search_query) | models.Q(value__icontains=search_query)
             )
 
-        paginator = Paginator(fact_qs, 25)
-        page_number = request.GET.get("page")
-        facts_page = paginator.get_page(page_number)
+        paginator = KeysetPaginator(
+            fact_qs, ("order", "id"), self.per_page, count_cap=self.count_cap
+        )
+        context["facts_page"] = paginator.get_page(request.GET.get("cursor"))
+        if request.GET.get("count") == "1":
+            context["fact_count"] = paginator.estimated_count()
+        return render(request, self.template_name, context)
 
-        return render(
-            request,
-            self.template_name,
-            {
-                "filing": filing,
-                "facts_page": facts_page,
-                "search_query": search_query,
-            },
+    def _search_context(self, request, filing: Filing, search_query: str) -> dict:
+        page_param = request.GET.get("page", "")
+        page_number = int(page_param) if page_param.isdigit() and int(page_param) > 0 else 1
+        hits = search_filing_facts(
+            filing.pk,
+            search_query,
+            limit=self.per_page + 1,
+            offset=(page_number - 1) * self.per_page,
+        )
+        return {
+            "search_mode": True,
+            "search_hits": hits[: self.per_page],
+            "search_page_number": page_number,
+            "search_has_next": len(hits) > self.per_page,
+        }
+
+
+class FilingDiffView(LoginRequiredMixin, View):
+    template_name = "reports/dashboard/filing_diff.html"
+    max_rows = 500
+
+    def get(self, request, pk: int):
+        restated = get_object_or_404(Filing.objects.select_related("company"), pk=pk)
+        other_filings = Filing.objects.filter(company_id=restated.company_id).exclude(pk=pk)
+        against = request.GET.get("against", "")
+        original = other_filings.filter(pk=against).first() if against.isdigit() else None
+        min_delta = _as_decimal(request.GET.get("min_delta")) or Decimal("0")
+        min_percent = _as_decimal(request.GET.get("min_percent")) or Decimal("0")
+        statuses = [status for status in request.GET.getlist("status") if status in DIFF_STATUSES]
+
+        context = {
+            "filing": restated,
+            "original": original,
+            "other_filings": other_filings,
+            "min_delta": request.GET.get("min_delta", ""),
+            "min_percent": request.GET.get("min_percent", ""),
+            "statuses": statuses or list(DIFF_STATUSES),
+            "max_rows": self.max_rows,
+        }
+        if original:
+            changes = []
+            counts = {status: 0 for status in DIFF_STATUSES}
+            for change in diff_filings(
+                original,
+                restated,
+                min_delta=float(abs(min_delta)),
+                min_percent=float(abs(min_percent)),
+                statuses=context["statuses"],
+            ):
+                counts[change.status] += 1
+                if len(changes) < self.max_rows:
+                    changes.append(change)
+            context.update(
+                {
+                    "changes": changes,
+                    "counts": counts,
+                    "total_changes": sum(counts.values()),
+                }
+            )
+        return render(request, self.template_name, context)
+
+
+class FilingExportView(LoginRequiredMixin, View):
+    def get(self, request, pk: int):
+        filing = get_object_or_404(Filing.objects.select_related("company"), pk=pk)
+        filename = f"fakta-{filing.company.ticker}-{filing.period_label or filing.pk}"
+        return export_response(
+            request.GET.get("format", FORMAT_CSV),
+            filename,
+            FACT_HEADER,
+            filing_fact_rows(filing),
+        )
+
+
+class BulkFactExportView(LoginRequiredMixin, View):
+    def get(self, request):
+        filings = Filing.objects.all()
+        tickers = _parse_tickers(request.GET.get("tickers", ""))
+        if tickers:
+            filings = filings.filter(company__ticker__in=tickers)
+        period = request.GET.get("period", "").strip()
+        if period:
+            filings = filings.filter(period_label=period)
+        filename = "fakta-" + ("-".join(tickers[:5]) or "semua") + (f"-{period}" if period else "")
+        return export_response(
+            request.GET.get("format", FORMAT_CSV),
+            filename,
+            BULK_FACT_HEADER,
+            bulk_fact_rows(filings.values("id")),
         )
 
 
@@ -378,10 +908,8 @@ class DeleteFilingView(LoginRequiredMixin, View):
 
         filing_label = filing.period_label or f"Filing {filing.pk}"
         company_ticker = filing.company.ticker
-        xbrl_file = filing.xbrl_file
-        filing.delete()
-        if xbrl_file:
-            xbrl_file.delete(save=False)
+        delete_filing(filing)
+        schedule_file_cleanup()
         messages.success(
             request,
             f"Filing {company_ticker} periode {filing_label} telah dihapus.",
@@ -389,6 +917,119 @@ class DeleteFilingView(LoginRequiredMixin, View):
         return redirect(self.success_url)
 
 
+class BulkDeleteFilingView(LoginRequiredMixin, View):
+    success_url = reverse_lazy("upload_xbrl")
+
+    def post(self, request):
+        filing_ids = [value for value in request.POST.getlist("filing_ids") if value.isdigit()]
+        if not filing_ids:
+            messages.error(request, "Pilih minimal satu filing untuk dihapus.")
+            return redirect(self.success_url)
+
+        deleted = delete_filings(int(value) for value in filing_ids)
+        messages.success(request, f"{deleted} filing telah dihapus.")
+        return redirect(self.success_url)
+
+
+class StaffRequiredMixin(LoginRequiredMixin, UserPassesTestMixin):
+    def test_func(self):
+        return self.request.user.is_staff
+
+
+class ProfileListView(StaffRequiredMixin, View):
+    template_name = "reports/dashboard/profiles.html"
+
+    def get(self, request):
+        profiles = ProfileRun.objects.select_related("user").defer("stacks")
+        paginator = Paginator(profiles, 25)
+        return render(
+            request,
+            self.template_name,
+            {"page_obj": paginator.get_page(request.GET.get("page"))},
+        )
+
+
+class ProfileDetailView(StaffRequiredMixin, View):
+    template_name = "reports/dashboard/profile_detail.html"
+    row_height = 18
+
+    def get(self, request, pk: int):
+        profile = get_object_or_404(ProfileRun.objects.select_related("user"), pk=pk)
+        if request.GET.get("format") == "collapsed":
+            response = HttpResponse(profile.stacks, content_type="text/plain; charset=utf-8")
+            response["Content-Disposition"] = f'attachment; filename="profile-{profile.pk}.folded"'
+            return response
+
+        boxes, depth = flame_layout(profile.stacks)
+        for box in boxes:
+            box["bottom"] = box["depth"] * self.row_height
+        return render(
+            request,
+            self.template_name,
+            {
+                "profile": profile,
+                "boxes": boxes,
+                "flame_height": depth * self.row_height,
+                "row_height": self.row_height,
+            },
+        )
+
+
+def _resolve_report_selection(request) -> dict:
+    company_id = request.GET.get("company", "")
+    primary_id = request.GET.get("primary")
+    comparison_id = request.GET.get("comparison")
+
+    selected_company = None
+    if company_id.isdigit():
+        selected_company = Company.objects.filter(pk=company_id).first()
+    if not selected_company:
+        selected_company = Company.objects.order_by("ticker").first()
+
+    filings = []
+    if selected_company:
+        filings = list(
+            Filing.objects.filter(company=selected_company).order_by("-uploaded_at", "-id")
+        )
+
+    primary_filing = _find_filing(filings, primary_id)
+    if primary_filing is None and selected_company and selected_company.latest_filing_id:
+        primary_filing = _find_filing(filings, str(selected_company.latest_filing_id))
+    if primary_filing is None and filings:
+        # Pointer belum diisi (atau melenceng): pakai upload terbaru dari query.
+        primary_filing = filings[0]
+    comparison_filing = _find_filing(filings, comparison_id)
+    if selected_company:
+        REPORT_REQUESTS.inc(ticker=selected_company.ticker)
+    return {
+        "filings": filings,
+        "selected_company": selected_company,
+        "primary_filing": primary_filing,
+        "comparison_filing": comparison_filing,
+    }
+
+
+def _search_companies(query: str, limit: int) -> list[Company]:
+    prefix = query.strip().upper()
+    if not prefix:
+        return list(Company.objects.order_by("ticker")[:limit])
+    upper_bound = prefix + "\uffff"
+    companies = list(
+        Company.objects.filter(ticker__gte=prefix, ticker__lt=upper_bound).order_by(
+            "ticker"
+        )[:limit]
+    )
+    if len(companies) < limit:
+        seen = [company.pk for company in companies]
+        companies.extend(
+            Company.objects.annotate(name_upper=Upper("name"))
+            .filter(name_upper__gte=prefix, name_upper__lt=upper_bound)
+            .exclude(pk__in=seen)
+            .order_by("name_upper")[: limit - len(companies)]
+        )
+    return companies
+
+
 def _find_filing(filings: list[Filing], filing_id: str | None):
     if not filing_id:
         return None
@@ -416,6 +1057,28 @@ def _get_report_template(report_slug: str) -> ReportTemplate | None:
     )
 
 
+def _get_report_templates(report_slugs) -> list[ReportTemplate]:
+    by_slug = {
+        template.slug: template
+        for template in ReportTemplate.objects.prefetch_related("items").filter(
+            slug__in=report_slugs
+        )
+    }
+    templates = []
+    for report_slug in report_slugs:
+        template = by_slug.get(report_slug) or _get_report_template(report_slug)
+        if template and template not in templates:
+            templates.append(template)
+    return templates
+
+
+def _template_concepts(templates) -> set[str]:
+    concepts: set[str] = set()
+    for template in templates:
+        concepts.update(compile_template_plan(template).concepts)
+    return concepts
+
+
 def _report_title(report_template: ReportTemplate | None, report_slug: str) -> str:
     if report_template:
         return report_template.name
@@ -427,13 +1090,14 @@ def _report_title(report_template: ReportTemplate | None, report_slug: str) -> s
 
 def _build_template_rows(
     template: ReportTemplate,
-    primary_lookup: dict[str, Fact],
-    comparison_lookup: dict[str, Fact],
+    primary_lookup: dict[str, LookupFact],
+    comparison_lookup: dict[str, LookupFact],
 ) -> list[dict]:
+    plan = compile_template_plan(template)
     rows = []
-    for item in template.items.all():
-        primary_fact = _resolve_fact(primary_lookup, item)
-        comparison_fact = _resolve_fact(comparison_lookup, item)
+    for (item, _), primary_fact, comparison_fact in zip(
+        plan.items, plan.resolve(primary_lookup), plan.resolve(comparison_lookup)
+    ):
         row = {
             "label": item.label,
             "primary_fact": primary_fact,
@@ -445,27 +1109,75 @@ def _build_template_rows(
     return rows
 
 
-def _fact_lookup(filing: Filing | None) -> dict[str, Fact]:
+def _fact_lookup(
+    filing: Filing | None, concepts: set[str] | None = None
+) -> dict[str, LookupFact]:
     if not filing:
         return {}
-    lookup: dict[str, Fact] = {}
-    for fact in filing.facts.all():
-        key = fact.name.lower()
-        if key not in lookup:
-            lookup[key] = fact
-    return lookup
-
-
-def _resolve_fact(fact_lookup: dict[str, Fact], item):
-    codes = [item.primary_fact] + item.fallback_list()
-    for code in codes:
-        fact = fact_lookup.get(code.lower())
-        if fact:
-            return fact
-    return None
+    return _fact_lookups([filing], concepts)[filing.id]
+
+
+def _fact_lookups(
+    filings: list[Filing], concepts: set[str] | None
+) -> dict[int, dict[str, LookupFact]]:
+    """Fakta pertama per konsep untuk setiap filing: lewat cache atau satu query batch."""
+    if not filings or (concepts is not None and not concepts):
+        return {filing.id: {} for filing in filings}
+    if cache_enabled():
+        return cached_fact_lookups(filings, concepts)
+    return load_lookup_facts([filing.id for filing in filings], concepts)
+
+
+def _build_peer_rows(
+    plan: TemplatePlan,
+    companies: list[Company],
+    filings_by_company: dict[int, Filing],
+    lookups: dict[int, dict[str, LookupFact]],
+) -> list[dict]:
+    resolved_by_company = {}
+    for company in companies:
+        filing = filings_by_company.get(company.id)
+        resolved_by_company[company.id] = (
+            plan.resolve(lookups.get(filing.id, {})) if filing else [None] * len(plan.items)
+        )
+
+    rows = []
+    for position, (item, _) in enumerate(plan.items):
+        values = []
+        for company in companies:
+            fact = resolved_by_company[company.id][position]
+            values.append(_as_decimal(fact.value) if fact else None)
+        present = sorted((value for value in values if value is not None), reverse=True)
+        cells = []
+        for value in values:
+            cells.append(
+                {
+                    "value_display": _format_decimal(value),
+                    "rank": present.index(value) + 1 if value is not None else None,
+                }
+            )
+        rows.append(
+            {
+                "label": item.label,
+                "level": item.level,
+                "cells": cells,
+                "median_display": _format_decimal(median(present) if present else None),
+                "reported_count": len(present),
+            }
+        )
+    return rows
+
+
+def _parse_tickers(value: str) -> list[str]:
+    tickers = []
+    for part in value.replace(";", ",").replace(" ", ",").split(","):
+        ticker = part.strip().upper()
+        if ticker and ticker not in tickers:
+            tickers.append(ticker)
+    return tickers
 
 
-def _calculate_analysis(primary_fact: Fact | None, comparison_fact: Fact | None):
+def _calculate_analysis(primary_fact: LookupFact | None, comparison_fact: LookupFact | None):
     primary_value = _as_decimal(primary_fact.value) if primary_fact else None
     comparison_value = _as_decimal(comparison_fact.value) if comparison_fact else None
 
@@ -478,6 +1190,10 @@ def _calculate_analysis(primary_fact: Fact | None, comparison_fact: Fact | None)
             delta_percent = (delta_value / comparison_value) * Decimal("100")
 
     return {
+        "primary_value": primary_value,
+        "comparison_value": comparison_value,
+        "delta_value": delta_value,
+        "delta_percent": delta_percent,
         "primary_value_display": _format_decimal(primary_value),
         "comparison_value_display": _format_decimal(comparison_value),
         "delta_value_display": _format_decimal(delta_value),
@@ -507,7 +1223,29 @@ def _format_percent(value: Decimal | None) -> str:
     return f"{value:,.2f}%"
 
 
+def _query_string_without_page(request) -> str:
+    params = request.GET.copy()
+    params.pop("page", None)
+    return params.urlencode()
+
+
+def _csv_decimal(value: Decimal | None, places: int | None = None) -> str:
+    if value is None:
+        return ""
+    if places is not None:
+        return f"{value:.{places}f}"
+    return str(value)
+
+
+def _xlsx_numbers(row: list, start: int) -> list:
+    return row[:start] + [Decimal(value) if value else None for value in row[start:]]
+
+
 def logout_view(request):
     logout(request)
     messages.info(request, "Anda telah keluar dari sesi admin.")
     return redirect("home")
+
+
+def _templates_with_item_counts():
+    return ReportTemplate.objects.annotate(item_count=models.Count("items")).order_by("name")
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import logging
+import os
+import sys
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.db.models import Max
+from django.template import TemplateDoesNotExist
+from django.template.loader import get_template
+
+from .fact_cache import cache_enabled, filing_fact_map
+from .metrics import REPORT_REQUESTS
+from .models import Company, Filing, ReportTemplate
+from .template_plans import compile_template_plan
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COMPANY_LIMIT = 50
+DEFAULT_FILINGS_PER_COMPANY = 2
+PAGE_TEMPLATES = (
+    "base.html",
+    "reports/public/home.html",
+    "reports/public/report.html",
+    "reports/public/combined.html",
+    "reports/public/companies.html",
+    "reports/public/peer.html",
+    "partials/report_block.html",
+    "partials/report_filters.html",
+)
+# Entry point server yang melayani request; proses lain (pytest, celery,
+# skrip) tidak ikut warm-up kecuali env LAPXBRL_WARMUP_ON_START=1.
+SERVER_COMMANDS = ("gunicorn", "uwsgi")
+WARMUP_ENV_FLAG = "LAPXBRL_WARMUP_ON_START"
+
+# Satu thread saja: warm-up berurutan dan tidak berebut koneksi database.
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cache-warmup")
+
+
+@dataclass
+class WarmupResult:
+    templates: int = 0
+    template_plans: int = 0
+    companies: int = 0
+    filings: int = 0
+
+
+def warm_caches(
+    tickers: list[str] | None = None,
+    limit: int | None = None,
+    filings_per_company: int | None = None,
+) -> WarmupResult:
+    """Muat template halaman, plan template laporan, dan filing terbaru emiten terpopuler.
+
+    Emiten dipilih dari `tickers`, atau dari hitungan permintaan laporan di
+    registry metrik (lintas worker) ditambah `CACHE_WARMUP_TICKERS`, lalu
+    emiten dengan upload terbaru bila data popularitas belum cukup.
+    """
+    result = WarmupResult(
+        templates=warm_page_templates(), template_plans=warm_template_plans()
+    )
+    if not cache_enabled():
+        return result
+    if limit is None:
+        limit = getattr(settings, "CACHE_WARMUP_COMPANIES", DEFAULT_COMPANY_LIMIT)
+    if filings_per_company is None:
+        filings_per_company = getattr(
+            settings, "CACHE_WARMUP_FILINGS_PER_COMPANY", DEFAULT_FILINGS_PER_COMPANY
+        )
+
+    companies = _select_companies([ticker.upper() for ticker in tickers or []] or None, limit)
+    for company in companies:
+        result.filings += warm_company(company, filings_per_company)
+        result.companies += 1
+    return result
+
+
+def warm_company(company: Company, filings_per_company: int | None = None) -> int:
+    if filings_per_company is None:
+        filings_per_company = getattr(
+            settings, "CACHE_WARMUP_FILINGS_PER_COMPANY", DEFAULT_FILINGS_PER_COMPANY
+        )
+    # Urutan sama dengan pilihan default halaman laporan (upload terbaru lebih dulu).
+    filings = Filing.objects.filter(company=company).order_by("-uploaded_at", "-id")[
+        :filings_per_company
+    ]
+    count = 0
+    for filing in filings:
+        filing_fact_map(filing)
+        count += 1
+    return count
+
+
+def warm_page_templates() -> int:
+    count = 0
+    for name in PAGE_TEMPLATES:
+        try:
+            get_template(name)
+        except TemplateDoesNotExist:
+            continue
+        count += 1
+    return count
+
+
+def warm_template_plans() -> int:
+    """Kompilasi plan setiap ReportTemplate ke memo `template_plans` proses ini."""
+    count = 0
+    for template in ReportTemplate.objects.prefetch_related("items"):
+        compile_template_plan(template)
+        count += 1
+    return count
+
+
+def popular_tickers(limit: int) -> list[str]:
+    series = REPORT_REQUESTS.registry.collect().get(REPORT_REQUESTS.name, {})
+    ranked = sorted(series.items(), key=lambda item: item[1][0], reverse=True)
+    return [labels[0] for labels, _ in ranked[:limit]]
+
+
+def warm_caches_async(**options) -> Future:
+    return _executor.submit(_run_in_background, warm_caches, **options)
+
+
+def warm_company_async(company_id: int) -> Future | None:
+    if not getattr(settings, "CACHE_WARMUP_AFTER_INGEST", True) or not cache_enabled():
+        return None
+    return _executor.submit(_run_in_background, _warm_company_by_id, company_id)
+
+
+def should_warm_on_start(argv: list[str] | None = None) -> bool:
+    """Warm-up saat start hanya untuk proses server (gunicorn, uwsgi, runserver).
+
+    Proses lain butuh `LAPXBRL_WARMUP_ON_START=1` secara eksplisit.
+    """
+    if not getattr(settings, "CACHE_WARMUP_ON_START", False):
+        return False
+    if os.environ.get(WARMUP_ENV_FLAG) == "1":
+        return True
+    argv = sys.argv if argv is None else argv
+    if not argv:
+        return False
+    command = os.path.basename(argv[0])
+    if command in ("manage.py", "django-admin"):
+        if argv[1:2] != ["runserver"]:
+            return False
+        # Proses induk autoreloader tidak melayani request.
+        return os.environ.get("RUN_MAIN") == "true" or "--noreload" in argv
+    return command in SERVER_COMMANDS
+
+
+def _select_companies(tickers: list[str] | None, limit: int) -> list[Company]:
+    if tickers is not None:
+        by_ticker = Company.objects.in_bulk(tickers, field_name="ticker")
+        return [by_ticker[ticker] for ticker in tickers if ticker in by_ticker]
+
+    wanted = []
+    for ticker in [*popular_tickers(limit), *getattr(settings, "CACHE_WARMUP_TICKERS", [])]:
+        if ticker.upper() not in wanted:
+            wanted.append(ticker.upper())
+    by_ticker = Company.objects.in_bulk(wanted, field_name="ticker")
+    companies = [by_ticker[ticker] for ticker in wanted if ticker in by_ticker][:limit]
+    if len(companies) < limit:
+        companies += list(
+            Company.objects.exclude(pk__in=[company.pk for company in companies])
+            .filter(filings__isnull=False)
+            .annotate(latest_upload=Max("filings__uploaded_at"))
+            .order_by("-latest_upload")[: limit - len(companies)]
+        )
+    return companies
+
+
+def _warm_company_by_id(company_id: int) -> int:
+    company = Company.objects.filter(pk=company_id).first()
+    return warm_company(company) if company else 0
+
+
+def _run_in_background(func, *args, **kwargs):
+    try:
+        return func(*args, **kwargs)
+    except DatabaseError:
+        # Mis. tabel belum dimigrasi saat server pertama kali dijalankan.
+        logger.warning("Warm-up cache dilewati karena error database.", exc_info=True)
+    finally:
+        connection.close()
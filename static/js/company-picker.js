@@ -0,0 +1,96 @@
+(function () {
+    "use strict";
+
+    function initPicker(picker) {
+        var searchUrl = picker.dataset.searchUrl;
+        var hiddenInput = picker.querySelector("input[type=hidden]");
+        var textInput = picker.querySelector("input[type=text]");
+        var results = picker.querySelector(".company-picker-results");
+        var form = picker.closest("form");
+        var timer = null;
+        var requestId = 0;
+
+        function hideResults() {
+            results.classList.add("d-none");
+            results.innerHTML = "";
+        }
+
+        function selectCompany(company) {
+            hiddenInput.value = company.id;
+            textInput.value = company.ticker;
+            hideResults();
+            if (form) {
+                form.querySelectorAll("select[name=primary], select[name=comparison]").forEach(function (el) {
+                    el.value = "";
+                });
+                form.submit();
+            }
+        }
+
+        function renderResults(companies) {
+            results.innerHTML = "";
+            if (!companies.length) {
+                hideResults();
+                return;
+            }
+            companies.forEach(function (company) {
+                var item = document.createElement("button");
+                item.type = "button";
+                item.className = "list-group-item list-group-item-action";
+                var ticker = document.createElement("strong");
+                ticker.textContent = company.ticker;
+                item.appendChild(ticker);
+                if (company.name) {
+                    item.appendChild(document.createTextNode(" - " + company.name));
+                }
+                item.addEventListener("click", function () {
+                    selectCompany(company);
+                });
+                results.appendChild(item);
+            });
+            results.classList.remove("d-none");
+        }
+
+        function search(query) {
+            var currentId = ++requestId;
+            fetch(searchUrl + "?q=" + encodeURIComponent(query), {
+                headers: {"Accept": "application/json"}
+            })
+                .then(function (response) {
+                    return response.json();
+                })
+                .then(function (data) {
+                    if (currentId === requestId) {
+                        renderResults(data.results || []);
+                    }
+                })
+                .catch(hideResults);
+        }
+
+        textInput.addEventListener("input", function () {
+            clearTimeout(timer);
+            var query = textInput.value.trim();
+            if (!query) {
+                hideResults();
+                return;
+            }
+            timer = setTimeout(function () {
+                search(query);
+            }, 150);
+        });
+
+        textInput.addEventListener("focus", function () {
+            textInput.select();
+        });
+
+        document.addEventListener("click", function (event) {
+            if (!picker.contains(event.target)) {
+                hideResults();
+            }
+        });
+    }
+
+    document.addEventListener("DOMContentLoaded", function () {
+        document.querySelectorAll(".company-picker").forEach(initPicker);
+    });
+})();
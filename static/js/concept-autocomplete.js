@@ -0,0 +1,112 @@
+(function () {
+    "use strict";
+
+    var script = document.currentScript;
+    var searchUrl = script ? script.dataset.searchUrl : "";
+
+    function currentTerm(field) {
+        if (field.tagName !== "TEXTAREA") {
+            return field.value.trim();
+        }
+        var lines = field.value.slice(0, field.selectionStart).split("\n");
+        return lines[lines.length - 1].trim();
+    }
+
+    function applyTerm(field, name) {
+        if (field.tagName !== "TEXTAREA") {
+            field.value = name;
+            return;
+        }
+        var before = field.value.slice(0, field.selectionStart);
+        var after = field.value.slice(field.selectionStart);
+        var lineStart = before.lastIndexOf("\n") + 1;
+        var lineEnd = after.indexOf("\n");
+        var rest = lineEnd === -1 ? "" : after.slice(lineEnd);
+        field.value = before.slice(0, lineStart) + name + rest;
+        var caret = lineStart + name.length;
+        field.setSelectionRange(caret, caret);
+    }
+
+    function initField(field) {
+        var wrapper = document.createElement("div");
+        wrapper.className = "concept-autocomplete";
+        field.parentNode.insertBefore(wrapper, field);
+        wrapper.appendChild(field);
+        var results = document.createElement("div");
+        results.className = "list-group concept-autocomplete-results d-none";
+        wrapper.appendChild(results);
+        var timer = null;
+        var requestId = 0;
+
+        function hideResults() {
+            results.classList.add("d-none");
+            results.innerHTML = "";
+        }
+
+        function renderResults(concepts) {
+            results.innerHTML = "";
+            if (!concepts.length) {
+                hideResults();
+                return;
+            }
+            concepts.forEach(function (concept) {
+                var item = document.createElement("button");
+                item.type = "button";
+                item.className = "list-group-item list-group-item-action";
+                var name = document.createElement("div");
+                name.className = "fw-semibold";
+                name.textContent = concept.name;
+                var meta = document.createElement("div");
+                meta.className = "small text-muted text-truncate";
+                meta.textContent = concept.fact_count + " fakta, " + concept.filing_count + " filing"
+                    + (concept.example_value ? " - contoh: " + concept.example_value : "");
+                item.appendChild(name);
+                item.appendChild(meta);
+                item.addEventListener("click", function () {
+                    applyTerm(field, concept.name);
+                    hideResults();
+                    field.focus();
+                });
+                results.appendChild(item);
+            });
+            results.classList.remove("d-none");
+        }
+
+        field.addEventListener("input", function () {
+            clearTimeout(timer);
+            var term = currentTerm(field);
+            if (term.length < 2) {
+                hideResults();
+                return;
+            }
+            timer = setTimeout(function () {
+                var currentId = ++requestId;
+                fetch(searchUrl + "?q=" + encodeURIComponent(term), {
+                    headers: {"Accept": "application/json"}
+                })
+                    .then(function (response) {
+                        return response.json();
+                    })
+                    .then(function (data) {
+                        if (currentId === requestId) {
+                            renderResults(data.results || []);
+                        }
+                    })
+                    .catch(hideResults);
+            }, 150);
+        });
+
+        document.addEventListener("click", function (event) {
+            if (!wrapper.contains(event.target)) {
+                hideResults();
+            }
+        });
+    }
+
+    document.addEventListener("DOMContentLoaded", function () {
+        if (!searchUrl) {
+            return;
+        }
+        document.querySelectorAll("[data-concept-autocomplete]").forEach(initField);
+    });
+})();